@@ -5,7 +5,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
-from app.auth import verify_password, create_access_token, get_password_hash, get_current_user, check_user_expiration
+from app.auth import verify_password, create_access_token, get_password_hash, get_current_user, check_user_expiration, invalidate_cached_user, attach_user
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -71,6 +71,7 @@ async def login(
     user.login_count = (user.login_count or 0) + 1
     user.last_login_at = func.now()
     db.commit()
+    invalidate_cached_user(user.username)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -124,16 +125,18 @@ async def update_settings(
     """
     Update user settings (API keys, etc.)
     """
+    user = attach_user(db, current_user)
     if settings.openai_api_key is not None:
-        current_user.openai_api_key = settings.openai_api_key
+        user.openai_api_key = settings.openai_api_key
     if settings.gemini_api_key is not None:
-        current_user.gemini_api_key = settings.gemini_api_key
+        user.gemini_api_key = settings.gemini_api_key
     if settings.perplexity_api_key is not None:
-        current_user.perplexity_api_key = settings.perplexity_api_key
+        user.perplexity_api_key = settings.perplexity_api_key
     
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    invalidate_cached_user(user.username)
+    db.refresh(user)
+    return user
 
 
 @router.get("/api-balance/{provider}")
@@ -288,6 +291,7 @@ async def google_login(
         user.login_count = (user.login_count or 0) + 1
         user.last_login_at = func.now()
         db.commit()
+        invalidate_cached_user(user.username)
         
         return {"access_token": access_token, "token_type": "bearer"}
         
@@ -1,18 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
-import requests
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 import re
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+import urllib.parse
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, literal, select
 from typing import List, Optional
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.item import Item
 from app.models.source import Source
 from app.models.queue import Queue
 from app.models.duplicate import Duplicate
 from app.auth import get_current_user, require_role
 from app.models.user import User
+from app.services import minhash_service, search_service, simhash_service, stats_service, thumbnail_service
+from app.services.pagination_service import ITEM_LIST_ORDER, ITEM_CURSOR_KEYS, InvalidCursor, apply_item_cursor, encode_item_cursor
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -69,36 +72,22 @@ async def get_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get collection statistics for the dashboard"""
-    from sqlalchemy import func
-    import datetime
-    from datetime import timedelta
-    
-    # We define 'today' as the last 24 hours to be safe against timezone shifts 
-    # and ensure the user sees recent progress.
-    now = datetime.datetime.now()
-    twenty_four_hours_ago = now - timedelta(hours=24)
-    
-    # Base query for the current user (Isolation)
-    base_query = db.query(Item)
-    if current_user.role != "admin":
-        base_query = base_query.filter(Item.user_id == current_user.id)
-        
-    # Today's collected items (within last 24h)
-    collected_today = base_query.filter(Item.collected_at >= twenty_four_hours_ago).count()
-    
-    # Failed items (total)
-    failed_count = base_query.filter(Item.status == "failed").count()
+    """Get collection statistics for the dashboard (incrementally maintained counters)"""
+    # 'Today' is the last 24 hours to be safe against timezone shifts
+    # Admins see all items, everyone else only their own (Isolation)
+    user_id = None if current_user.role == "admin" else current_user.id
+    stats = stats_service.get_dashboard_stats(db, user_id)
     
     return {
-        "collected_today": collected_today,
-        "failed": failed_count,
+        "collected_today": stats["collected_today"],
+        "failed": stats["failed"],
         "pending_approval": 0 # Kept for compatibility but we will remove from UI
     }
 
 
 @router.get("", response_model=List[ItemResponse])
 async def list_items(
+    response: Response,
     status: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     type: Optional[str] = Query(None), # Source type filter
@@ -107,21 +96,30 @@ async def list_items(
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
     q: Optional[str] = Query(None),  # Search query
+    cursor: Optional[str] = Query(None),  # X-Next-Cursor of the previous page
     skip: int = Query(0, ge=0),
     limit: int = Query(50, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get list of items with optional filters"""
-    query = db.query(Item, Source.name.label('source_name'), Source.type.label('source_type')).outerjoin(Source, Item.source_id == Source.id)
+    """
+    Get list of items with optional filters
+    
+    Pages are read with keyset pagination: pass the X-Next-Cursor response
+    header as `cursor` to get the next page (skip is kept for old clients).
+    """
+    query = select(
+        Item, Source.name.label('source_name'), Source.type.label('source_type'), *ITEM_CURSOR_KEYS
+    ).outerjoin(Source, Item.source_id == Source.id)
     
     # Apply filters
     if status:
         query = query.filter(Item.status == status)
     else:
-        # Default: Exclude deleted items
-        query = query.filter(Item.status != "deleted")
-        
+        # Default: Exclude deleted items. Rendered inline (not as a bind parameter)
+        # so the planner can match the partial indexes on items (see Item.__table_args__)
+        query = query.filter(Item.status != literal("deleted", literal_execute=True))
+    
     if category:
         query = query.filter(Item.category == category)
     if type:
@@ -135,179 +133,253 @@ async def list_items(
     if date_to:
         query = query.filter(Item.published_at <= date_to)
     if q:
-        query = query.filter(Item.title.ilike(f"%{q}%"))
+        if search_service.can_use_index(q):
+            matches = search_service.search_subquery(q, None if current_user.role == "admin" else current_user.id)
+            query = query.filter(Item.id.in_(select(matches.c.item_id)))
+        else:
+            # Single characters have no bigrams; fall back to a title substring match
+            query = query.filter(Item.title.ilike(f"%{q}%"))
     
     # Data Isolation: Filter by current user
     # Admin can see everything, others only their own
     if current_user.role != "admin":
         query = query.filter(Item.user_id == current_user.id)
     
-    # Order by published_at descending (newest first), then collected_at
-    query = query.order_by(Item.published_at.desc().nullslast(), Item.collected_at.desc())
-    
-    print(f"[DEBUG API] User: {current_user.username} (ID: {current_user.id}, Role: {current_user.role})")
-    print(f"[DEBUG API] Filtering for User ID: {current_user.id if current_user.role != 'admin' else 'ALL'}")
+    # Order by published_at descending (newest first), then collected_at, then id
+    query = query.order_by(*ITEM_LIST_ORDER)
+    if cursor:
+        try:
+            query = apply_item_cursor(query, cursor, db.bind.dialect.name)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
     
-    results = query.offset(skip).limit(limit).all()
-    print(f"[DEBUG API] Results Count: {len(results)}")
-    if results:
-        print(f"[DEBUG API] First Item ID: {results[0][0].id}, Title: {results[0][0].title}")
+    results = (await db.execute((query if cursor else query.offset(skip)).limit(limit))).all()
+    if len(results) == limit:
+        last = results[-1]
+        response.headers["X-Next-Cursor"] = encode_item_cursor(last[0].id, last.cursor_published_at, last.cursor_collected_at)
     
     # Format response
-    items_response = []
-    for item, source_name, source_type in results:
-        # Get thumbnail from first image
-        thumbnail = None
-        if item.image_urls and len(item.image_urls) > 0:
-            thumbnail = item.image_urls[0]
-
-        item_dict = {
-            "id": item.id,
-            "source_id": item.source_id,
-            "source_name": source_name or "삭제된 출처",
-            "source_type": source_type or "알 수 없음",
-            "title": item.title,
-            "published_at": item.published_at,
-            "collected_at": item.collected_at,
-            "url": item.url,
-            "summary_text": item.summary_text,
-            "category": item.category,
-            "region": item.region,
-            "tags": item.tags,
-            "status": item.status,
-            "image_urls": item.image_urls,
-            "thumbnail_url": thumbnail
-        }
-        items_response.append(item_dict)
+    return [_item_response(item, source_name, source_type) for item, source_name, source_type, *_ in results]
+
+
+class SearchResult(ItemResponse):
+    score: int
+
+
+@router.get("/search", response_model=List[SearchResult])
+async def search_items(
+    q: str = Query(..., min_length=1),
+    status: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search titles, summaries and text, best matches first"""
+    if not search_service.can_use_index(q):
+        raise HTTPException(status_code=400, detail="검색어는 두 글자 이상 입력해주세요.")
+    
+    matches = search_service.search_subquery(q, None if current_user.role == "admin" else current_user.id)
+    query = select(Item, Source.name, Source.type, matches.c.score).join(
+        matches, matches.c.item_id == Item.id
+    ).outerjoin(Source, Item.source_id == Source.id)
     
-    return items_response
+    if status:
+        query = query.filter(Item.status == status)
+    else:
+        query = query.filter(Item.status != literal("deleted", literal_execute=True))
+    
+    # Data Isolation: Filter by current user
+    if current_user.role != "admin":
+        query = query.filter(Item.user_id == current_user.id)
+    
+    results = (await db.execute(query.order_by(matches.c.score.desc(), Item.id.desc()).offset(skip).limit(limit))).all()
+    return [
+        {**_item_response(item, source_name, source_type), "score": score}
+        for item, source_name, source_type, score in results
+    ]
+
+
+def _item_response(item: Item, source_name: Optional[str], source_type: Optional[str]) -> dict:
+    # Resized thumbnail of the first image
+    thumbnail = None
+    if item.image_urls and len(item.image_urls) > 0:
+        thumbnail = thumbnail_service.thumbnail_url(item.image_urls[0], source_type)
+    
+    return {
+        "id": item.id,
+        "source_id": item.source_id,
+        "source_name": source_name or "삭제된 출처",
+        "source_type": source_type or "알 수 없음",
+        "title": item.title,
+        "published_at": item.published_at,
+        "collected_at": item.collected_at,
+        "url": item.url,
+        "summary_text": item.summary_text,
+        "category": item.category,
+        "region": item.region,
+        "tags": item.tags,
+        "status": item.status,
+        "image_urls": item.image_urls,
+        "thumbnail_url": thumbnail
+    }
 
 
 @router.get("/download-proxy")
 async def download_proxy(
+    request: Request,
     url: str,
     filename: Optional[str] = Query(None),
     referer: Optional[str] = Query(None)
 ):
-    """Proxy for downloading external files to avoid CORS and force attachment"""
+    """Proxy for downloading external files to avoid CORS and force attachment (cached on disk)"""
     import logging
+    from app.services import media_proxy_service
     logger = logging.getLogger(__name__)
     
     # Save whether filename was explicitly requested
     is_download = filename is not None
     
+    url, referer = media_proxy_service.resolve_media_url(url, referer)
     try:
-        # Auto-detect referer if not provided
-        if not referer:
-            if "pstatic.net" in url or "naver.com" in url:
-                referer = "https://m.blog.naver.com/"
-            elif "ulsan.go.kr" in url:
-                referer = "https://www.ulsan.go.kr/"
-            elif "cdninstagram.com" in url:
-                referer = "https://www.threads.net/"
-
-        # Handle Ulsan HHBbs links
-        if "HHBbs.EncDownFile" in url:
-            logger.info(f"Detected HHBbs link: {url}")
-            match = re.search(r"HHBbs\.EncDownFile\('.+?','(.+?)','(.+?)','(.+?)'\)", url)
-            if match:
-                bbs_id, atch_file_id, file_sn = match.groups()
-                url = f"https://www.ulsan.go.kr/u/enc/media/bbsFileDown.do?bbsId={bbs_id}&atchFileId={atch_file_id}&fileSn={file_sn}"
-                logger.info(f"Resolved HHBbs link to: {url}")
-        
-        # Ensure URL is absolute for Ulsan
-        if url.startswith("/"):
-            url = f"https://www.ulsan.go.kr{url}"
-        
-        logger.info(f"Proxying: {url} (Referer: {referer}, Download: {is_download})")
-        
-        # Threads images specifically often like no referer or specific referer
-        # If referer is provided from query, we use it.
-        
-        # Add a proper User-Agent and Referer to avoid being blocked
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Referer": referer if referer else ""
-        }
-        
-        # Use a session to handle cookies if needed
-        session = requests.Session()
-        response = session.get(url, stream=True, timeout=15, headers=headers, verify=False)
-        
-        if response.status_code != 200:
-            logger.error(f"Proxy failed for {url}: status {response.status_code}")
-            # Try once without referer as fallback
-            if referer:
-                logger.info(f"Retrying without referer for {url}")
-                del headers["Referer"]
-                response = session.get(url, stream=True, timeout=15, headers=headers, verify=False)
-
-        response.raise_for_status()
-        logger.info(f"Proxy SUCCESS for {url}: {response.status_code}, Type: {response.headers.get('Content-Type')}")
-        
-        # Determine filename if not provided (needed for media_type or logs)
-        if not filename:
-            cd = response.headers.get("Content-Disposition")
-            if cd and "filename=" in cd:
-                import urllib.parse
-                filename_match = re.search(r"filename\*=UTF-8''(.+)", cd)
-                if filename_match:
-                    filename = urllib.parse.unquote(filename_match.group(1))
-                else:
-                    filename = re.findall(r'filename="?([^";]+)"?', cd)[0]
-            else:
-                filename = url.split("/")[-1].split("?")[0] or "download"
-        
-        filename = filename.replace('"', '').replace("'", "")
-        
-        # Use inline for images by default or if not explicitly requested
-        disposition = "inline"
-        if is_download:
-            disposition = f'attachment; filename="{filename}"'
-
-        return StreamingResponse(
-            response.iter_content(chunk_size=1024 * 64),
-            media_type=response.headers.get("Content-Type", "application/octet-stream"),
-            headers={
-                "Content-Disposition": disposition,
-                "Access-Control-Expose-Headers": "Content-Disposition",
-                "Cache-Control": "public, max-age=3600"
-            }
-        )
-    except Exception as e:
-        logger.error(f"Download proxy error: {str(e)}")
+        entry = await media_proxy_service.fetch_media(url, referer)
+    except media_proxy_service.MediaTooLarge as e:
+        logger.warning(f"Download proxy refused {url}: {e}")
+        raise HTTPException(status_code=413, detail="File is too large")
+    except media_proxy_service.MediaFetchError as e:
+        logger.error(f"Download proxy error for {url}: {e}")
         raise HTTPException(status_code=400, detail=f"Download failed: {str(e)}")
+    
+    # Determine filename if not provided
+    if not filename:
+        cd = entry.content_disposition
+        if cd and "filename=" in cd:
+            filename_match = re.search(r"filename\*=UTF-8''(.+)", cd)
+            if filename_match:
+                filename = urllib.parse.unquote(filename_match.group(1))
+            else:
+                filename = re.findall(r'filename="?([^";]+)"?', cd)[0]
+        else:
+            filename = url.split("/")[-1].split("?")[0] or "download"
+    
+    filename = filename.replace('"', '').replace("'", "")
+    
+    # Use inline for images by default or if not explicitly requested
+    disposition = "inline"
+    if is_download:
+        disposition = f'attachment; filename="{filename}"'
+    
+    if isinstance(entry, media_proxy_service.MediaStream):
+        # Not cacheable: relayed as it arrives, without range support
+        headers = {"Content-Disposition": disposition, "Cache-Control": "no-store"}
+        if entry.size is not None:
+            headers["Content-Length"] = str(entry.size)
+        return StreamingResponse(entry.iter_bytes(), media_type=entry.content_type, headers=headers)
+    
+    headers = {
+        "Content-Disposition": disposition,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=3600",
+        "ETag": f'"{entry.sha256}"'
+    }
+    
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        entry.close()
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        byte_range = media_proxy_service.parse_range(request.headers.get("range"), entry.size)
+    except ValueError:
+        entry.close()
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{entry.size}"})
+    
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{entry.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        status_code = 206
+    else:
+        start, end = 0, None
+        headers["Content-Length"] = str(entry.size)
+        status_code = 200
+    
+    return StreamingResponse(
+        media_proxy_service.iter_file(entry.file, start, end),
+        status_code=status_code,
+        media_type=entry.content_type,
+        headers=headers
+    )
+
+
+@router.get("/thumbnail")
+async def get_thumbnail(url: str, sig: Optional[str] = Query(None), referer: Optional[str] = Query(None)):
+    """Resized WebP/JPEG variant of an item image, generated on first request (signed URLs only)"""
+    import asyncio
+    import io
+    import logging
+    from app.services import media_proxy_service
+    logger = logging.getLogger(__name__)
+    
+    # Thumbnails are written to disk, so only URLs from item responses are rendered
+    if not thumbnail_service.verify_signature(url, sig):
+        raise HTTPException(status_code=403, detail="Invalid thumbnail signature")
+    
+    path = thumbnail_service.thumbnail_path(url)
+    if not path:
+        try:
+            entry = await media_proxy_service.fetch_media(*media_proxy_service.resolve_media_url(url, referer))
+            if isinstance(entry, media_proxy_service.MediaStream):
+                source = io.BytesIO(await entry.read(thumbnail_service.MAX_SOURCE_BYTES))
+            else:
+                source = entry.file
+            try:
+                path = await asyncio.to_thread(thumbnail_service.render_thumbnail, source, url)
+            finally:
+                source.close()
+        except (media_proxy_service.MediaFetchError, thumbnail_service.ThumbnailError) as e:
+            # Serve the original through the proxy rather than a broken image
+            logger.warning(f"Thumbnail unavailable for {url}: {e}")
+            params = {"url": url, "referer": referer} if referer else {"url": url}
+            return RedirectResponse(f"/api/items/download-proxy?{urllib.parse.urlencode(params)}")
+    
+    media_type = "image/webp" if path.endswith(".webp") else "image/jpeg"
+    # Thumbnails are keyed by the source URL and never change
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": "public, max-age=604800"})
 
 
 @router.get("/{item_id}", response_model=ItemDetail)
 async def get_item(
     item_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get item detail by ID"""
-    result = db.query(Item, Source).join(Source, Item.source_id == Source.id).filter(Item.id == item_id).first()
-    if not result:
+    # Two queries whatever the duplicate count: item + source, then duplicates + their items
+    item = (await db.execute(
+        select(Item).options(
+            joinedload(Item.source, innerjoin=True),
+            selectinload(Item.duplicates).joinedload(Duplicate.duplicate_of)
+        ).where(Item.id == item_id)
+    )).scalars().first()
+    if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     
-    item, source = result
+    source = item.source
     
     # Data Isolation check
     if current_user.role != "admin" and item.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Permission denied")
     
-    # Get duplicates
-    duplicates = db.query(Duplicate).filter(Duplicate.item_id == item_id).all()
-    duplicate_list = []
-    for dup in duplicates:
-        dup_item = db.query(Item).filter(Item.id == dup.duplicate_of_item_id).first()
-        if dup_item:
-            duplicate_list.append({
-                "id": dup_item.id,
-                "title": dup_item.title,
-                "url": dup_item.url,
-                "similarity": dup.similarity
-            })
+    duplicate_list = [
+        {
+            "id": dup.duplicate_of.id,
+            "title": dup.duplicate_of.title,
+            "url": dup.duplicate_of.url,
+            "similarity": dup.similarity
+        }
+        for dup in item.duplicates
+        if dup.duplicate_of
+    ]
     
     item_dict = {
         "id": item.id,
@@ -325,7 +397,7 @@ async def get_item(
         "tags": item.tags,
         "status": item.status,
         "image_urls": item.image_urls,
-        "thumbnail_url": item.image_urls[0] if item.image_urls and len(item.image_urls) > 0 else None,
+        "thumbnail_url": thumbnail_service.thumbnail_url(item.image_urls[0], source.type) if item.image_urls and len(item.image_urls) > 0 else None,
         "raw_text": item.raw_text,
         "source_item_id": item.source_item_id,
         "hash_content": item.hash_content,
@@ -365,6 +437,10 @@ async def update_item(
     if item_update.tags is not None:
         item.tags = item_update.tags
     
+    # Keep search results in line with edited text
+    if item_update.title is not None or item_update.summary_text is not None:
+        search_service.index_item(db, item)
+    
     db.commit()
     db.refresh(item)
     return item
@@ -395,10 +471,12 @@ async def add_to_queue(
     db.add(queue_entry)
     
     # Update item status
+    previous_status = item.status
     item.status = "queued"
     
     db.commit()
     db.refresh(queue_entry)
+    stats_service.record_status_change(item.user_id, previous_status, "queued")
     
     return {"message": "Item added to queue", "queue_id": queue_entry.id}
 
@@ -419,6 +497,7 @@ async def delete_item(
         raise HTTPException(status_code=403, detail="Permission denied")
     
     # Soft Delete: Update status to 'deleted'
+    previous_status = item.status
     item.status = "deleted"
     
     # Clean up associated data but keep the Item for dedup check
@@ -427,8 +506,12 @@ async def delete_item(
     # Delete duplicates references
     db.query(Duplicate).filter(Duplicate.item_id == item_id).delete()
     db.query(Duplicate).filter(Duplicate.duplicate_of_item_id == item_id).delete()
+    # Deleted items are no longer near-duplicate candidates
+    minhash_service.remove_items_from_index(db, [item_id])
+    simhash_service.remove_items_from_index(db, [item_id])
     
     db.commit()
+    stats_service.record_status_change(item.user_id, previous_status, "deleted")
     return {"message": "Item deleted successfully"}
 
 
@@ -455,11 +538,15 @@ async def bulk_delete_items(
     db.query(Queue).filter(Queue.item_id.in_(found_ids)).delete(synchronize_session=False)
     db.query(Duplicate).filter(Duplicate.item_id.in_(found_ids)).delete(synchronize_session=False)
     db.query(Duplicate).filter(Duplicate.duplicate_of_item_id.in_(found_ids)).delete(synchronize_session=False)
+    minhash_service.remove_items_from_index(db, found_ids)
+    simhash_service.remove_items_from_index(db, found_ids)
     
     # Soft delete: update status
     # We iterate because update with 'in_' and 'synchronize_session=False' is efficient
     deleted_count = items.update({Item.status: "deleted"}, synchronize_session=False)
     db.commit()
+    for user_id in {i.user_id for i in item_list}:
+        stats_service.invalidate(user_id)
     
     return {"message": f"Successfully deleted {deleted_count} items", "deleted_count": deleted_count}
 
@@ -476,8 +563,9 @@ async def delete_all_items(
     if current_user.role != "admin":
         query = query.filter(Item.user_id == current_user.id)
     
-    # Get all matching item IDs for cleanup
-    item_ids = [i[0] for i in query.with_entities(Item.id).all()]
+    # Get all matching item IDs (and owners, for the dashboard counters) for cleanup
+    rows = query.with_entities(Item.id, Item.user_id).all()
+    item_ids = [row[0] for row in rows]
     
     if not item_ids:
         return {"message": "No items to delete", "deleted_count": 0}
@@ -486,9 +574,13 @@ async def delete_all_items(
     db.query(Queue).filter(Queue.item_id.in_(item_ids)).delete(synchronize_session=False)
     db.query(Duplicate).filter(Duplicate.item_id.in_(item_ids)).delete(synchronize_session=False)
     db.query(Duplicate).filter(Duplicate.duplicate_of_item_id.in_(item_ids)).delete(synchronize_session=False)
+    minhash_service.remove_items_from_index(db, item_ids)
+    simhash_service.remove_items_from_index(db, item_ids)
     
     # Soft delete all
     deleted_count = query.update({Item.status: "deleted"}, synchronize_session=False)
     db.commit()
+    for user_id in {row[1] for row in rows}:
+        stats_service.invalidate(user_id)
     
     return {"message": f"Successfully deleted all {deleted_count} items", "deleted_count": deleted_count}
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.models.user import User
-from app.auth import get_current_user
+from app.auth import get_current_user, attach_user, invalidate_cached_user
 import requests
 import json
 from datetime import datetime
@@ -40,6 +40,7 @@ def refresh_token_if_needed(user: User, db: Session):
             expires_in = int(data.get('expires_in', 3600))
             user.naver_token_expires_at = datetime.utcnow() + datetime.timedelta(seconds=expires_in)
             db.commit()
+            invalidate_cached_user(user.username)
         else:
              raise HTTPException(status_code=401, detail="Failed to refresh Naver token")
 
@@ -57,6 +58,7 @@ def write_post(
     Writes a post to Naver Cafe.
     Multipart request to support images.
     """
+    current_user = attach_user(db, current_user)
     refresh_token_if_needed(current_user, db)
     
     url = f"{BASE_URL}/{club_id}/menu/{menu_id}/articles"
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
-from app.auth import get_current_user
+from app.auth import get_current_user, attach_user, invalidate_cached_user
 import requests
 import secrets
 import urllib.parse
@@ -89,6 +89,7 @@ def callback_naver(code: str, state: str, db: Session = Depends(get_db)):
     user.naver_token_expires_at = datetime.utcnow() + timedelta(seconds=int(data['expires_in']))
     
     db.commit()
+    invalidate_cached_user(user.username)
     
     return RedirectResponse(url="http://localhost:3000/dashboard?naver_connected=true")
 
@@ -97,8 +98,10 @@ def disconnect_naver(db: Session = Depends(get_db), current_user: User = Depends
     """
     Disconnects Naver account (clears tokens).
     """
-    current_user.naver_access_token = None
-    current_user.naver_refresh_token = None
-    current_user.naver_token_expires_at = None
+    user = attach_user(db, current_user)
+    user.naver_access_token = None
+    user.naver_refresh_token = None
+    user.naver_token_expires_at = None
     db.commit()
+    invalidate_cached_user(user.username)
     return {"status": "disconnected"}
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.queue import Queue
 from app.models.item import Item
 from app.auth import get_current_user, require_role
 from app.models.user import User
 from app.services.template_service import generate_cafe_post
+from app.services import stats_service
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -34,18 +37,19 @@ class ApproveRequest(BaseModel):
 
 @router.get("", response_model=List[QueueResponse])
 async def list_queue(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all items in queue"""
-    query = db.query(Queue).join(Item)
+    # The joined Item populates Queue.item, so the loop below issues no queries
+    query = select(Queue).join(Queue.item).options(contains_eager(Queue.item))
     if current_user.role != "admin":
-        query = query.filter(Item.user_id == current_user.id)
-    queue_items = query.all()
+        query = query.where(Item.user_id == current_user.id)
+    queue_items = (await db.execute(query)).scalars().all()
     
     result = []
     for q in queue_items:
-        item = db.query(Item).filter(Item.id == q.item_id).first()
+        item = q.item
         result.append({
             "id": q.id,
             "item_id": q.item_id,
@@ -91,9 +95,11 @@ async def approve_queue_item(
     queue_item.payload_text = payload
     
     # Update item status
+    previous_status = item.status
     item.status = "approved"
     
     db.commit()
+    stats_service.record_status_change(item.user_id, previous_status, "approved")
     
     return {
         "message": "Item approved",
@@ -119,12 +125,15 @@ async def reject_queue_item(
         # Data Isolation check
         if current_user.role != "admin" and item.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Permission denied")
+        previous_status = item.status
         item.status = "rejected"
     
     queue_item.note_editor = request.note
     
     db.delete(queue_item)
     db.commit()
+    if item:
+        stats_service.record_status_change(item.user_id, previous_status, "rejected")
     
     return {"message": "Item rejected", "queue_id": queue_id}
 
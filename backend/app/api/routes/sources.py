@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List, Optional
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.source import Source
 from app.auth import get_current_user, require_role
 from app.models.user import User
@@ -37,17 +39,19 @@ class SourceCreate(BaseModel):
 
 @router.get("", response_model=List[SourceResponse])
 async def list_sources(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all sources"""
-    query = db.query(Source)
+    query = select(Source)
     if current_user.role != "admin":
-        query = query.filter(Source.user_id == current_user.id)
-    return query.all()
+        query = query.where(Source.user_id == current_user.id)
+    return (await db.execute(query)).scalars().all()
 
 
 from app.models.duplicate import Duplicate
+from app.services import minhash_service, simhash_service, search_service, stats_service
+from app.services.schedule_service import compute_next_due_at
 
 @router.post("", response_model=SourceResponse)
 async def create_source(
@@ -97,6 +101,8 @@ async def toggle_source(
         raise HTTPException(status_code=403, detail="Permission denied")
     
     source.enabled = enabled
+    if enabled:
+        source.next_due_at = compute_next_due_at(source)
     db.commit()
     
     return {"message": f"Source {'enabled' if enabled else 'disabled'}", "source_id": source_id}
@@ -131,6 +137,10 @@ async def update_source(
     for key, value in update_data.items():
         setattr(source, key, value)
     
+    # Reschedule when the interval changes or the source is re-enabled
+    if "collect_interval" in update_data or update_data.get("enabled"):
+        source.next_due_at = compute_next_due_at(source)
+    
     db.commit()
     db.refresh(source)
     return source
@@ -162,10 +172,15 @@ async def delete_source(
         ).delete(synchronize_session=False)
 
         db.query(Queue).filter(Queue.item_id.in_(item_ids)).delete(synchronize_session=False)
+        minhash_service.remove_items_from_index(db, item_ids)
+        simhash_service.remove_items_from_index(db, item_ids)
+        search_service.remove_items_from_index(db, item_ids)
         db.query(Item).filter(Item.source_id == source_id).delete(synchronize_session=False)
     
     db.delete(source)
     db.commit()
+    for user_id in {item.user_id for item in items}:
+        stats_service.invalidate(user_id)
     
     return {"message": "Source deleted successfully", "source_id": source_id}
 
@@ -1,33 +1,26 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-import shutil
-import os
-from uuid import uuid4
-from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from app.config import settings
+from app.services.upload_service import store_image, UploadTooLarge, InvalidImage
 
 router = APIRouter()
 
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), "static", "uploads")
 
 @router.post("/image")
 async def upload_image(file: UploadFile = File(...)):
-    """Upload an image file and return its URL"""
-    if not file.content_type.startswith("image/"):
+    """Upload an image file and return its URL (identical images share one stored file)"""
+    if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
     
-    # Create upload directory if it doesn't exist
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
-    
-    # Generate unique filename
-    ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-    filename = f"{datetime.now().strftime('%Y%m%d')}_{uuid4().hex}.{ext}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
+    # Reject early when the multipart part already told us its size
+    if file.size is not None and file.size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="File is too large")
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # Return URL relative to server root
-        return {"url": f"/static/uploads/{filename}", "filename": filename}
+        return await run_in_threadpool(store_image, file.file, file.filename)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidImage as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional, Any
 from app.database import get_db
 from app.models.user import User
-from app.auth import get_current_user, require_role
+from app.auth import get_current_user, require_role, invalidate_cached_user
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -69,6 +69,7 @@ async def update_user(
             user.expires_at = val
         
     db.commit()
+    invalidate_cached_user(user.username)
     db.refresh(user)
     return user
 
@@ -86,6 +87,8 @@ async def delete_user(
     if user.id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
     
+    username = user.username
     db.delete(user)
     db.commit()
+    invalidate_cached_user(username)
     return {"message": "User deleted successfully"}
@@ -1,12 +1,16 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
+import threading
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -40,7 +44,6 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def check_user_expiration(user: User):
     """Check if a user account has expired"""
-    print(f"DEBUG: Checking expiration for {user.username}. expires_at: {user.expires_at}")
     if user.expires_at:
         from datetime import datetime, timezone
         now = datetime.now(timezone.utc)
@@ -50,22 +53,60 @@ def check_user_expiration(user: User):
         if expires_at.tzinfo is None:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
         
-        print(f"DEBUG: now={now}, expires_at={expires_at}")
         if now > expires_at:
-            print(f"DEBUG: {user.username} EXPIRED!")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="사용 기간이 만료되었습니다. 관리자에게 문의하세요. (Your account has expired. Please contact the administrator.)"
             )
+
+
+# Resolved users by token subject: username -> (detached User snapshot, cached_at).
+# Per process, so changes made in another worker show up after AUTH_USER_CACHE_TTL.
+_user_cache: Dict[str, Tuple[User, float]] = {}
+_user_cache_lock = threading.Lock()
+
+
+def _snapshot_user(user: User) -> User:
+    """Detached copy of a loaded user that can be merged into a session without a query"""
+    snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate_cached_user(username: Optional[str] = None):
+    """Drop a user (or every user) from the auth cache after changing role, expiry or settings"""
+    with _user_cache_lock:
+        if username is None:
+            _user_cache.clear()
         else:
-            print(f"DEBUG: {user.username} NOT EXPIRED")
-    else:
-        print(f"DEBUG: {user.username} has NO expiration date")
+            _user_cache.pop(username, None)
+
+
+def attach_user(db: Session, user: User) -> User:
+    """The current user as part of a sync session, for routes that modify it"""
+    return db.merge(user, load=False)
+
+
+async def _resolve_user(db: AsyncSession, username: str) -> Optional[User]:
+    ttl = settings.AUTH_USER_CACHE_TTL
+    if ttl > 0:
+        with _user_cache_lock:
+            cached = _user_cache.get(username)
+        if cached and time.monotonic() - cached[1] < ttl:
+            # A private copy per request, so route changes never leak into the cache
+            return _snapshot_user(cached[0])
+    
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
+    if user is not None and ttl > 0:
+        with _user_cache_lock:
+            _user_cache[username] = (_snapshot_user(user), time.monotonic())
+    return user
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current authenticated user from JWT token"""
     credentials_exception = HTTPException(
@@ -81,7 +122,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
+    user = await _resolve_user(db, username)
     if user is None:
         raise credentials_exception
     
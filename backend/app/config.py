@@ -14,14 +14,41 @@ class Settings(BaseSettings):
     
     # Summarization
     SUMMARY_MODE: str = "rule"  # 'rule' or 'llm'
+    SUMMARY_LLM_MODEL: str = "gpt-3.5-turbo"
+    SUMMARY_LLM_CONCURRENCY: int = 4  # Concurrent LLM requests per batch
+    SUMMARY_LLM_TOKENS_PER_MINUTE: int = 60000  # Token budget shared by all workers (Redis)
+    SUMMARY_LLM_MAX_RETRIES: int = 3  # Retries with exponential backoff on rate limits/timeouts
+    SUMMARY_LLM_MAX_INPUT_CHARS: int = 2000
+    SUMMARY_LLM_BATCH_SIZE: int = 50  # Items per summarize_items task
     
     # Collection
     COLLECT_INTERVAL_MINUTES: int = 5
+    CRAWL_HOST_RATE: float = 2.0  # Requests per second per host, shared by all workers
+    CRAWL_HOST_BURST: int = 5
+    CRAWL_RATE_LIMIT_MAX_WAIT: float = 60.0  # Seconds a request waits for its host before going anyway
+    BROWSER_POOL_MAX_PAGES: int = 4  # Open Playwright pages per worker process
+    BROWSER_POOL_RECYCLE_AFTER: int = 50  # Relaunch the pooled browser after this many page leases
+    
+    # Media proxy disk cache (/api/items/download-proxy)
+    MEDIA_CACHE_DIR: str = ""  # Defaults to backend/media_cache
+    MEDIA_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    MEDIA_CACHE_MAX_OBJECT_BYTES: int = 50 * 1024 * 1024  # Larger responses are relayed but not kept
+    MEDIA_PROXY_MAX_BYTES: int = 200 * 1024 * 1024  # Downloads past this size are aborted
+    MEDIA_CACHE_DEFAULT_TTL: int = 86400  # Freshness for upstream responses without cache headers
+    
+    # Image uploads (/api/upload/image)
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_MAX_PIXELS: int = 40_000_000  # Width x height limit checked from the image header
+    
+    # Deduplication
+    DEDUP_MINHASH_THRESHOLD: float = 0.7  # Estimated Jaccard similarity for near-duplicates
+    DEDUP_SIMHASH_DISTANCE: int = 3  # Max Hamming distance between SimHashes (at most 3 with 4 blocks)
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+    AUTH_USER_CACHE_TTL: int = 60  # Seconds a resolved user is reused across requests (0 disables)
     
     class Config:
         # Look for .env in current directory, parent directory, and backend directory
@@ -17,3 +17,52 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its async driver (asyncpg for PostgreSQL, aiosqlite for SQLite)"""
+    scheme, separator, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{separator}{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{separator}{rest}"
+    return url
+
+
+# Created on first use so Celery workers (sync only) never need the async drivers
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        _async_engine = create_async_engine(async_database_url(settings.DATABASE_URL), pool_pre_ping=True)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    """New AsyncSession bound to the async engine"""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _async_sessionmaker = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker()
+
+
+async def dispose_async_engine():
+    """Close pooled async connections (app shutdown)"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+async def get_async_db():
+    """
+    Async database session dependency for read-heavy routes
+    Queries run on the event loop without blocking it; lazy loading is not
+    available, so load relationships eagerly (joinedload/selectinload).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
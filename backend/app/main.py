@@ -1,12 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import items, queue, sources, auth, health, users, upload, ai
-from app.database import engine, Base
 from fastapi.staticfiles import StaticFiles
 import os
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Database schema is managed by Alembic (alembic upgrade head)
 
 app = FastAPI(
     title="Ulsan Content Collection Platform",
@@ -53,6 +51,14 @@ async def startup_event():
     finally:
         db.close()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled upstream connections of the media proxy and the async DB pool"""
+    from app.services.media_proxy_service import close_http_clients
+    from app.database import dispose_async_engine
+    await close_http_clients()
+    await dispose_async_engine()
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -60,13 +66,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Content-Disposition", "Content-Range", "Accept-Ranges"],
 )
 
 # Prevent caching for API routes
 @app.middleware("http")
 async def add_no_cache_header(request, call_next):
     response = await call_next(request)
-    if request.url.path.startswith("/api/"):
+    # Routes that set their own Cache-Control (media proxy) keep it
+    if request.url.path.startswith("/api/") and "cache-control" not in response.headers:
         response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
         response.headers["Pragma"] = "no-cache"
         response.headers["Expires"] = "0"
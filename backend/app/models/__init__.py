@@ -3,5 +3,9 @@ from app.models.item import Item
 from app.models.queue import Queue
 from app.models.duplicate import Duplicate
 from app.models.user import User
+from app.models.minhash import ItemMinHash, MinHashBand
+from app.models.simhash import ItemSimHashBlock
+from app.models.analysis_cache import AnalysisCache
+from app.models.search import ItemSearchTerm
 
-__all__ = ["Source", "Item", "Queue", "Duplicate", "User"]
+__all__ = ["Source", "Item", "Queue", "Duplicate", "User", "ItemMinHash", "MinHashBand", "ItemSimHashBlock", "AnalysisCache", "ItemSearchTerm"]
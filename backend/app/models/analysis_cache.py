@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class AnalysisCache(Base):
+    __tablename__ = "analysis_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    hash_content = Column(String(64), nullable=False)  # Item.hash_content of the analyzed text
+    mode = Column(String(100), nullable=False)  # Summary producer: 'rule' or 'llm:<model>'
+    title_hash = Column(String(64))  # Classification also depends on the title
+    summary_text = Column(Text)
+    category = Column(String(50))
+    region = Column(String(100))
+    tags = Column(JSON)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint("hash_content", "mode", name="uq_analysis_cache_hash_mode"),
+    )
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, ForeignKey, Float
+from sqlalchemy.orm import relationship
 from app.database import Base
 
 
@@ -9,3 +10,5 @@ class Duplicate(Base):
     item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
     duplicate_of_item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
     similarity = Column(Float)  # 0.0 to 1.0
+    
+    duplicate_of = relationship("Item", foreign_keys=[duplicate_of_item_id], viewonly=True)
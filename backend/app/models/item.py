@@ -1,7 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, ForeignKey, JSON, Index, text
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
+# Predicate of the partial indexes below; must match the filter list_items applies
+ACTIVE = text("status <> 'deleted'")
+
 
 class Item(Base):
     __tablename__ = "items"
@@ -21,7 +25,50 @@ class Item(Base):
     status = Column(String(50), default="collected")  # collected, queued, approved, rejected, posted
     hash_content = Column(String(64), index=True)  # SHA-256 hash for dedup
     hash_url = Column(String(64), index=True)  # URL hash
+    simhash = Column(BigInteger, index=True)  # 64-bit SimHash of title + text (signed), for near-dup lookup
     image_urls = Column(JSON)  # Array of image URLs
     meta_json = Column(JSON)  # Additional metadata
     score_priority = Column(Integer, default=0)
     user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    
+    source = relationship("Source")
+    # Duplicate rows recorded for this item (read-only; rows are written by dedup_service)
+    duplicates = relationship("Duplicate", foreign_keys="Duplicate.item_id", viewonly=True)
+    
+    __table_args__ = (
+        # One copy of a URL per user; lets batch ingestion use ON CONFLICT DO NOTHING
+        Index("uq_items_user_hash_url", "user_id", "hash_url", unique=True),
+        # Keyset pagination of item lists (see pagination_service.ITEM_LIST_ORDER).
+        # Lists hide deleted items by default, so those rows are left out of the index.
+        # SQLite sorts NULLs last in DESC order already and rejects NULLS LAST in indexes.
+        Index(
+            "ix_items_user_list_order", "user_id",
+            published_at.desc().nullslast(), collected_at.desc().nullslast(), id.desc(),
+            postgresql_where=ACTIVE
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_items_user_list_order", "user_id",
+            published_at.desc(), collected_at.desc(), id.desc(),
+            sqlite_where=ACTIVE
+        ).ddl_if(dialect="sqlite"),
+        Index(
+            "ix_items_list_order",
+            published_at.desc().nullslast(), collected_at.desc().nullslast(), id.desc(),
+            postgresql_where=ACTIVE
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_items_list_order",
+            published_at.desc(), collected_at.desc(), id.desc(),
+            sqlite_where=ACTIVE
+        ).ddl_if(dialect="sqlite"),
+        # Status tabs and dashboard counts (stats_service groups by status per user)
+        Index("ix_items_user_status", "user_id", "status"),
+        # Dashboard "collected in the last 24h" window, per user and for admins
+        Index("ix_items_user_collected_at", "user_id", "collected_at"),
+        Index("ix_items_collected_at", "collected_at"),
+        # Category / region filters on the default (non-deleted) list
+        Index("ix_items_user_category_active", "user_id", "category", postgresql_where=ACTIVE, sqlite_where=ACTIVE),
+        Index("ix_items_user_region_active", "user_id", "region", postgresql_where=ACTIVE, sqlite_where=ACTIVE),
+        # Source filter and source deletion
+        Index("ix_items_source_id", "source_id"),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, Index
+from app.database import Base
+
+
+class ItemMinHash(Base):
+    __tablename__ = "item_minhashes"
+
+    item_id = Column(Integer, ForeignKey("items.id"), primary_key=True)
+    signature = Column(JSON, nullable=False)  # MinHash signature (list of ints)
+
+
+class MinHashBand(Base):
+    __tablename__ = "minhash_bands"
+
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False, index=True)
+    band = Column(Integer, nullable=False)  # LSH band number
+    bucket = Column(String(16), nullable=False)  # Hash of the band's signature rows
+
+    __table_args__ = (
+        Index("ix_minhash_bands_band_bucket", "band", "bucket"),
+    )
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -14,3 +15,5 @@ class Queue(Base):
     note_editor = Column(Text)  # Editor notes
     export_format = Column(String(50), default="naver_cafe_markdown")
     payload_text = Column(Text)  # Final generated post content
+    
+    item = relationship("Item")
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database import Base
+
+
+class ItemSearchTerm(Base):
+    __tablename__ = "item_search_terms"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False, index=True)
+    user_id = Column(Integer)  # Item.user_id, copied so a user's search reads only their own postings
+    term = Column(String(16), nullable=False)  # Character bigram (or a single-character token)
+    weight = Column(Integer, nullable=False)  # Field-weighted occurrences (title 3, summary 2, text 1)
+    
+    __table_args__ = (
+        Index("ix_item_search_terms_term_item", "term", "item_id"),  # Admin search across users
+        Index("ix_item_search_terms_user_term_item", "user_id", "term", "item_id"),
+    )
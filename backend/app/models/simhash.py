@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.database import Base
+
+
+class ItemSimHashBlock(Base):
+    __tablename__ = "item_simhash_blocks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False, index=True)
+    block = Column(Integer, nullable=False)  # Block number (0-3) of the 64-bit SimHash
+    value = Column(Integer, nullable=False)  # 16-bit value of that block
+    
+    __table_args__ = (
+        Index("ix_item_simhash_blocks_block_value", "block", "value"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -13,6 +13,12 @@ class Source(Base):
     enabled = Column(Boolean, default=False)
     collect_interval = Column(Integer, default=60)  # minutes
     last_collected_at = Column(DateTime(timezone=True), nullable=True)
+    next_due_at = Column(DateTime(timezone=True), nullable=True)  # Next scheduled collection (NULL = due now)
     crawl_policy = Column(Text)  # JSON string for crawl configuration
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    
+    __table_args__ = (
+        # Lets the beat tick select only due sources
+        Index("ix_sources_enabled_next_due_at", "enabled", "next_due_at"),
+    )
@@ -0,0 +1,22 @@
+import redis
+from app.config import settings
+
+_redis = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Shared Redis client for caches, counters and rate limits
+
+    The client is created lazily and reuses one connection pool per process.
+    Callers should treat Redis as best-effort and fall back when it is down.
+    """
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=2.0,
+            socket_connect_timeout=2.0,
+            decode_responses=True
+        )
+    return _redis
@@ -0,0 +1,53 @@
+import hashlib
+from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.analysis_cache import AnalysisCache
+
+
+def generate_title_hash(title: str) -> str:
+    """Generate SHA-256 hash of a title (classification depends on it)"""
+    return hashlib.sha256((title or '').strip().encode('utf-8')).hexdigest()
+
+
+def get_cached_analysis(db: Session, hash_content: Optional[str], mode: str) -> Optional[AnalysisCache]:
+    """
+    Return the earlier analysis of identical text produced by the given summarizer
+    Returns None when there is none (or no content hash to look up)
+    """
+    if not hash_content:
+        return None
+    return db.query(AnalysisCache).filter(
+        AnalysisCache.hash_content == hash_content,
+        AnalysisCache.mode == mode
+    ).first()
+
+
+def store_analysis(
+    db: Session,
+    hash_content: Optional[str],
+    mode: str,
+    title: str,
+    summary_text: str,
+    category: Optional[str],
+    region: Optional[str],
+    tags: Optional[List[str]]
+):
+    """Remember the analysis of a text; a concurrent insert of the same key is ignored"""
+    if not hash_content:
+        return
+    
+    entry = AnalysisCache(
+        hash_content=hash_content,
+        mode=mode,
+        title_hash=generate_title_hash(title),
+        summary_text=summary_text,
+        category=category,
+        region=region,
+        tags=tags
+    )
+    try:
+        with db.begin_nested():
+            db.add(entry)
+    except IntegrityError:
+        pass  # Another worker cached the same text first
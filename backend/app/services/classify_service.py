@@ -1,4 +1,4 @@
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 
 # Category keywords (Korean)
@@ -26,82 +26,101 @@ REGION_KEYWORDS = {
     "울주군": ["울주군", "울주"]
 }
 
+# Additional common keywords used as tags
+EXTRA_TAG_KEYWORDS = ["울산", "시민", "참여", "무료", "신청", "접수", "문의", "안내"]
 
-def classify_category(text: str) -> Optional[str]:
-    """
-    Classify category based on keyword matching
-    Returns category name or None
-    """
-    text_lower = text.lower()
-    
-    # Count keyword matches for each category
+
+# Every keyword once, lowercased, in table order
+ALL_KEYWORDS = list(dict.fromkeys(
+    keyword.lower()
+    for keyword in [
+        *(keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords),
+        *(keyword for keywords in REGION_KEYWORDS.values() for keyword in keywords),
+        *EXTRA_TAG_KEYWORDS
+    ]
+))
+
+
+def scan_keywords(text: str) -> Dict[str, int]:
+    """Return {keyword: first position} for all classification keywords in text (case-insensitive)"""
+    # One str.find per keyword runs in C and is faster here than a single-pass
+    # multi-pattern scan written in Python
+    text = text.lower()
     matches = {}
+    for keyword in ALL_KEYWORDS:
+        position = text.find(keyword)
+        if position >= 0:
+            matches[keyword] = position
+    return matches
+
+
+def _category_from_matches(matches: Dict[str, int]) -> str:
+    # Number of distinct keywords matched per category; ties go to the earlier category
+    counts = {}
     for category, keywords in CATEGORY_KEYWORDS.items():
-        count = sum(1 for keyword in keywords if keyword in text_lower)
+        count = sum(1 for keyword in keywords if keyword.lower() in matches)
         if count > 0:
-            matches[category] = count
+            counts[category] = count
     
-    # Return category with most matches
-    if matches:
-        return max(matches.items(), key=lambda x: x[1])[0]
+    if counts:
+        return max(counts.items(), key=lambda x: x[1])[0]
     
     return "공지"  # Default category
 
 
+def _region_from_matches(matches: Dict[str, int]) -> str:
+    for region, keywords in REGION_KEYWORDS.items():
+        if any(keyword.lower() in matches for keyword in keywords):
+            return region
+    
+    return "울산 전체"  # Default region
+
+
+def _tags_from_matches(matches: Dict[str, int]) -> List[str]:
+    # Map matched keywords to tags (regions are tagged by name), ordered by first occurrence
+    region_of = {keyword.lower(): region for region, keywords in REGION_KEYWORDS.items() for keyword in keywords}
+    first_seen = {}
+    for keyword, position in matches.items():
+        tag = region_of.get(keyword, keyword)
+        first_seen[tag] = min(first_seen.get(tag, position), position)
+    
+    return sorted(first_seen, key=lambda tag: (first_seen[tag], tag))[:10]  # Limit to 10 tags
+
+
+def classify_category(text: str) -> Optional[str]:
+    """
+    Classify category based on keyword matching
+    Returns category name or None
+    """
+    return _category_from_matches(scan_keywords(text))
+
+
 def classify_region(text: str) -> str:
     """
     Classify region based on keyword matching
     Returns region name or "울산 전체"
     """
-    text_lower = text.lower()
-    
-    for region, keywords in REGION_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                return region
-    
-    return "울산 전체"  # Default region
+    return _region_from_matches(scan_keywords(text))
 
 
 def generate_tags(title: str, content: str) -> List[str]:
     """
     Generate tags from title and content
-    Returns list of tags
+    Returns list of tags in order of first appearance
     """
-    tags = set()
-    
-    combined_text = f"{title} {content}".lower()
-    
-    # Extract all matched keywords as tags
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in combined_text:
-                tags.add(keyword)
-    
-    # Extract region keywords
-    for region, keywords in REGION_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in combined_text:
-                tags.add(region)
-    
-    # Additional common keywords
-    extra_keywords = ["울산", "시민", "참여", "무료", "신청", "접수", "문의", "안내"]
-    for keyword in extra_keywords:
-        if keyword in combined_text:
-            tags.add(keyword)
-    
-    return list(tags)[:10]  # Limit to 10 tags
+    return _tags_from_matches(scan_keywords(f"{title} {content}"))
 
 
 def classify_item(title: str, content: str) -> Tuple[str, str, List[str]]:
     """
     Classify an item and generate tags
+    Looks the keywords up once and derives category, region and tags from the same matches
     Returns (category, region, tags)
     """
-    combined = f"{title} {content or ''}"
+    matches = scan_keywords(f"{title} {content or ''}")
     
-    category = classify_category(combined)
-    region = classify_region(combined)
-    tags = generate_tags(title, content or "")
+    category = _category_from_matches(matches)
+    region = _region_from_matches(matches)
+    tags = _tags_from_matches(matches)
     
     return category, region, tags
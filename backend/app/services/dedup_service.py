@@ -1,8 +1,9 @@
 import hashlib
-from typing import List, Tuple
+from typing import List, Tuple, Set, Iterable, Optional
 from sqlalchemy.orm import Session
 from app.models.item import Item
 from app.models.duplicate import Duplicate
+from app.services import minhash_service, simhash_service
 
 
 def generate_url_hash(url: str) -> str:
@@ -17,30 +18,46 @@ def generate_content_hash(text: str) -> str:
     return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
 
 
-def calculate_similarity(text1: str, text2: str) -> float:
+def find_existing_url_hashes(db: Session, url_hashes: Iterable[str], source_id: Optional[int] = None) -> Set[str]:
     """
-    Calculate simple similarity between two texts
-    Using character-level intersection over union
+    Resolve which URL hashes are already stored (for one source if source_id is given)
+    Uses one IN query per 500 hashes instead of one query per item
     """
-    if not text1 or not text2:
-        return 0.0
-    
-    # Simple character set comparison
-    set1 = set(text1.lower())
-    set2 = set(text2.lower())
-    
-    intersection = len(set1 & set2)
-    union = len(set1 | set2)
-    
-    if union == 0:
-        return 0.0
-    
-    return intersection / union
+    hashes = list(set(url_hashes))
+    existing = set()
+    for start in range(0, len(hashes), 500):
+        chunk = hashes[start:start + 500]
+        query = db.query(Item.hash_url).filter(Item.hash_url.in_(chunk))
+        if source_id is not None:
+            query = query.filter(Item.source_id == source_id)
+        existing.update(row[0] for row in query.all())
+    return existing
 
 
-def find_duplicates(db: Session, item: Item, similarity_threshold: float = 0.8) -> List[Tuple[int, float]]:
+def find_existing_source_item_ids(db: Session, source_id: int, source_item_ids: Iterable[str]) -> Set[str]:
+    """Resolve which of a source's original item ids are already stored (one IN query per 500)"""
+    ids = list({str(item_id) for item_id in source_item_ids if item_id})
+    existing = set()
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows = db.query(Item.source_item_id).filter(Item.source_id == source_id, Item.source_item_id.in_(chunk)).all()
+        existing.update(row[0] for row in rows)
+    return existing
+
+
+def find_duplicates(
+    db: Session,
+    item: Item,
+    similarity_threshold: Optional[float] = None,
+    signature: Optional[List[int]] = None
+) -> List[Tuple[int, float]]:
     """
     Find duplicate candidates for an item
+    Only earlier items count, so the first copy of a post stays the original
+    even when a whole batch is stored before processing
+    Near-duplicates come from the SimHash block index (a few differing bits)
+    and then the MinHash/LSH index, both across all sources
+    (threshold defaults to settings.DEDUP_MINHASH_THRESHOLD)
     Returns list of (item_id, similarity) tuples
     """
     duplicates = []
@@ -48,7 +65,7 @@ def find_duplicates(db: Session, item: Item, similarity_threshold: float = 0.8)
     # First check URL hash (exact match)
     url_match = db.query(Item).filter(
         Item.hash_url == item.hash_url,
-        Item.id != item.id
+        Item.id < item.id
     ).first()
     
     if url_match:
@@ -58,23 +75,24 @@ def find_duplicates(db: Session, item: Item, similarity_threshold: float = 0.8)
     # Check content hash (exact match)
     content_match = db.query(Item).filter(
         Item.hash_content == item.hash_content,
-        Item.id != item.id
+        Item.id < item.id
     ).first()
     
     if content_match:
         duplicates.append((content_match.id, 1.0))
         return duplicates
     
-    # Check by title similarity (more expensive)
-    recent_items = db.query(Item).filter(
-        Item.id != item.id,
-        Item.source_id == item.source_id  # Same source
-    ).order_by(Item.collected_at.desc()).limit(100).all()
+    # Near-identical check via SimHash blocks (Hamming distance of a few bits)
+    near_matches = simhash_service.find_near_items(db, item)
+    if near_matches:
+        for other_id, distance in near_matches:
+            duplicates.append((other_id, 1.0 - distance / simhash_service.HASH_BITS))
+        return duplicates
     
-    for other_item in recent_items:
-        similarity = calculate_similarity(item.title, other_item.title)
-        if similarity >= similarity_threshold:
-            duplicates.append((other_item.id, similarity))
+    # Near-duplicate check via MinHash/LSH (sublinear in the number of stored items)
+    duplicates.extend(minhash_service.find_similar_items(
+        db, item, threshold=similarity_threshold, signature=signature
+    ))
     
     return duplicates
 
@@ -84,7 +102,8 @@ def process_deduplication(db: Session, item: Item) -> int:
     Process deduplication for an item
     Returns number of duplicates found
     """
-    duplicates = find_duplicates(db, item)
+    signature = minhash_service.item_signature(item)
+    duplicates = find_duplicates(db, item, signature=signature)
     
     for duplicate_id, similarity in duplicates:
         # Check if already recorded
@@ -101,5 +120,10 @@ def process_deduplication(db: Session, item: Item) -> int:
             )
             db.add(dup_record)
     
-    db.commit()
+    # Keep the item findable by later near-duplicates
+    simhash_service.index_item(db, item)
+    minhash_service.index_item(db, item, signature=signature)
+    
+    # Callers commit (batch processing shares one transaction across items)
+    db.flush()
     return len(duplicates)
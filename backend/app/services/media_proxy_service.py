@@ -0,0 +1,562 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, Optional, Tuple, Union
+import httpx
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+CHUNK_SIZE = 64 * 1024
+
+
+class MediaFetchError(Exception):
+    """Upstream could not be fetched (network error or non-2xx status)"""
+
+
+class MediaTooLarge(MediaFetchError):
+    """Upstream body exceeds MEDIA_PROXY_MAX_BYTES"""
+
+
+class MediaEntry:
+    """
+    A cached media object on disk
+    Entries returned by fetch_media carry an open file of their blob, so eviction cannot
+    remove the content while it is served; the caller closes it (iter_file does).
+    """
+    
+    FIELDS = ("url", "path", "sha256", "size", "content_type", "content_disposition", "expires_at", "etag", "last_modified")
+    
+    def __init__(
+        self,
+        url: str,
+        path: str,
+        sha256: str,
+        size: int,
+        content_type: str,
+        content_disposition: Optional[str] = None,
+        expires_at: float = 0.0,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.url = url
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.content_type = content_type
+        self.content_disposition = content_disposition
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.file: Optional[BinaryIO] = None
+    
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+    
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class MediaStream:
+    """
+    An uncacheable (or too large to cache) upstream response relayed to one client
+    without being stored. iter_bytes() yields any already-spooled prefix first, then
+    the rest of the upstream body, and stops the transfer at MEDIA_PROXY_MAX_BYTES.
+    """
+    
+    def __init__(
+        self,
+        url: str,
+        response: httpx.Response,
+        chunks: Optional[AsyncIterator[bytes]] = None,
+        prefix: Optional[BinaryIO] = None
+    ):
+        self.url = url
+        self.response = response
+        # Continues a partially read body when a prefix was spooled already
+        self.chunks = chunks or response.aiter_bytes(CHUNK_SIZE)
+        self.prefix = prefix
+        self.content_type = response.headers.get("content-type", "application/octet-stream")
+        self.content_disposition = response.headers.get("content-disposition")
+        try:
+            self.size = int(response.headers["content-length"])
+        except (KeyError, ValueError):
+            self.size = None
+    
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        size = 0
+        try:
+            if self.prefix is not None:
+                self.prefix.seek(0)
+                while True:
+                    chunk = await asyncio.to_thread(self.prefix.read, CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    yield chunk
+                self._close_prefix()
+            async for chunk in self.chunks:
+                size += len(chunk)
+                if size > settings.MEDIA_PROXY_MAX_BYTES:
+                    # Headers are already sent; dropping the connection is all that is left
+                    raise MediaTooLarge(f"{self.url} exceeds {settings.MEDIA_PROXY_MAX_BYTES} bytes")
+                yield chunk
+        finally:
+            await self.aclose()
+    
+    async def read(self, limit: int) -> bytes:
+        """Whole body in memory; MediaTooLarge past limit bytes"""
+        parts = []
+        size = 0
+        async for chunk in self.iter_bytes():
+            size += len(chunk)
+            if size > limit:
+                await self.aclose()
+                raise MediaTooLarge(f"{self.url} exceeds {limit} bytes")
+            parts.append(chunk)
+        return b"".join(parts)
+    
+    def _close_prefix(self):
+        if self.prefix is not None:
+            name = self.prefix.name
+            self.prefix.close()
+            self.prefix = None
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+    
+    async def aclose(self):
+        self._close_prefix()
+        await self.response.aclose()
+
+
+# Referers image hosts expect per source type (the same ones the frontend sends to download-proxy)
+SOURCE_REFERERS = {
+    "naver_blog": "https://m.blog.naver.com/",
+    "instagram": "https://www.instagram.com/",
+    "threads": "https://www.threads.net/",
+}
+
+
+def source_referer(source_type: Optional[str]) -> Optional[str]:
+    """Referer for images collected from a source of this type (None: detect from the URL)"""
+    return SOURCE_REFERERS.get(source_type or "")
+
+
+def resolve_media_url(url: str, referer: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """Normalize a proxied URL (HHBbs download links, relative Ulsan paths) and pick a referer"""
+    # Auto-detect referer if not provided
+    if not referer:
+        if "pstatic.net" in url or "naver.com" in url:
+            referer = "https://m.blog.naver.com/"
+        elif "ulsan.go.kr" in url:
+            referer = "https://www.ulsan.go.kr/"
+        elif "cdninstagram.com" in url:
+            referer = "https://www.threads.net/"
+    
+    # Handle Ulsan HHBbs links
+    if "HHBbs.EncDownFile" in url:
+        match = re.search(r"HHBbs\.EncDownFile\('.+?','(.+?)','(.+?)','(.+?)'\)", url)
+        if match:
+            bbs_id, atch_file_id, file_sn = match.groups()
+            url = f"https://www.ulsan.go.kr/u/enc/media/bbsFileDown.do?bbsId={bbs_id}&atchFileId={atch_file_id}&fileSn={file_sn}"
+            logger.info(f"Resolved HHBbs link to: {url}")
+    
+    # Ensure URL is absolute for Ulsan
+    if url.startswith("/"):
+        url = f"https://www.ulsan.go.kr{url}"
+    
+    return url, referer
+
+
+def freshness_lifetime(headers: httpx.Headers) -> Optional[int]:
+    """
+    Seconds an upstream response may be served from cache, or None when it must not be stored
+    Follows Cache-Control (no-store/private/no-cache, s-maxage, max-age), then Expires,
+    then MEDIA_CACHE_DEFAULT_TTL for responses without freshness information
+    """
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+    
+    if {"no-store", "private", "no-cache"} & directives.keys():
+        return None
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                return max(0, int(directives[name]))
+            except ValueError:
+                return 0
+    
+    if "expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["expires"]).timestamp()
+            return max(0, int(expires - time.time()))
+        except (TypeError, ValueError):
+            return 0
+    
+    return settings.MEDIA_CACHE_DEFAULT_TTL
+
+
+class MediaCache:
+    """
+    Content-addressed, size-bounded disk cache for proxied media
+    
+    Bodies are stored once per SHA-256 under blobs/, and each URL has a small JSON
+    entry under entries/ pointing at its blob. Entry mtimes record the last access;
+    when the cache grows past max_bytes the least recently used entries are dropped
+    along with blobs no other entry references. Entries are handed out with their blob
+    already open, so a blob evicted mid-response stays readable until it is closed.
+    """
+    
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(root, "blobs")
+        self.entry_dir = os.path.join(root, "entries")
+        self.tmp_dir = os.path.join(root, "tmp")
+        for directory in (self.blob_dir, self.entry_dir, self.tmp_dir):
+            os.makedirs(directory, exist_ok=True)
+        self._approx_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def url_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.entry_dir, f"{self.url_key(url)}.json")
+    
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], sha256)
+    
+    def temp_file(self):
+        return tempfile.NamedTemporaryFile(dir=self.tmp_dir, delete=False)
+    
+    def lookup(self, url: str) -> Optional[MediaEntry]:
+        """Cached entry for url (fresh or stale) with its blob opened, touching it for LRU"""
+        entry_path = self._entry_path(url)
+        try:
+            with open(entry_path, encoding="utf-8") as f:
+                entry = MediaEntry(**json.load(f))
+            entry.file = open(entry.path, "rb")
+            os.utime(entry_path)
+            return entry
+        except (OSError, ValueError, TypeError):
+            return None
+    
+    def store(self, entry: MediaEntry, temp_path: Optional[str] = None) -> MediaEntry:
+        """
+        Record entry, moving temp_path into its blob unless identical content is already cached
+        With temp_path, the returned entry has the new content open (entry.file)
+        """
+        entry.path = self.blob_path(entry.sha256)
+        if temp_path:
+            # Opened before the move: the descriptor keeps the content even if the blob is evicted
+            entry.file = open(temp_path, "rb")
+        
+        # Entry first: a concurrent evict() treats blobs without entries as orphans
+        with tempfile.NamedTemporaryFile("w", dir=self.tmp_dir, delete=False, encoding="utf-8") as f:
+            json.dump(entry.to_dict(), f)
+        os.replace(f.name, self._entry_path(entry.url))
+        
+        if temp_path:
+            if os.path.exists(entry.path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(entry.path), exist_ok=True)
+                os.replace(temp_path, entry.path)
+                with self._lock:
+                    if self._approx_bytes is not None:
+                        self._approx_bytes += entry.size
+        
+        if self._over_budget():
+            self.evict()
+        return entry
+    
+    def _over_budget(self) -> bool:
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = sum(size for size in self._blob_sizes().values())
+            return self._approx_bytes > self.max_bytes
+    
+    def _blob_sizes(self) -> Dict[str, int]:
+        sizes = {}
+        for prefix in os.scandir(self.blob_dir):
+            if prefix.is_dir():
+                for blob in os.scandir(prefix.path):
+                    sizes[blob.name] = blob.stat().st_size
+        return sizes
+    
+    def evict(self):
+        """Drop least recently used entries until the blobs fit in max_bytes"""
+        sizes = self._blob_sizes()
+        entries = []
+        references: Dict[str, int] = {}
+        for entry_file in os.scandir(self.entry_dir):
+            try:
+                with open(entry_file.path, encoding="utf-8") as f:
+                    sha256 = json.load(f)["sha256"]
+                entries.append((entry_file.stat().st_mtime, entry_file.path, sha256))
+                references[sha256] = references.get(sha256, 0) + 1
+            except (OSError, ValueError, KeyError):
+                continue
+        
+        total = sum(sizes.values())
+        # Blobs no entry points at (interrupted writes, removed entries) go first
+        for sha256 in [sha256 for sha256 in sizes if sha256 not in references]:
+            total -= self._remove_blob(sha256, sizes)
+        
+        entries.sort()
+        for _, entry_path, sha256 in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            references[sha256] -= 1
+            if references[sha256] == 0:
+                total -= self._remove_blob(sha256, sizes)
+        
+        with self._lock:
+            self._approx_bytes = total
+        logger.info(f"Media cache evicted down to {total} bytes")
+    
+    def _remove_blob(self, sha256: str, sizes: Dict[str, int]) -> int:
+        try:
+            os.remove(self.blob_path(sha256))
+            return sizes.get(sha256, 0)
+        except OSError:
+            return 0
+
+
+_cache: Optional[MediaCache] = None
+_clients: Dict[int, httpx.AsyncClient] = {}
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def get_media_cache() -> MediaCache:
+    global _cache
+    if _cache is None:
+        root = settings.MEDIA_CACHE_DIR or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "media_cache"
+        )
+        _cache = MediaCache(root, settings.MEDIA_CACHE_MAX_BYTES)
+    return _cache
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared connection pool for the running event loop"""
+    loop_id = id(asyncio.get_running_loop())
+    client = _clients.get(loop_id)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=15.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            headers={"User-Agent": USER_AGENT}
+        )
+        _clients[loop_id] = client
+    return client
+
+
+async def close_http_clients():
+    """Close pooled connections (app shutdown)"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing media proxy client: {e}")
+
+
+def _check_size(url: str, size: int):
+    if size > settings.MEDIA_PROXY_MAX_BYTES:
+        raise MediaTooLarge(f"{url} exceeds {settings.MEDIA_PROXY_MAX_BYTES} bytes")
+
+
+async def _download(url: str, referer: Optional[str], stale: Optional[MediaEntry]) -> Union[MediaEntry, MediaStream]:
+    cache = get_media_cache()
+    headers = {"Referer": referer} if referer else {}
+    if stale and stale.etag:
+        headers["If-None-Match"] = stale.etag
+    if stale and stale.last_modified:
+        headers["If-Modified-Since"] = stale.last_modified
+    
+    client = get_http_client()
+    try:
+        request = client.build_request("GET", url, headers=headers)
+        response = await client.send(request, stream=True)
+        if response.status_code >= 400 and referer:
+            # Some hosts reject foreign referers; try once without
+            logger.info(f"Retrying without referer for {url} (status {response.status_code})")
+            await response.aclose()
+            del headers["Referer"]
+            response = await client.send(client.build_request("GET", url, headers=headers), stream=True)
+    except httpx.HTTPError as e:
+        raise MediaFetchError(f"{e.__class__.__name__}: {e}")
+    
+    try:
+        lifetime = freshness_lifetime(response.headers)
+        if response.status_code == 304 and stale:
+            await response.aclose()
+            stale.expires_at = time.time() + (lifetime or 0)
+            return await asyncio.to_thread(cache.store, stale)
+        if stale:
+            stale.close()
+        if response.status_code != 200:
+            raise MediaFetchError(f"Upstream returned status {response.status_code}")
+        
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit():
+            _check_size(url, int(declared))
+        
+        cacheable = (
+            lifetime is not None
+            and (lifetime > 0 or response.headers.get("etag") or response.headers.get("last-modified"))
+            and not (declared and declared.isdigit() and int(declared) > settings.MEDIA_CACHE_MAX_OBJECT_BYTES)
+        )
+        if not cacheable:
+            # Relayed straight to the client; nothing touches the disk
+            return MediaStream(url, response)
+        
+        digest = hashlib.sha256()
+        size = 0
+        f = cache.temp_file()
+        chunks = response.aiter_bytes(CHUNK_SIZE)
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+                if size > settings.MEDIA_CACHE_MAX_OBJECT_BYTES:
+                    # No Content-Length and too big to keep: relay the spooled part and the rest
+                    _check_size(url, size)
+                    f.flush()
+                    return MediaStream(url, response, chunks, prefix=f)
+            f.close()
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    except httpx.HTTPError as e:
+        await response.aclose()
+        raise MediaFetchError(f"{e.__class__.__name__}: {e}")
+    except BaseException:
+        await response.aclose()
+        raise
+    
+    await response.aclose()
+    entry = MediaEntry(
+        url=url,
+        path=f.name,
+        sha256=digest.hexdigest(),
+        size=size,
+        content_type=response.headers.get("content-type", "application/octet-stream"),
+        content_disposition=response.headers.get("content-disposition"),
+        expires_at=time.time() + (lifetime or 0),
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified")
+    )
+    return await asyncio.to_thread(cache.store, entry, f.name)
+
+
+async def fetch_media(url: str, referer: Optional[str] = None) -> Union[MediaEntry, MediaStream]:
+    """
+    Media for url from the disk cache, downloading (or revalidating) it when needed
+    
+    Returns a MediaEntry (cached, with its blob open) or a MediaStream for responses
+    that are not cached; either way the caller must consume or close it. Concurrent
+    requests for the same URL share one upstream fetch when the result is cached.
+    """
+    cache = get_media_cache()
+    entry = await asyncio.to_thread(cache.lookup, url)
+    if entry and entry.is_fresh():
+        return entry
+    
+    pending = _inflight.get(url)
+    if pending is not None:
+        if entry:
+            entry.close()
+        if await asyncio.shield(pending):
+            entry = await asyncio.to_thread(cache.lookup, url)
+            if entry:
+                return entry
+        # The leader got an uncacheable response that only it can serve
+        return await _download(url, referer, None)
+    
+    future = asyncio.get_running_loop().create_future()
+    _inflight[url] = future
+    try:
+        result = await _download(url, referer, entry)
+        future.set_result(isinstance(result, MediaEntry))
+        return result
+    except BaseException as e:
+        if entry:
+            entry.close()
+        future.set_exception(e)
+        # Waiters re-raise it; mark it retrieved so it is not reported again
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(url, None)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) of a single 'bytes=' range; None to serve the whole body
+    Raises ValueError when the range cannot be satisfied
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(0, size - int(end_text))
+            end = size - 1
+    except ValueError:
+        return None
+    
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(f"Range {range_header} not satisfiable for {size} bytes")
+    return start, end
+
+
+def iter_file(f: BinaryIO, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """Yield bytes start..end (inclusive) of an open file, closing it afterwards"""
+    try:
+        f.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
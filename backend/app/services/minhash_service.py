@@ -0,0 +1,136 @@
+import hashlib
+import random
+import re
+from typing import List, Tuple, Optional, Iterable, Set
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.item import Item
+from app.models.minhash import ItemMinHash, MinHashBand
+
+
+# Signature layout: 32 bands x 4 rows. Items with estimated Jaccard >= ~0.5 share
+# at least one band bucket with high probability; changing these requires a reindex.
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+SHINGLE_SIZE = 3  # Character n-grams work for Korean without a morphological analyzer
+MAX_TEXT_CHARS = 2000  # Long posts are represented by their beginning
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20251226)  # Fixed seed: signatures must be stable across processes
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def shingle(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Split normalized text into overlapping character n-grams"""
+    normalized = re.sub(r'\s+', '', (text or '').lower())
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def item_text(title: str, raw_text: Optional[str]) -> str:
+    """Text used to fingerprint an item"""
+    return f"{title or ''} {(raw_text or '')[:MAX_TEXT_CHARS]}"
+
+
+def compute_signature(shingles: Iterable[str]) -> List[int]:
+    """Compute the MinHash signature of a shingle set"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big')
+        for s in shingles
+    ]
+    if not hashes:
+        return []
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_buckets(signature: List[int]) -> List[Tuple[int, str]]:
+    """Split a signature into LSH bands and hash each band to a bucket key"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(','.join(map(str, rows)).encode('utf-8'), digest_size=8).hexdigest()
+        buckets.append((band, digest))
+    return buckets
+
+
+def estimate_similarity(sig1: List[int], sig2: List[int]) -> float:
+    """Estimate Jaccard similarity from two signatures"""
+    if not sig1 or not sig2 or len(sig1) != len(sig2):
+        return 0.0
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+
+def item_signature(item: Item) -> List[int]:
+    """MinHash signature of an item's title and text"""
+    return compute_signature(shingle(item_text(item.title, item.raw_text)))
+
+
+def index_item(db: Session, item: Item, signature: Optional[List[int]] = None):
+    """Add (or replace) an item's signature and band buckets in the index"""
+    signature = signature if signature is not None else item_signature(item)
+    remove_items_from_index(db, [item.id])
+    if not signature:
+        return
+
+    db.add(ItemMinHash(item_id=item.id, signature=signature))
+    db.add_all([
+        MinHashBand(item_id=item.id, band=band, bucket=bucket)
+        for band, bucket in band_buckets(signature)
+    ])
+    db.flush()
+
+
+def remove_items_from_index(db: Session, item_ids: List[int]):
+    """Delete index rows of items (call when items are deleted or soft-deleted)"""
+    if not item_ids:
+        return
+    db.query(MinHashBand).filter(MinHashBand.item_id.in_(item_ids)).delete(synchronize_session=False)
+    db.query(ItemMinHash).filter(ItemMinHash.item_id.in_(item_ids)).delete(synchronize_session=False)
+
+
+def find_similar_items(
+    db: Session,
+    item: Item,
+    threshold: Optional[float] = None,
+    signature: Optional[List[int]] = None,
+    limit: int = 10
+) -> List[Tuple[int, float]]:
+    """
+    Find earlier, non-deleted items of the same owner whose estimated similarity is >= threshold
+    Candidates come from shared LSH band buckets across all sources
+    Returns list of (item_id, similarity) tuples, most similar first
+    """
+    threshold = settings.DEDUP_MINHASH_THRESHOLD if threshold is None else threshold
+    signature = signature if signature is not None else item_signature(item)
+    if not signature:
+        return []
+
+    candidate_query = db.query(MinHashBand.item_id).join(Item, Item.id == MinHashBand.item_id).filter(
+        tuple_(MinHashBand.band, MinHashBand.bucket).in_(band_buckets(signature)),
+        Item.id < item.id,
+        Item.status != 'deleted'  # Rows indexed before deletion cleanup
+    )
+    if item.user_id is not None:
+        candidate_query = candidate_query.filter(Item.user_id == item.user_id)
+    candidate_ids = {row[0] for row in candidate_query.distinct().all()}
+    if not candidate_ids:
+        return []
+
+    matches = []
+    for entry in db.query(ItemMinHash).filter(ItemMinHash.item_id.in_(candidate_ids)).all():
+        similarity = estimate_similarity(signature, entry.signature)
+        if similarity >= threshold:
+            matches.append((entry.item_id, similarity))
+
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches[:limit]
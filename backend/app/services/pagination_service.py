@@ -0,0 +1,87 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import and_, or_, cast, literal, String, DateTime
+from app.models.item import Item
+
+
+# Item lists are ordered newest first; id breaks ties so every row has a unique position
+ITEM_LIST_ORDER = (
+    Item.published_at.desc().nullslast(),
+    Item.collected_at.desc().nullslast(),
+    Item.id.desc()
+)
+
+# Sort keys as the database stores them; select these with the items of a page.
+# A datetime read back through the ORM cannot stand in for them: SQLite keeps
+# collected_at from CURRENT_TIMESTAMP without fractional seconds, so a bound
+# datetime (written with microseconds) never compares equal to it.
+ITEM_CURSOR_KEYS = (
+    cast(Item.published_at, String).label("cursor_published_at"),
+    cast(Item.collected_at, String).label("cursor_collected_at")
+)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_item_cursor(item_id: int, published_key: Optional[str], collected_key: Optional[str]) -> str:
+    """Opaque cursor pointing just after an item in ITEM_LIST_ORDER (keys from ITEM_CURSOR_KEYS)"""
+    payload = {"p": published_key, "c": collected_key, "i": item_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _stored_key(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError("timestamp keys must be strings")
+    datetime.fromisoformat(value)  # Rejects anything the database could not cast back
+    return value
+
+
+def decode_item_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor into {'p': str|None, 'c': str|None, 'i': int}"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return {
+            "p": _stored_key(payload.get("p")),
+            "c": _stored_key(payload.get("c")),
+            "i": int(payload["i"])
+        }
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+
+
+def _key_value(key: str, dialect: str):
+    # SQLite stores datetimes as text: compare against the stored text itself.
+    # Elsewhere the text form of a timestamp casts back to the exact value.
+    if dialect == "sqlite":
+        return literal(key, String)
+    return cast(literal(key, String), DateTime(timezone=True))
+
+
+def _after(column, value, tie_condition):
+    # Rows after `value` in "column DESC NULLS LAST" order, with ties resolved by tie_condition
+    if value is None:
+        return and_(column == None, tie_condition)
+    return or_(column < value, column == None, and_(column == value, tie_condition))
+
+
+def apply_item_cursor(query, cursor: Optional[str], dialect: str):
+    """Restrict an item query to rows after the cursor (keyset pagination)"""
+    if not cursor:
+        return query
+    position = decode_item_cursor(cursor)
+    published = _key_value(position["p"], dialect) if position["p"] is not None else None
+    collected = _key_value(position["c"], dialect) if position["c"] is not None else None
+    condition = _after(
+        Item.published_at,
+        published,
+        _after(Item.collected_at, collected, Item.id < position["i"])
+    )
+    return query.filter(condition)
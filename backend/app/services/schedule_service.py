@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.models.source import Source
+from app.models.user import User
+
+
+def compute_next_due_at(source: Source, collected_at: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Next collection time of a source: collect_interval minutes after the last collection
+    None means due now (never collected)
+    """
+    collected_at = collected_at or source.last_collected_at
+    if not collected_at:
+        return None
+    if collected_at.tzinfo is None:
+        collected_at = collected_at.replace(tzinfo=timezone.utc)
+    return collected_at + timedelta(minutes=source.collect_interval or 60)
+
+
+def select_due_sources(db: Session, now: datetime, force: bool = False, limit: int = 1000) -> List[Source]:
+    """
+    Enabled sources that are due (next_due_at <= now or unset) and whose owners are not expired
+    Uses one joined query over the (enabled, next_due_at) index
+    """
+    query = db.query(Source).join(User, Source.user_id == User.id).filter(
+        Source.enabled == True,
+        or_(User.expires_at == None, User.expires_at > now)
+    )
+    if not force:
+        query = query.filter(or_(Source.next_due_at == None, Source.next_due_at <= now))
+    
+    # Never-collected sources first (PostgreSQL would sort their NULL next_due_at last,
+    # letting a backlog of overdue sources starve newly added ones)
+    return query.order_by(Source.next_due_at.asc().nullsfirst(), Source.id).limit(limit).all()
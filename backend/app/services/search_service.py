@@ -0,0 +1,106 @@
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from app.models.item import Item
+from app.models.search import ItemSearchTerm
+
+
+# Field weights: a match in the title ranks above one in the summary or body
+TITLE_WEIGHT = 3
+SUMMARY_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+MAX_TEXT_CHARS = 5000  # Only the beginning of long posts is indexed
+MAX_TERM_WEIGHT = 30  # Caps the score a single repeated bigram can contribute
+MAX_QUERY_TERMS = 32
+
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into search terms: character bigrams of every word
+    Works for Korean without a morphological analyzer ("축제안내" -> 축제, 제안, 안내)
+    """
+    terms = []
+    for token in _TOKEN.findall((text or '').lower()):
+        if len(token) == 1:
+            terms.append(token)
+        else:
+            terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return terms
+
+
+def item_terms(title: str, summary_text: Optional[str], raw_text: Optional[str]) -> Dict[str, int]:
+    """Weighted term frequencies of an item"""
+    weights = Counter()
+    for text, weight in (
+        (title, TITLE_WEIGHT),
+        (summary_text, SUMMARY_WEIGHT),
+        ((raw_text or '')[:MAX_TEXT_CHARS], TEXT_WEIGHT)
+    ):
+        for term in tokenize(text):
+            weights[term] += weight
+    return {term: min(weight, MAX_TERM_WEIGHT) for term, weight in weights.items()}
+
+
+def index_item(db: Session, item: Item):
+    """Replace an item's search terms (call when title, summary or text change)"""
+    remove_items_from_index(db, [item.id])
+    db.add_all([
+        ItemSearchTerm(item_id=item.id, user_id=item.user_id, term=term, weight=weight)
+        for term, weight in item_terms(item.title, item.summary_text, item.raw_text).items()
+    ])
+    db.flush()
+
+
+def index_new_items(db: Session, item_ids: List[int]):
+    """Add search terms of items just stored by ingestion (title and text; one bulk insert)"""
+    if not item_ids:
+        return
+    rows = []
+    items = db.query(Item.id, Item.user_id, Item.title, Item.raw_text).filter(Item.id.in_(item_ids))
+    for item_id, user_id, title, raw_text in items:
+        rows.extend(
+            {"item_id": item_id, "user_id": user_id, "term": term, "weight": weight}
+            for term, weight in item_terms(title, None, raw_text).items()
+        )
+    if rows:
+        db.execute(insert(ItemSearchTerm), rows)
+
+
+def remove_items_from_index(db: Session, item_ids: List[int]):
+    """Delete search terms of items (call before hard-deleting items)"""
+    if not item_ids:
+        return
+    db.query(ItemSearchTerm).filter(ItemSearchTerm.item_id.in_(item_ids)).delete(synchronize_session=False)
+
+
+def can_use_index(q: str) -> bool:
+    """Single-character queries have no bigrams and need a substring scan instead"""
+    return any(len(token) > 1 for token in _TOKEN.findall((q or '').lower()))
+
+
+def search_subquery(q: str, user_id: Optional[int] = None):
+    """
+    Subquery of (item_id, score) for items containing every term of q
+    Score is the sum of the field-weighted term frequencies
+    user_id limits the postings read to that user's items (None: all users, for admins).
+    Usable from both sync and async sessions.
+    """
+    terms = list(dict.fromkeys(tokenize(q)))[:MAX_QUERY_TERMS]
+    query = select(
+        ItemSearchTerm.item_id.label('item_id'),
+        func.sum(ItemSearchTerm.weight).label('score')
+    ).where(
+        ItemSearchTerm.term.in_(terms)
+    )
+    if user_id is not None:
+        query = query.where(ItemSearchTerm.user_id == user_id)
+    return query.group_by(
+        ItemSearchTerm.item_id
+    ).having(
+        func.count(func.distinct(ItemSearchTerm.term)) == len(terms)
+    ).subquery()
@@ -0,0 +1,125 @@
+import hashlib
+import re
+from collections import Counter
+from typing import List, Tuple, Optional
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.item import Item
+from app.models.simhash import ItemSimHashBlock
+
+
+# A 64-bit SimHash is split into 4 blocks of 16 bits. Two hashes within Hamming
+# distance 3 must agree on at least one whole block (pigeonhole), so exact block
+# lookups find every candidate without scanning the table.
+HASH_BITS = 64
+BLOCKS = 4
+BLOCK_BITS = HASH_BITS // BLOCKS
+MAX_DISTANCE = BLOCKS - 1
+
+SHINGLE_SIZE = 3
+MAX_TEXT_CHARS = 2000
+
+
+def compute_simhash(text: str) -> Optional[int]:
+    """Compute the unsigned 64-bit SimHash of text using weighted character n-grams"""
+    normalized = re.sub(r'\s+', '', (text or '').lower())
+    if not normalized:
+        return None
+    
+    if len(normalized) <= SHINGLE_SIZE:
+        features = Counter([normalized])
+    else:
+        features = Counter(normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1))
+    
+    weights = [0] * HASH_BITS
+    for feature, count in features.items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(HASH_BITS):
+            weights[bit] += count if (h >> bit) & 1 else -count
+    
+    return sum(1 << bit for bit in range(HASH_BITS) if weights[bit] > 0)
+
+
+def to_signed(value: int) -> int:
+    """Map an unsigned 64-bit hash into the signed BIGINT range"""
+    return value - (1 << HASH_BITS) if value >= (1 << (HASH_BITS - 1)) else value
+
+
+def to_unsigned(value: int) -> int:
+    return value & ((1 << HASH_BITS) - 1)
+
+
+def item_simhash(title: str, raw_text: Optional[str]) -> Optional[int]:
+    """Signed SimHash of an item's title and text, ready to store in Item.simhash"""
+    simhash = compute_simhash(f"{title or ''} {(raw_text or '')[:MAX_TEXT_CHARS]}")
+    return to_signed(simhash) if simhash is not None else None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(to_unsigned(a) ^ to_unsigned(b)).count('1')
+
+
+def split_blocks(simhash: int) -> List[Tuple[int, int]]:
+    """Split a SimHash into (block, value) pairs"""
+    unsigned = to_unsigned(simhash)
+    mask = (1 << BLOCK_BITS) - 1
+    return [(block, (unsigned >> (block * BLOCK_BITS)) & mask) for block in range(BLOCKS)]
+
+
+def index_item(db: Session, item: Item):
+    """Store the block rows of an item's SimHash (computing it first if missing)"""
+    if item.simhash is None:
+        item.simhash = item_simhash(item.title, item.raw_text)
+    remove_items_from_index(db, [item.id])
+    if item.simhash is None:
+        return
+    
+    db.add_all([
+        ItemSimHashBlock(item_id=item.id, block=block, value=value)
+        for block, value in split_blocks(item.simhash)
+    ])
+    db.flush()
+
+
+def remove_items_from_index(db: Session, item_ids: List[int]):
+    """Delete block rows of items (call when items are deleted or soft-deleted)"""
+    if not item_ids:
+        return
+    db.query(ItemSimHashBlock).filter(ItemSimHashBlock.item_id.in_(item_ids)).delete(synchronize_session=False)
+
+
+def find_near_items(
+    db: Session,
+    item: Item,
+    max_distance: Optional[int] = None,
+    limit: int = 10
+) -> List[Tuple[int, int]]:
+    """
+    Find earlier, non-deleted items of the same owner whose SimHash is within max_distance bits
+    Returns list of (item_id, distance) tuples, closest first
+    """
+    max_distance = settings.DEDUP_SIMHASH_DISTANCE if max_distance is None else max_distance
+    max_distance = min(max_distance, MAX_DISTANCE)
+    simhash = item.simhash if item.simhash is not None else item_simhash(item.title, item.raw_text)
+    if simhash is None:
+        return []
+    
+    query = db.query(Item.id, Item.simhash).join(ItemSimHashBlock, ItemSimHashBlock.item_id == Item.id).filter(
+        tuple_(ItemSimHashBlock.block, ItemSimHashBlock.value).in_(split_blocks(simhash)),
+        Item.id < item.id,
+        Item.status != 'deleted'  # Rows indexed before deletion cleanup
+    )
+    if item.user_id is not None:
+        query = query.filter(Item.user_id == item.user_id)
+    
+    matches = []
+    for item_id, other_simhash in query.distinct().all():
+        if other_simhash is None:
+            continue
+        distance = hamming_distance(simhash, other_simhash)
+        if distance <= max_distance:
+            matches.append((item_id, distance))
+    
+    matches.sort(key=lambda match: (match[1], match[0]))
+    return matches[:limit]
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+import logging
+from sqlalchemy import func, literal
+from sqlalchemy.orm import Session
+from app.models.item import Item
+
+logger = logging.getLogger(__name__)
+
+
+# Dashboard counters kept in Redis per scope ("user:<id>" and "all" for admins):
+#   stats:collected:<scope>:<YYYYMMDDHH>  items collected in that UTC hour (expires after 25h)
+#   stats:status:<scope>                  hash of item count per status
+#   stats:ready:<scope>                   set while the counters are trusted; when it expires
+#                                         (or is deleted after bulk changes) they are rebuilt from the DB
+KEY_PREFIX = "stats:"
+BUCKET_HOURS = 24
+BUCKET_TTL_SECONDS = 25 * 60 * 60
+READY_TTL_SECONDS = 6 * 60 * 60  # Periodic rebuild corrects any drift
+
+
+def _scopes(user_id: Optional[int]):
+    return ["all", f"user:{user_id}"] if user_id is not None else ["all"]
+
+
+def _bucket(moment: datetime) -> str:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y%m%d%H")
+
+
+def _redis():
+    from app.redis_client import get_redis
+    return get_redis()
+
+
+def record_collected(user_id: Optional[int], count: int = 1):
+    """Count newly stored items (status 'collected') for the owner and globally"""
+    if count <= 0:
+        return
+    bucket = _bucket(datetime.now(timezone.utc))
+    try:
+        pipe = _redis().pipeline()
+        for scope in _scopes(user_id):
+            key = f"{KEY_PREFIX}collected:{scope}:{bucket}"
+            pipe.incrby(key, count)
+            pipe.expire(key, BUCKET_TTL_SECONDS)
+            pipe.hincrby(f"{KEY_PREFIX}status:{scope}", "collected", count)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not update collection counters: {e}")
+
+
+def record_status_change(user_id: Optional[int], old_status: Optional[str], new_status: str, count: int = 1):
+    """Move items between status counters (call after the change is committed)"""
+    if count <= 0 or old_status == new_status:
+        return
+    try:
+        pipe = _redis().pipeline()
+        for scope in _scopes(user_id):
+            key = f"{KEY_PREFIX}status:{scope}"
+            if old_status:
+                pipe.hincrby(key, old_status, -count)
+            pipe.hincrby(key, new_status, count)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not update status counters: {e}")
+
+
+def invalidate(user_id: Optional[int] = None):
+    """Force a rebuild after bulk changes that are cheaper to recount than to track"""
+    try:
+        _redis().delete(*[f"{KEY_PREFIX}ready:{scope}" for scope in _scopes(user_id)])
+    except Exception as e:
+        logger.warning(f"Could not invalidate stats counters: {e}")
+
+
+def _hour_bucket(column, dialect: str):
+    """SQL expression formatting a timestamp like _bucket (UTC hour, YYYYMMDDHH)"""
+    if dialect == "sqlite":
+        # SQLite stores the UTC wall time as text
+        return func.strftime("%Y%m%d%H", column)
+    # Inlined so PostgreSQL sees the same expression in SELECT and GROUP BY
+    return func.to_char(
+        func.timezone(literal("UTC", literal_execute=True), column),
+        literal("YYYYMMDDHH24", literal_execute=True)
+    )
+
+
+def _count_from_db(db: Session, user_id: Optional[int], now: datetime) -> Dict[str, Dict[str, int]]:
+    query = db.query(Item)
+    if user_id is not None:
+        query = query.filter(Item.user_id == user_id)
+    
+    status_counts = dict(query.with_entities(Item.status, func.count(Item.id)).group_by(Item.status).all())
+    since = now - timedelta(hours=BUCKET_HOURS)
+    hour = _hour_bucket(Item.collected_at, db.bind.dialect.name)
+    collected_buckets = dict(
+        query.with_entities(hour, func.count(Item.id)).filter(Item.collected_at >= since).group_by(hour).all()
+    )
+    return {"status": status_counts, "collected": collected_buckets}
+
+
+def _rebuild(db: Session, scope: str, user_id: Optional[int], now: datetime):
+    counts = _count_from_db(db, user_id, now)
+    buckets = counts["collected"]
+    
+    redis = _redis()
+    pipe = redis.pipeline()
+    status_key = f"{KEY_PREFIX}status:{scope}"
+    pipe.delete(status_key)
+    if counts["status"]:
+        pipe.hset(status_key, mapping={status or "unknown": count for status, count in counts["status"].items()})
+    for hour in range(BUCKET_HOURS):
+        key = f"{KEY_PREFIX}collected:{scope}:{_bucket(now - timedelta(hours=hour))}"
+        pipe.set(key, buckets.get(_bucket(now - timedelta(hours=hour)), 0), ex=BUCKET_TTL_SECONDS)
+    pipe.set(f"{KEY_PREFIX}ready:{scope}", 1, ex=READY_TTL_SECONDS)
+    pipe.execute()
+    logger.info(f"Rebuilt dashboard counters for {scope}")
+
+
+def get_dashboard_stats(db: Session, user_id: Optional[int]) -> Dict[str, int]:
+    """
+    Collected items in the last 24 hourly buckets, failed items and per-status counts
+    user_id None means all users (admin). Reads a constant number of Redis keys;
+    falls back to counting in the DB when Redis is unavailable.
+    """
+    now = datetime.now(timezone.utc)
+    scope = f"user:{user_id}" if user_id is not None else "all"
+    try:
+        redis = _redis()
+        if not redis.exists(f"{KEY_PREFIX}ready:{scope}"):
+            _rebuild(db, scope, user_id, now)
+        
+        bucket_keys = [f"{KEY_PREFIX}collected:{scope}:{_bucket(now - timedelta(hours=hour))}" for hour in range(BUCKET_HOURS)]
+        pipe = redis.pipeline()
+        pipe.mget(bucket_keys)
+        pipe.hgetall(f"{KEY_PREFIX}status:{scope}")
+        buckets, statuses = pipe.execute()
+        status_counts = {status: max(0, int(count)) for status, count in statuses.items()}
+        collected_today = sum(int(value) for value in buckets if value)
+    except Exception as e:
+        logger.warning(f"Stats counters unavailable, counting in the database: {e}")
+        counts = _count_from_db(db, user_id, now)
+        status_counts = counts["status"]
+        collected_today = sum(counts["collected"].values())
+    
+    return {
+        "collected_today": collected_today,
+        "failed": status_counts.get("failed", 0),
+        "by_status": status_counts
+    }
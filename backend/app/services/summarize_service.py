@@ -1,33 +1,87 @@
-from typing import Optional
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+# Sentence boundaries: terminators followed by whitespace/end, a period right after
+# Hangul (다. 요. ㅁ. even without a following space), ! ? 。, or a line break.
+# Periods inside numbers, URLs and abbreviations ("3.5", "www.ulsan.go.kr") are not boundaries.
+_SENTENCE_END = re.compile(
+    r'[.!?。]+["\'”’)\]]*(?=\s|$)'
+    r'|(?<=[가-힣ㄱ-ㅎ])[.!?]+["\'”’)\]]*'
+    r'|[!?。]+["\'”’)\]]*'
+    r'|\n'
+)
+
+
+def split_sentences(text: str, max_sentences: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield sentences of text in order, stopping after max_sentences
+    Very short fragments (5 chars or less) between boundaries are skipped
+    """
+    if not text:
+        return
+    
+    produced = 0
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        sentence = text[start:match.end()].strip()
+        start = match.end()
+        if len(sentence) > 5:
+            yield sentence
+            produced += 1
+            if max_sentences is not None and produced >= max_sentences:
+                return
+    
+    # Trailing text without a terminator
+    tail = text[start:].strip()
+    if tail:
+        yield tail
+
 
 def extractive_summarize(text: str, max_sentences: int = 3) -> str:
     """
     Simple extractive summarization - takes first N sentences
+    Only scans as far as the N-th sentence boundary
     """
     if not text:
         return ""
     
-    # Split by common Korean sentence endings
-    sentences = []
-    current = ""
-    
-    for char in text:
-        current += char
-        if char in ['.', '!', '?', '。'] or (char == '\n' and current.strip()):
-            sentence = current.strip()
-            if sentence and len(sentence) > 5:  # Filter out very short sentences
-                sentences.append(sentence)
-            current = ""
-    
-    # Add last sentence if exists
-    if current.strip():
-        sentences.append(current.strip())
+    return ' '.join(split_sentences(text, max_sentences))
+
+
+SUMMARY_SYSTEM_PROMPT = "당신은 울산 지역 정보를 요약하는 전문가입니다. 네이버 카페 게시용으로 간결하고 핵심적인 요약을 작성해주세요."
+SUMMARY_MAX_TOKENS = 150
+
+
+def _truncate_input(text: str) -> str:
+    """Cut text to SUMMARY_LLM_MAX_INPUT_CHARS, preferring a sentence boundary"""
+    limit = settings.SUMMARY_LLM_MAX_INPUT_CHARS
+    if len(text) <= limit:
+        return text
     
-    # Return first N sentences
-    summary_sentences = sentences[:max_sentences]
-    return ' '.join(summary_sentences)
+    kept = []
+    length = 0
+    for sentence in split_sentences(text):
+        if length + len(sentence) + 1 > limit:
+            break
+        kept.append(sentence)
+        length += len(sentence) + 1
+    return ' '.join(kept) if kept else text[:limit]
+
+
+def _summary_messages(text: str, max_length: int) -> list:
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": f"다음 내용을 {max_length}자 이내로 요약해주세요:\n\n{_truncate_input(text)}"}
+    ]
 
 
 def llm_summarize(text: str, max_length: int = 200) -> Optional[str]:
@@ -41,43 +95,244 @@ def llm_summarize(text: str, max_length: int = 200) -> Optional[str]:
         import openai
         openai.api_key = settings.OPENAI_API_KEY
         
+        messages = _summary_messages(text, max_length)
+        get_token_budget().wait(estimate_tokens(messages))
         response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "당신은 울산 지역 정보를 요약하는 전문가입니다. 네이버 카페 게시용으로 간결하고 핵심적인 요약을 작성해주세요."},
-                {"role": "user", "content": f"다음 내용을 {max_length}자 이내로 요약해주세요:\n\n{text[:2000]}"}
-            ],
-            max_tokens=150,
+            model=settings.SUMMARY_LLM_MODEL,
+            messages=messages,
+            max_tokens=SUMMARY_MAX_TOKENS,
             temperature=0.3
         )
         
         return response.choices[0].message.content.strip()
     except Exception as e:
-        print(f"LLM summarization failed: {e}")
+        logger.warning(f"LLM summarization failed: {e}")
         return None
 
 
-def summarize_content(text: str, mode: Optional[str] = None) -> str:
+# Per-minute LLM token bucket shared by all workers through Redis (same scheme as the
+# per-host bucket in connectors.rate_limiter). Takes ARGV[2] tokens and returns 0,
+# or leaves the bucket untouched and returns the milliseconds until they are available.
+TOKEN_BUDGET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local requested = tonumber(ARGV[2])
+local rate = capacity / 60000
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = math.ceil((requested - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 61000)
+return wait
+"""
+
+
+def _redis():
+    from app.redis_client import get_redis
+    return get_redis()
+
+
+class TokenBudget:
     """
-    Summarize content based on configured mode
+    Per-minute LLM token budget shared by every worker process through Redis
     
-    Args:
-        text: Text to summarize
-        mode: 'rule' or 'llm', defaults to settings.SUMMARY_MODE
+    When Redis is unavailable the budget falls back to an in-memory bucket,
+    which still spans all LLM calls in this process.
+    """
+    
+    KEY = "llm_token_budget"
+    REDIS_RETRY_SECONDS = 30
+    
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = max(1, tokens_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.script = None
+        self.redis_down_until = 0.0
+    
+    def _reserve_local(self, tokens: int) -> float:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+    
+    def reserve(self, tokens: int) -> float:
+        """Take tokens from the budget; returns 0 if they were taken, else seconds to wait"""
+        tokens = min(tokens, self.capacity)
+        if time.monotonic() >= self.redis_down_until:
+            try:
+                if self.script is None:
+                    self.script = _redis().register_script(TOKEN_BUDGET_SCRIPT)
+                return max(0, int(self.script(keys=[self.KEY], args=[self.capacity, tokens]))) / 1000.0
+            except Exception as e:
+                logger.warning(f"LLM token budget unavailable in Redis, using a per-process budget for {self.REDIS_RETRY_SECONDS}s: {e}")
+                self.redis_down_until = time.monotonic() + self.REDIS_RETRY_SECONDS
+        return self._reserve_local(tokens)
+    
+    async def acquire(self, tokens: int):
+        """Wait until tokens are available and take them"""
+        while True:
+            delay = await asyncio.to_thread(self.reserve, tokens)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+    
+    def wait(self, tokens: int):
+        """Blocking acquire, for single LLM calls outside an event loop"""
+        while True:
+            delay = self.reserve(tokens)
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+
+_budget: Optional[TokenBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_token_budget() -> TokenBudget:
+    """Process-wide TokenBudget for SUMMARY_LLM_TOKENS_PER_MINUTE"""
+    global _budget
+    with _budget_lock:
+        if _budget is None or _budget.capacity != max(1, settings.SUMMARY_LLM_TOKENS_PER_MINUTE):
+            _budget = TokenBudget(settings.SUMMARY_LLM_TOKENS_PER_MINUTE)
+        return _budget
+
+
+def estimate_tokens(messages: list) -> int:
+    """Conservative token estimate: about one token per character for Korean text, plus the reply"""
+    return sum(len(message["content"]) for message in messages) + SUMMARY_MAX_TOKENS
+
+
+async def _llm_summarize_async(client, text: str, semaphore: asyncio.Semaphore, budget: TokenBudget, max_length: int) -> Optional[str]:
+    """One LLM summary with retry and exponential backoff; None when it keeps failing"""
+    import openai
+    
+    messages = _summary_messages(text, max_length)
+    retryable = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)
+    
+    for attempt in range(settings.SUMMARY_LLM_MAX_RETRIES + 1):
+        await budget.acquire(estimate_tokens(messages))
+        try:
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model=settings.SUMMARY_LLM_MODEL,
+                    messages=messages,
+                    max_tokens=SUMMARY_MAX_TOKENS,
+                    temperature=0.3
+                )
+            return response.choices[0].message.content.strip()
+        except retryable as e:
+            if attempt >= settings.SUMMARY_LLM_MAX_RETRIES:
+                logger.warning(f"LLM summarization failed after {attempt + 1} attempts: {e}")
+                return None
+            delay = min(60.0, 2 ** attempt) + random.uniform(0, 1)
+            logger.info(f"LLM call failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        except Exception as e:
+            logger.warning(f"LLM summarization failed: {e}")
+            return None
+    return None
+
+
+async def _summarize_many_async(texts: List[str], max_length: int) -> List[Optional[str]]:
+    import openai
+    
+    client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, timeout=60.0, max_retries=0)
+    semaphore = asyncio.Semaphore(max(1, settings.SUMMARY_LLM_CONCURRENCY))
+    budget = get_token_budget()
+    try:
+        return await asyncio.gather(*[
+            _llm_summarize_async(client, text, semaphore, budget, max_length) for text in texts
+        ])
+    finally:
+        await client.close()
+
+
+def summarize_many(texts: List[str], max_length: int = 200) -> List[Tuple[str, str]]:
+    """
+    Summarize many texts with concurrent LLM calls
+    
+    Concurrency is capped by SUMMARY_LLM_CONCURRENCY and request volume by
+    SUMMARY_LLM_TOKENS_PER_MINUTE. Texts whose LLM call fails (or all texts,
+    when no API key is configured) fall back to extractive_summarize.
     
     Returns:
-        Summarized text
+        List of (summary, mode_key) in the order of texts
+    """
+    summaries: List[Optional[str]] = [None] * len(texts)
+    pending = [index for index, text in enumerate(texts) if text]
+    
+    if pending and settings.OPENAI_API_KEY:
+        try:
+            results = asyncio.run(_summarize_many_async([texts[index] for index in pending], max_length))
+            for index, summary in zip(pending, results):
+                summaries[index] = summary
+        except Exception as e:
+            logger.error(f"Batched LLM summarization failed: {e}")
+    
+    llm_key = summary_mode_key("llm")
+    return [
+        (summary, llm_key) if summary else (extractive_summarize(text), "rule")
+        for text, summary in zip(texts, summaries)
+    ]
+
+
+def summarize_with_mode(text: str, mode: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Summarize content and report which summarizer produced it
+    
+    Returns:
+        (summary, mode_key) where mode_key is 'rule' or 'llm:<model>'
+        (an LLM failure falls back to rule-based and reports 'rule')
     """
     if not text:
-        return ""
+        return "", "rule"
     
     mode = mode or settings.SUMMARY_MODE
     
     if mode == "llm":
         llm_summary = llm_summarize(text)
         if llm_summary:
-            return llm_summary
+            return llm_summary, summary_mode_key("llm")
         # Fallback to rule-based if LLM fails
     
     # Rule-based extractive summarization
-    return extractive_summarize(text)
+    return extractive_summarize(text), "rule"
+
+
+def summary_mode_key(mode: Optional[str] = None) -> str:
+    """Cache key for the summarizer selected by mode ('rule' or 'llm:<model>')"""
+    mode = mode or settings.SUMMARY_MODE
+    return f"llm:{settings.SUMMARY_LLM_MODEL}" if mode == "llm" else "rule"
+
+
+def summarize_content(text: str, mode: Optional[str] = None) -> str:
+    """
+    Summarize content based on configured mode
+    
+    Args:
+        text: Text to summarize
+        mode: 'rule' or 'llm', defaults to settings.SUMMARY_MODE
+    
+    Returns:
+        Summarized text
+    """
+    return summarize_with_mode(text, mode)[0]
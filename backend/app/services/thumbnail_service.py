@@ -0,0 +1,143 @@
+import hashlib
+import hmac
+import io
+import logging
+import os
+import urllib.parse
+from typing import BinaryIO, Optional, Union
+import httpx
+from app.config import settings
+from app.services.media_proxy_service import USER_AGENT, resolve_media_url, source_referer
+
+logger = logging.getLogger(__name__)
+
+
+# Grid cards show images at up to ~160px, so 320px covers 2x displays
+THUMBNAIL_SIZE = 320
+THUMBNAIL_QUALITY = 80
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+THUMBNAIL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "static", "thumbnails"
+)
+
+
+class ThumbnailError(Exception):
+    """Source image could not be fetched or decoded"""
+
+
+def url_signature(image_url: str) -> str:
+    """HMAC of image_url; the thumbnail route only renders URLs the API handed out"""
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), image_url.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def verify_signature(image_url: str, signature: Optional[str]) -> bool:
+    return bool(signature) and hmac.compare_digest(url_signature(image_url), signature)
+
+
+def thumbnail_url(image_url: Optional[str], source_type: Optional[str] = None) -> Optional[str]:
+    """
+    API URL serving the thumbnail of image_url (generated on first request if missing)
+    Signed, so thumbnails are only rendered for images of stored items
+    """
+    if not image_url:
+        return None
+    url = f"/api/items/thumbnail?url={urllib.parse.quote(image_url, safe='')}&sig={url_signature(image_url)}"
+    referer = source_referer(source_type)
+    if referer:
+        url += f"&referer={urllib.parse.quote(referer, safe='')}"
+    return url
+
+
+def _base_path(image_url: str) -> str:
+    key = hashlib.sha256(image_url.encode("utf-8")).hexdigest()
+    return os.path.join(THUMBNAIL_DIR, key[:2], f"{key}_{THUMBNAIL_SIZE}")
+
+
+def thumbnail_path(image_url: str) -> Optional[str]:
+    """Path of an existing thumbnail for image_url, if one was generated"""
+    base = _base_path(image_url)
+    for extension in (".webp", ".jpg"):
+        if os.path.exists(base + extension):
+            return base + extension
+    return None
+
+
+def render_thumbnail(source: Union[str, BinaryIO], image_url: str) -> str:
+    """
+    Resize an image (path or file object) to fit THUMBNAIL_SIZE and store it as WebP
+    (JPEG when Pillow lacks WebP support). Returns the thumbnail path.
+    """
+    try:
+        from PIL import Image, ImageOps, features
+    except ImportError as e:
+        raise ThumbnailError(f"Pillow is not installed: {e}")
+    
+    try:
+        with Image.open(source) as image:
+            # JPEG decoders can downscale while decoding, which is far cheaper than a full decode
+            image.draft("RGB", (THUMBNAIL_SIZE * 2, THUMBNAIL_SIZE * 2))
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+            image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+            
+            use_webp = features.check("webp")
+            path = _base_path(image_url) + (".webp" if use_webp else ".jpg")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            if use_webp:
+                image.save(temp_path, "WEBP", quality=THUMBNAIL_QUALITY, method=4)
+            else:
+                image.save(temp_path, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+            os.replace(temp_path, path)
+            return path
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ThumbnailError(f"Could not render thumbnail for {image_url}: {e}")
+
+
+def _read_limited(client: httpx.Client, url: str, headers: dict) -> Optional[bytes]:
+    """Body of url, read no further than MAX_SOURCE_BYTES; None for an error status"""
+    with client.stream("GET", url, headers=headers) as response:
+        if response.status_code >= 400:
+            return None
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > MAX_SOURCE_BYTES:
+            raise ThumbnailError(f"Image too large ({declared} bytes)")
+        
+        body = bytearray()
+        for chunk in response.iter_bytes():
+            body += chunk
+            if len(body) > MAX_SOURCE_BYTES:
+                raise ThumbnailError(f"Image larger than {MAX_SOURCE_BYTES} bytes")
+        return bytes(body)
+
+
+def generate_thumbnail(image_url: str, client: Optional[httpx.Client] = None, referer: Optional[str] = None) -> Optional[str]:
+    """Download image_url and store its thumbnail (no-op if it exists); None on failure"""
+    existing = thumbnail_path(image_url)
+    if existing:
+        return existing
+    
+    url, referer = resolve_media_url(image_url, referer)
+    owns_client = client is None
+    if owns_client:
+        client = httpx.Client(timeout=15.0, follow_redirects=True, headers={"User-Agent": USER_AGENT})
+    try:
+        body = _read_limited(client, url, {"Referer": referer} if referer else {})
+        if body is None and referer:
+            body = _read_limited(client, url, {})
+        if body is None:
+            raise ThumbnailError("Upstream returned an error status")
+        
+        return render_thumbnail(io.BytesIO(body), image_url)
+    except (httpx.HTTPError, ThumbnailError) as e:
+        logger.warning(f"Thumbnail generation failed for {image_url}: {e}")
+        return None
+    finally:
+        if owns_client:
+            client.close()
@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from typing import BinaryIO, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "static", "uploads")
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Upload exceeds UPLOAD_MAX_BYTES"""
+
+
+class InvalidImage(Exception):
+    """Upload is not a decodable image or its dimensions are out of bounds"""
+
+
+def _probe_image(path: str) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+    """(extension, width, height) from the image header; all None when Pillow is unavailable"""
+    try:
+        from PIL import Image, UnidentifiedImageError
+    except ImportError:
+        return None, None, None
+    
+    try:
+        # open() only parses the header; pixel data is not decoded
+        with Image.open(path) as image:
+            width, height = image.size
+            image_format = (image.format or "").lower()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise InvalidImage(f"Not a valid image: {e}")
+    
+    if width * height > settings.UPLOAD_MAX_PIXELS:
+        raise InvalidImage(f"Image is too large ({width}x{height})")
+    extension = {"jpeg": "jpg", "mpo": "jpg"}.get(image_format, image_format) or None
+    return extension, width, height
+
+
+def _filename_extension(filename: Optional[str]) -> str:
+    extension = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    return extension if re.fullmatch(r"[a-z0-9]{1,5}", extension) else "jpg"
+
+
+def _existing_blob(directory: str, sha256: str) -> Optional[str]:
+    if not os.path.isdir(directory):
+        return None
+    for name in os.listdir(directory):
+        if name.split(".", 1)[0] == sha256:
+            return name
+    return None
+
+
+def store_image(source: BinaryIO, filename: Optional[str] = None) -> dict:
+    """
+    Stream an uploaded image into content-addressed storage
+    
+    The body is hashed while it is copied to a temporary file, and the copy stops as
+    soon as it exceeds UPLOAD_MAX_BYTES. Images are stored once per SHA-256 under
+    static/uploads/<aa>/<sha256>.<ext>; uploading the same bytes again returns
+    the URL of the stored file.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=UPLOAD_DIR, prefix=".upload-", delete=False) as temp:
+        try:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_BYTES:
+                    raise UploadTooLarge(f"File exceeds {settings.UPLOAD_MAX_BYTES // (1024 * 1024)}MB")
+                digest.update(chunk)
+                temp.write(chunk)
+        except BaseException:
+            temp.close()
+            os.remove(temp.name)
+            raise
+    
+    try:
+        if size == 0:
+            raise InvalidImage("Empty file")
+        detected_extension, width, height = _probe_image(temp.name)
+        
+        sha256 = digest.hexdigest()
+        directory = os.path.join(UPLOAD_DIR, sha256[:2])
+        stored_name = _existing_blob(directory, sha256)
+        deduplicated = stored_name is not None
+        if not deduplicated:
+            stored_name = f"{sha256}.{detected_extension or _filename_extension(filename)}"
+            os.makedirs(directory, exist_ok=True)
+            os.replace(temp.name, os.path.join(directory, stored_name))
+            logger.info(f"Stored upload {stored_name} ({size} bytes)")
+    finally:
+        if os.path.exists(temp.name):
+            os.remove(temp.name)
+    
+    return {
+        "url": f"/static/uploads/{sha256[:2]}/{stored_name}",
+        "filename": stored_name,
+        "size": size,
+        "width": width,
+        "height": height,
+        "deduplicated": deduplicated
+    }
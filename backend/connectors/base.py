@@ -1,15 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import json
 import httpx
 from bs4 import BeautifulSoup
 import logging
+from connectors.page_cache import PageValidatorStore
+from connectors.rate_limiter import HostRateLimiter, RateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
 
+class PageNotModified(Exception):
+    """Raised by a conditional get_page() when the page is unchanged since the last collection"""
+
+
 class ConnectorBase(ABC):
     """Base class for all content connectors"""
     
+    # Detail fetch fan-out limits (overridable via crawl_policy)
+    DEFAULT_CONCURRENCY = 8
+    DEFAULT_HOST_CONCURRENCY = 4
+    
+    # Incremental mode: stop scanning a list after this many consecutive known items
+    DEFAULT_KNOWN_STOP_AFTER = 10
+    
     def __init__(self, source):
         """
         Initialize connector with source configuration
@@ -19,7 +36,27 @@ class ConnectorBase(ABC):
         """
         self.source = source
         self.base_url = source.base_url
-        self.client = httpx.Client(timeout=30.0, follow_redirects=True)
+        
+        # Every request waits for the shared per-host token bucket (crawl_policy
+        # 'host_rate_limits'; 'rate_limit': false turns it off for a source)
+        policy = self.get_crawl_policy()
+        self.rate_limiter = HostRateLimiter(policy.get('host_rate_limits'), enabled=policy.get('rate_limit', True))
+        self.client = httpx.Client(
+            timeout=30.0,
+            follow_redirects=True,
+            event_hooks={'request': [self._throttle_request], 'response': [self._observe_response]}
+        )
+        
+        # Items already stored for this source (see set_known_items / set_known_lookup)
+        self.known_url_hashes = set()
+        self.known_item_ids = set()
+        self.known_lookup = None
+        self.skipped_known = 0
+        
+        # Conditional requests (see get_page)
+        self.validator_store = PageValidatorStore()
+        self.not_modified = False
+        self._pending_validators = {}
     
     @abstractmethod
     def fetch_list(self) -> List[Dict[str, Any]]:
@@ -50,27 +87,268 @@ class ConnectorBase(ABC):
         """
         return {}
     
+    def detail_request(self, item_url: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Build the HTTP request used to fetch an item's detail page
+        
+        Args:
+            item_url: URL of the item
+        
+        Returns:
+            (request URL, request headers)
+        """
+        return item_url, {}
+    
+    def parse_detail(self, item_url: str, html: str) -> Dict[str, Any]:
+        """
+        Extract item detail from a fetched detail page
+        
+        Subclasses that implement this get concurrent detail fetching
+        through fetch_details() for free.
+        """
+        return {}
+    
+    def empty_detail(self) -> Dict[str, Any]:
+        """Detail returned when a detail page could not be fetched"""
+        return {'raw_text': '', 'image_urls': [], 'meta_json': {}}
+    
+    def set_known_items(self, url_hashes=None, source_item_ids=None):
+        """
+        Register items already stored for this source
+        
+        Connectors use these to skip detail fetches for known items and
+        to stop scanning a list once they reach already collected posts.
+        
+        Args:
+            url_hashes: iterable of Item.hash_url values
+            source_item_ids: iterable of Item.source_item_id values
+        """
+        self.known_url_hashes = set(url_hashes or [])
+        self.known_item_ids = {str(i) for i in (source_item_ids or []) if i}
+    
+    def set_known_lookup(self, lookup: Callable[[List[str], List[str]], Tuple[Set[str], Set[str]]]):
+        """
+        Resolve known items per fetched list page instead of up front
+        
+        Args:
+            lookup: called by filter_known with the URL hashes and source item ids
+                of a page; returns the (url_hashes, source_item_ids) already stored
+        """
+        self.known_lookup = lookup
+    
+    def _resolve_known(self, entries: List[Dict[str, Any]]):
+        if self.known_lookup is None or not entries:
+            return
+        from app.services.dedup_service import generate_url_hash
+        url_hashes, item_ids = self.known_lookup(
+            [generate_url_hash(entry['url']) for entry in entries],
+            [str(entry['source_item_id']) for entry in entries if entry.get('source_item_id')]
+        )
+        self.known_url_hashes.update(url_hashes)
+        self.known_item_ids.update(str(i) for i in item_ids)
+    
+    def is_known(self, url: str, source_item_id=None) -> bool:
+        """Check whether an item was already collected for this source"""
+        if source_item_id and str(source_item_id) in self.known_item_ids:
+            return True
+        if not self.known_url_hashes:
+            return False
+        from app.services.dedup_service import generate_url_hash
+        return generate_url_hash(url) in self.known_url_hashes
+    
+    def filter_known(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop already collected entries from a newest-first list
+        
+        Scanning stops after crawl_policy 'incremental_stop_after' consecutive
+        known entries (pinned notices at the top of a board don't count as a
+        run as long as new posts follow them). Set crawl_policy 'incremental'
+        to false to disable.
+        
+        Args:
+            entries: list entries with 'url' and optional 'source_item_id'
+        
+        Returns:
+            Entries that still need detail fetching
+        """
+        policy = self.get_crawl_policy()
+        if not policy.get('incremental', True):
+            return entries
+        self._resolve_known(entries)
+        if not (self.known_url_hashes or self.known_item_ids):
+            return entries
+        
+        stop_after = max(1, int(policy.get('incremental_stop_after', self.DEFAULT_KNOWN_STOP_AFTER)))
+        new_entries = []
+        consecutive_known = 0
+        for entry in entries:
+            if self.is_known(entry['url'], entry.get('source_item_id')):
+                self.skipped_known += 1
+                consecutive_known += 1
+                if consecutive_known >= stop_after:
+                    logger.info(f"Reached {consecutive_known} known items in a row; stopping list scan")
+                    break
+                continue
+            consecutive_known = 0
+            new_entries.append(entry)
+        
+        if self.skipped_known:
+            logger.info(f"Skipped {self.skipped_known} already collected items from {self.source.name}")
+        return new_entries
+    
+    def get_crawl_policy(self) -> Dict[str, Any]:
+        """Parse the source's crawl_policy JSON (empty dict if missing or invalid)"""
+        try:
+            return json.loads(self.source.crawl_policy) if self.source.crawl_policy else {}
+        except Exception as e:
+            logger.warning(f"Invalid crawl_policy for {self.source.name}: {e}")
+            return {}
+    
+    def fetch_details(self, item_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many detail pages concurrently
+        
+        Requests are bounded by a per-source limit (crawl_policy 'concurrency')
+        and a per-host limit (crawl_policy 'per_host_concurrency').
+        
+        Args:
+            item_urls: URLs of the items
+        
+        Returns:
+            Mapping of item URL to detail dictionary
+        """
+        urls = list(dict.fromkeys(item_urls))
+        if not urls:
+            return {}
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._fetch_details_async(urls))
+        
+        # Called from inside an event loop; asyncio.run() is not allowed here
+        logger.debug("Event loop already running; fetching details sequentially")
+        return {url: self.fetch_detail(url) for url in urls}
+    
+    async def _fetch_details_async(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        policy = self.get_crawl_policy()
+        concurrency = max(1, int(policy.get('concurrency', self.DEFAULT_CONCURRENCY)))
+        host_concurrency = max(1, int(policy.get('per_host_concurrency', self.DEFAULT_HOST_CONCURRENCY)))
+        
+        source_limit = asyncio.Semaphore(concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        
+        async def fetch_one(client: httpx.AsyncClient, url: str) -> Tuple[str, Dict[str, Any]]:
+            request_url, headers = self.detail_request(url)
+            host = urlparse(request_url).netloc
+            host_limit = host_limits.setdefault(host, asyncio.Semaphore(host_concurrency))
+            
+            async with source_limit, host_limit:
+                try:
+                    response = await client.get(request_url, headers=headers)
+                    response.raise_for_status()
+                    html = response.text
+                except RateLimitExceeded:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Error fetching detail from {request_url}: {e}")
+                    return url, self.empty_detail()
+            
+            try:
+                return url, self.parse_detail(url, html)
+            except Exception as e:
+                logger.warning(f"Error parsing detail from {url}: {e}")
+                return url, self.empty_detail()
+        
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        event_hooks = {'request': [self._throttle_request_async], 'response': [self._observe_response_async]}
+        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True, limits=limits, event_hooks=event_hooks) as client:
+            results = await asyncio.gather(*(fetch_one(client, url) for url in urls))
+        
+        logger.info(f"Fetched {len(results)} detail pages (concurrency={concurrency}, per_host={host_concurrency})")
+        return dict(results)
+    
+    def _throttle_request(self, request: httpx.Request):
+        self.rate_limiter.wait(request.url.host)
+    
+    def _observe_response(self, response: httpx.Response):
+        self.rate_limiter.observe(response.request.url.host, response.status_code, response.headers.get('Retry-After'))
+    
+    async def _throttle_request_async(self, request: httpx.Request):
+        await self.rate_limiter.wait_async(request.url.host)
+    
+    async def _observe_response_async(self, response: httpx.Response):
+        await asyncio.to_thread(
+            self.rate_limiter.observe, response.request.url.host, response.status_code, response.headers.get('Retry-After')
+        )
+    
     def parse_html(self, html: str) -> BeautifulSoup:
         """Parse HTML with BeautifulSoup"""
         return BeautifulSoup(html, 'lxml')
     
-    def get_page(self, url: str) -> str:
+    def get_page(self, url: str, headers: Optional[Dict[str, str]] = None, conditional: bool = False) -> str:
         """
         Fetch page content
         
         Args:
             url: URL to fetch
+            headers: Extra request headers
+            conditional: Revalidate against the ETag / Last-Modified / content
+                digest stored by the previous collection and raise
+                PageNotModified if the page is unchanged. Disable per source
+                with crawl_policy 'conditional_requests': false.
         
         Returns:
             HTML content as string
         """
+        request_headers = dict(headers or {})
+        validators = {}
+        if conditional and self.get_crawl_policy().get('conditional_requests', True):
+            validators = self.validator_store.load(url)
+            if validators.get('etag'):
+                request_headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                request_headers['If-Modified-Since'] = validators['last_modified']
+        else:
+            conditional = False
+        
         try:
-            response = self.client.get(url)
+            response = self.client.get(url, headers=request_headers)
+            if conditional and response.status_code == 304:
+                raise PageNotModified(url)
             response.raise_for_status()
-            return response.text
+        except PageNotModified:
+            logger.info(f"Page not modified (304): {url}")
+            self.not_modified = True
+            raise
         except Exception as e:
             logger.error(f"Error fetching URL {url}: {e}")
             raise
+        
+        if conditional:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            digest = hashlib.sha256(response.content).hexdigest()
+            if validators.get('digest') == digest:
+                # Same body even though the server sent it again; refresh validators and stop
+                self.validator_store.save(url, etag, last_modified, digest)
+                logger.info(f"Page content unchanged (digest match): {url}")
+                self.not_modified = True
+                raise PageNotModified(url)
+            # Saved by commit_validators() once this collection's items are stored
+            self._pending_validators[url] = (etag, last_modified, digest)
+        
+        return response.text
+    
+    def pending_validators(self) -> List[Tuple[str, Optional[str], Optional[str], str]]:
+        """(url, etag, last_modified, digest) of pages fetched in this run, for save_page_validators"""
+        return [(url, *validators) for url, validators in self._pending_validators.items()]
+    
+    def commit_validators(self):
+        """Persist validators of pages fetched conditionally (call after items are stored)"""
+        for url, (etag, last_modified, digest) in self._pending_validators.items():
+            self.validator_store.save(url, etag, last_modified, digest)
+        self._pending_validators = {}
     
     def close(self):
         """Close HTTP client"""
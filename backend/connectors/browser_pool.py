@@ -0,0 +1,205 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import atexit
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BrowserPool:
+    """
+    Long-lived headless Chromium shared by connectors in one worker process
+
+    Playwright objects belong to the thread that created them, so the pool owns
+    a single thread running an event loop with Playwright's async API. Callers on
+    any thread hand a coroutine function to run_with_page(); it runs on that loop
+    with a leased page. Browser contexts are kept per context_key, so cookies and
+    storage survive between collections. The number of open pages is capped, and
+    the browser is relaunched after a number of leases to bound memory growth.
+    """
+
+    LAUNCH_ARGS = [
+        "--disable-blink-features=AutomationControlled",
+        "--no-sandbox",
+        "--disable-setuid-sandbox",
+        "--disable-infobars",
+        "--disable-dev-shm-usage",
+    ]
+
+    def __init__(self, max_pages: int = 4, recycle_after: int = 50):
+        self.max_pages = max(1, max_pages)
+        self.recycle_after = max(1, recycle_after)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._pages: Optional[asyncio.Semaphore] = None
+        self._playwright = None
+        self._browser = None
+        self._contexts: Dict[str, Any] = {}
+        self._open_pages = 0
+        self._uses = 0
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        with self._thread_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    async def _ensure_browser(self):
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+
+        await self._close_browser()
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+
+        logger.info(f"Launching pooled Chromium (pid {os.getpid()})")
+        self._browser = await self._playwright.chromium.launch(headless=True, args=self.LAUNCH_ARGS)
+        self._uses = 0
+        return self._browser
+
+    async def _get_context(self, context_key: str, context_options: Optional[Dict[str, Any]], setup: Optional[Callable[[Any], Awaitable[None]]]):
+        context = self._contexts.get(context_key)
+        if context is not None:
+            return context
+
+        context = await (await self._ensure_browser()).new_context(**(context_options or {}))
+        if setup:
+            await setup(context)
+        self._contexts[context_key] = context
+        return context
+
+    async def _lease(self, use: Callable[[Any], Awaitable[T]], context_key: str, context_options, setup, timeout: float) -> T:
+        if self._pages is None:
+            self._pages = asyncio.Semaphore(self.max_pages)
+        try:
+            await asyncio.wait_for(self._pages.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No free browser page after {timeout}s (max_pages={self.max_pages})")
+
+        page = None
+        try:
+            context = await self._get_context(context_key, context_options, setup)
+            page = await context.new_page()
+            self._open_pages += 1
+            self._uses += 1
+            return await use(page)
+        except Exception:
+            # A broken context (crashed page, bad state) is rebuilt on the next lease
+            await self._discard_context(context_key)
+            raise
+        finally:
+            if page is not None:
+                self._open_pages -= 1
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            self._pages.release()
+
+            if self._uses >= self.recycle_after and self._open_pages == 0:
+                logger.info(f"Recycling pooled Chromium after {self._uses} leases")
+                await self._close_browser()
+
+    def run_with_page(
+        self,
+        use: Callable[[Any], Awaitable[T]],
+        context_key: str = "default",
+        context_options: Optional[Dict[str, Any]] = None,
+        setup: Optional[Callable[[Any], Awaitable[None]]] = None,
+        timeout: float = 120.0
+    ) -> T:
+        """
+        Run `await use(page)` on the pool's thread with a leased page and return its result
+
+        Args:
+            use: Coroutine function driving the page (Playwright async API)
+            context_key: Pages with the same key share one browser context (cookies, storage)
+            context_options: browser.new_context() options, used when the context is created
+            setup: Coroutine function called once with a newly created context (init scripts, cookies)
+            timeout: Seconds to wait for a free page slot
+        """
+        coroutine = self._lease(use, context_key, context_options, setup, timeout)
+        return asyncio.run_coroutine_threadsafe(coroutine, self._start()).result()
+
+    async def _discard_context(self, context_key: str):
+        context = self._contexts.pop(context_key, None)
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _close_browser(self):
+        for context_key in list(self._contexts):
+            await self._discard_context(context_key)
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+    async def _close(self):
+        await self._close_browser()
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def close(self, timeout: float = 30.0):
+        """Close the browser and stop Playwright on the pool's thread, then end the thread"""
+        with self._thread_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+
+_pools: Dict[int, BrowserPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Browser pool of the current process (created lazily, after any fork)"""
+    from app.config import settings
+
+    pid = os.getpid()
+    with _pools_lock:
+        pool = _pools.get(pid)
+        if pool is None:
+            pool = BrowserPool(
+                max_pages=settings.BROWSER_POOL_MAX_PAGES,
+                recycle_after=settings.BROWSER_POOL_RECYCLE_AFTER
+            )
+            _pools[pid] = pool
+        return pool
+
+
+@atexit.register
+def shutdown_browser_pools():
+    """Close the browser started by this process on interpreter exit"""
+    with _pools_lock:
+        pool = _pools.pop(os.getpid(), None)
+    if pool is not None:
+        try:
+            pool.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser pool: {e}")
@@ -1,4 +1,4 @@
-from connectors.base import ConnectorBase
+from connectors.base import ConnectorBase, PageNotModified
 from typing import List, Dict, Any
 from datetime import datetime
 import json
@@ -36,11 +36,11 @@ class GenericBoardConnector(ConnectorBase):
                 title_selector = selectors.get('title', 'td.subject a, td.ta_l a, td.title a, .subject a')
                 date_selector = selectors.get('date', 'td.regDate, td.date, td:nth-of-type(4)')
             
-            # Fetch page
-            html = self.get_page(list_url)
+            # Fetch page (skipped entirely if unchanged since the last collection)
+            html = self.get_page(list_url, conditional=True)
             soup = self.parse_html(html)
             
-            items = []
+            entries = []
             rows = soup.select(row_selector)
             
             logger.info(f"Found {len(rows)} rows using selector: {row_selector}")
@@ -86,26 +86,39 @@ class GenericBoardConnector(ConnectorBase):
                     # Extract ID from URL if possible
                     source_item_id = self._extract_id_from_url(url)
                     
-                    # Fetch detail page to get full content
-                    detail_data = self.fetch_detail(url)
-                    
-                    items.append({
+                    entries.append({
                         'title': title,
                         'url': url,
                         'source_item_id': source_item_id,
-                        'published_at': published_at,
-                        'raw_text': detail_data.get('raw_text', title),
-                        'image_urls': detail_data.get('image_urls', []),
-                        'meta_json': detail_data.get('meta_json', {})
+                        'published_at': published_at
                     })
                     
                 except Exception as e:
                     logger.warning(f"Error parsing row: {e}")
                     continue
             
+            # Only fetch details for posts we haven't collected yet
+            entries = self.filter_known(entries)
+            
+            # Fetch detail pages concurrently to get full content
+            details = self.fetch_details([entry['url'] for entry in entries])
+            
+            items = []
+            for entry in entries:
+                detail_data = details.get(entry['url']) or {}
+                items.append({
+                    **entry,
+                    'raw_text': detail_data.get('raw_text', entry['title']),
+                    'image_urls': detail_data.get('image_urls', []),
+                    'meta_json': detail_data.get('meta_json', {})
+                })
+            
             logger.info(f"Successfully extracted {len(items)} items")
             return items
             
+        except PageNotModified:
+            logger.info(f"List page unchanged for {self.source.name}; nothing to collect")
+            return []
         except Exception as e:
             logger.error(f"Error fetching list from {self.source.name}: {e}")
             return []
@@ -114,6 +127,14 @@ class GenericBoardConnector(ConnectorBase):
         """Fetch detail page and extract full content"""
         try:
             html = self.get_page(url)
+            return self.parse_detail(url, html)
+        except Exception as e:
+            logger.warning(f"Error fetching detail from {url}: {e}")
+            return self.empty_detail()
+    
+    def parse_detail(self, url: str, html: str) -> Dict[str, Any]:
+        """Extract full content from a detail page"""
+        try:
             soup = self.parse_html(html)
             
             # Extract content based on site
@@ -202,8 +223,8 @@ class GenericBoardConnector(ConnectorBase):
             }
             
         except Exception as e:
-            logger.warning(f"Error fetching detail from {url}: {e}")
-            return {'raw_text': '', 'image_urls': [], 'meta_json': {}}
+            logger.warning(f"Error parsing detail from {url}: {e}")
+            return self.empty_detail()
     
     def _parse_date(self, date_str: str) -> datetime:
         """Parse Korean date format"""
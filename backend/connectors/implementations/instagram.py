@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 import os
@@ -6,9 +7,8 @@ from typing import Any, Dict, List, Optional
 from urllib.parse import quote, unquote, urlparse
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-
 from connectors.base import ConnectorBase
+from connectors.browser_pool import get_browser_pool
 
 logger = logging.getLogger(__name__)
 
@@ -90,57 +90,55 @@ class InstagramConnector(ConnectorBase):
         payloads: List[Any] = []
         html = ""
 
-        try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-blink-features=AutomationControlled",
-                        "--no-sandbox",
-                        "--disable-setuid-sandbox",
-                        "--disable-infobars",
-                    ],
-                )
+        user_agent = os.getenv("INSTAGRAM_USER_AGENT") or self._headers()["User-Agent"]
+        cookies = self._playwright_cookies()
+        # One reusable context per user agent + session cookie, so login state is kept
+        context_key = "instagram:" + hashlib.sha256(
+            (user_agent + json.dumps(cookies, sort_keys=True)).encode("utf-8")
+        ).hexdigest()[:16]
+
+        async def setup_context(context):
+            await context.add_init_script(
+                "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+            )
+            if cookies:
+                await context.add_cookies(cookies)
+
+        async def browse(page):
+            async def capture_json(response):
+                response_url = response.url
+                if not self._looks_like_instagram_data_url(response_url):
+                    return
+                try:
+                    payloads.append(await response.json())
+                except Exception:
+                    return
+
+            page.on("response", capture_json)
+            await page.goto(profile_url, wait_until="domcontentloaded", timeout=60000)
+            await page.wait_for_timeout(5000)
+            for _ in range(2):
+                if len(self._parse_payloads(payloads)) >= limit:
+                    break
+                await page.mouse.wheel(0, 1600)
+                await page.wait_for_timeout(2500)
 
-                context = browser.new_context(
-                    user_agent=os.getenv("INSTAGRAM_USER_AGENT")
-                    or self._headers()["User-Agent"],
-                    viewport={"width": 1280, "height": 900},
-                    extra_http_headers={
+            return await page.content()
+
+        try:
+            html = get_browser_pool().run_with_page(
+                browse,
+                context_key=context_key,
+                context_options={
+                    "user_agent": user_agent,
+                    "viewport": {"width": 1280, "height": 900},
+                    "extra_http_headers": {
                         "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
                         "X-IG-App-ID": self.APP_ID,
                     },
-                )
-                context.add_init_script(
-                    "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-                )
-
-                cookies = self._playwright_cookies()
-                if cookies:
-                    context.add_cookies(cookies)
-
-                page = context.new_page()
-
-                def capture_json(response):
-                    response_url = response.url
-                    if not self._looks_like_instagram_data_url(response_url):
-                        return
-                    try:
-                        payloads.append(response.json())
-                    except Exception:
-                        return
-
-                page.on("response", capture_json)
-                page.goto(profile_url, wait_until="domcontentloaded", timeout=60000)
-                page.wait_for_timeout(5000)
-                for _ in range(2):
-                    if len(self._parse_payloads(payloads)) >= limit:
-                        break
-                    page.mouse.wheel(0, 1600)
-                    page.wait_for_timeout(2500)
-
-                html = page.content()
-                browser.close()
+                },
+                setup=setup_context,
+            )
         except Exception as exc:
             logger.error("Playwright Instagram collection failed for @%s: %s", username, exc)
 
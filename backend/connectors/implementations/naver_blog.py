@@ -1,11 +1,10 @@
 import feedparser
 import logging
-import requests
 import re
 import json
 from datetime import datetime
-from typing import List, Dict, Any
-from connectors.base import ConnectorBase
+from typing import List, Dict, Any, Tuple
+from connectors.base import ConnectorBase, PageNotModified
 from dateutil import parser as date_parser
 from bs4 import BeautifulSoup
 
@@ -29,10 +28,8 @@ class NaverBlogConnector(ConnectorBase):
         logger.info(f"Fetching Naver Blog RSS: {rss_url}")
         
         try:
-            response = requests.get(rss_url, timeout=10)
-            response.raise_for_status()
-            
-            feed = feedparser.parse(response.text)
+            # Conditional fetch: an unchanged feed means nothing new to collect
+            feed = feedparser.parse(self.get_page(rss_url, conditional=True))
             
             items = []
             for entry in feed.entries:
@@ -56,31 +53,36 @@ class NaverBlogConnector(ConnectorBase):
                     'source_item_id': self._extract_log_no(entry.link)
                 }
                 
-                # Attempt to get full detail
-                try:
-                    detail = self.fetch_detail(entry.link)
-                    if detail['raw_text'] and len(detail['raw_text']) > len(rss_snippet):
-                        item['raw_text'] = detail['raw_text']
-                        logger.info(f"Updated raw_text for '{item['title']}' (len: {len(item['raw_text'])})")
-                    
-                    if detail['image_urls']:
-                        item['image_urls'] = detail['image_urls']
-                        logger.info(f"Updated image_urls for '{item['title']}' (count: {len(item['image_urls'])})")
-                    else:
-                        # If no images found in detail, keep thumbnails from RSS if any
-                        # (But we prefer high-res from detail)
-                        pass
-                except Exception as detail_err:
-                    logger.error(f"Error fetching detail for {entry.link}: {detail_err}")
-                
                 items.append(item)
+            
+            # Only fetch details for posts we haven't collected yet
+            items = self.filter_known(items)
+            
+            # Attempt to get full detail for all posts concurrently
+            details = self.fetch_details([item['url'] for item in items])
+            for item in items:
+                detail = details.get(item['url']) or self.empty_detail()
+                if detail['raw_text'] and len(detail['raw_text']) > len(item['raw_text']):
+                    item['raw_text'] = detail['raw_text']
+                    logger.info(f"Updated raw_text for '{item['title']}' (len: {len(item['raw_text'])})")
+                
+                if detail['image_urls']:
+                    item['image_urls'] = detail['image_urls']
+                    logger.info(f"Updated image_urls for '{item['title']}' (count: {len(item['image_urls'])})")
+                else:
+                    # If no images found in detail, keep thumbnails from RSS if any
+                    # (But we prefer high-res from detail)
+                    pass
                 
-            if not items:
+            if not feed.entries:
                 logger.info("RSS returned 0 items. Attempting mobile scraping fallback...")
                 items = self._scrape_mobile_list(blog_id)
                 
             return items
             
+        except PageNotModified:
+            logger.info(f"Naver Blog RSS unchanged for {blog_id}; nothing to collect")
+            return []
         except Exception as e:
             logger.error(f"Error fetching Naver Blog RSS: {e}")
             # Try fallback even on RSS error
@@ -100,7 +102,7 @@ class NaverBlogConnector(ConnectorBase):
                 'User-Agent': 'Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36',
                 'Referer': 'https://m.naver.com/'
             }
-            response = requests.get(mobile_url, headers=headers, timeout=10)
+            response = self.client.get(mobile_url, headers=headers, timeout=10)
             if response.status_code != 200:
                 logger.warning(f"Mobile scraping failed: status {response.status_code}")
                 return []
@@ -136,16 +138,6 @@ class NaverBlogConnector(ConnectorBase):
                                 'image_urls': [],
                                 'source_item_id': self._extract_log_no(href)
                             }
-                            
-                            # Fetch detail to get real date/images
-                            try:
-                                detail = self.fetch_detail(href)
-                                if detail['raw_text']:
-                                    item['raw_text'] = detail['raw_text']
-                                if detail['image_urls']:
-                                    item['image_urls'] = detail['image_urls']
-                            except Exception:
-                                pass
                                 
                             found_items.append(item)
                     except Exception:
@@ -176,15 +168,18 @@ class NaverBlogConnector(ConnectorBase):
                                 'image_urls': [],
                                 'source_item_id': parts[-1] 
                             }
-                            # Simple fetch detail
-                            try:
-                                detail = self.fetch_detail(full_url)
-                                if detail.get('raw_text'): item['raw_text'] = detail['raw_text']
-                                if detail.get('image_urls'): item['image_urls'] = detail['image_urls']
-                            except: pass
                             
                             found_items.append(item)
                             if len(found_items) >= 10: break
+            
+            found_items = self.filter_known(found_items)
+            
+            # Fetch details concurrently to get real text/images
+            details = self.fetch_details([item['url'] for item in found_items])
+            for item in found_items:
+                detail = details.get(item['url']) or {}
+                if detail.get('raw_text'): item['raw_text'] = detail['raw_text']
+                if detail.get('image_urls'): item['image_urls'] = detail['image_urls']
                             
             logger.info(f"Scraped {len(found_items)} items from mobile list for {blog_id}")
             return found_items
@@ -198,7 +193,20 @@ class NaverBlogConnector(ConnectorBase):
         Fetch full blog post content and extract all images using mobile bypass.
         """
         logger.info(f"Fetching Naver Blog detail: {url}")
+        mobile_url, headers = self.detail_request(url)
         
+        try:
+            response = self.client.get(mobile_url, headers=headers, timeout=15)
+            if response.status_code != 200:
+                logger.warning(f"Failed to fetch {mobile_url}: {response.status_code}")
+                return self.empty_detail()
+            return self.parse_detail(url, response.text)
+        except Exception as e:
+            logger.error(f"Error in fetch_detail for {mobile_url}: {e}")
+            return self.empty_detail()
+
+    def detail_request(self, url: str) -> Tuple[str, Dict[str, str]]:
+        """Map a post URL to its mobile page (bypasses the desktop iframe)"""
         # Bypass using mobile URL
         mobile_url = url
         if 'm.blog.naver.com' not in url:
@@ -222,14 +230,12 @@ class NaverBlogConnector(ConnectorBase):
             'User-Agent': 'Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36',
             'Referer': 'https://m.blog.naver.com/'
         }
-        
+        return mobile_url, headers
+
+    def parse_detail(self, url: str, html: str) -> Dict[str, Any]:
+        """Extract full text and all images from a mobile blog post page"""
         try:
-            response = requests.get(mobile_url, headers=headers, timeout=15)
-            if response.status_code != 200:
-                logger.warning(f"Failed to fetch {mobile_url}: {response.status_code}")
-                return {'raw_text': '', 'image_urls': [], 'meta_json': {}}
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 1. Container Detection
             # Naver Blog has many versions. Try all common ones.
@@ -288,7 +294,7 @@ class NaverBlogConnector(ConnectorBase):
             if not full_text:
                 full_text = soup.body.get_text(separator=' ', strip=True) if soup.body else ""
             
-            logger.info(f"Finished extraction for {mobile_url}: {len(full_text)} chars, {len(image_urls)} images")
+            logger.info(f"Finished extraction for {url}: {len(full_text)} chars, {len(image_urls)} images")
             return {
                 'raw_text': full_text,
                 'image_urls': image_urls,
@@ -296,8 +302,8 @@ class NaverBlogConnector(ConnectorBase):
             }
             
         except Exception as e:
-            logger.error(f"Error in fetch_detail for {mobile_url}: {e}")
-            return {'raw_text': '', 'image_urls': [], 'meta_json': {}}
+            logger.error(f"Error parsing detail for {url}: {e}")
+            return self.empty_detail()
 
     def _extract_blog_id(self, url: str) -> str:
         if 'rss.blog.naver.com' in url:
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import List, Dict, Any
 from urllib.parse import urljoin
 
-from connectors.base import ConnectorBase
+from connectors.base import ConnectorBase, PageNotModified
 
 logger = logging.getLogger(__name__)
 
@@ -41,10 +41,7 @@ class ThreadsConnector(ConnectorBase):
                 'Cache-Control': 'no-cache',
             }
 
-            response = self.client.get(url, headers=headers)
-            response.raise_for_status()
-            
-            html = response.text
+            html = self.get_page(url, headers=headers, conditional=True)
             soup = self.parse_html(html)
             
             # Look for scripts containing post data
@@ -77,6 +74,9 @@ class ThreadsConnector(ConnectorBase):
             logger.info(f"Successfully extracted {len(items)} items from Threads")
             return items
 
+        except PageNotModified:
+            logger.info(f"Threads profile unchanged for {self.base_url}; nothing to collect")
+            return []
         except Exception as e:
             logger.error(f"Error fetching Threads posts from {self.base_url}: {e}")
             return []
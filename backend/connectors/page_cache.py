@@ -0,0 +1,49 @@
+from typing import Dict, Optional
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PageValidatorStore:
+    """
+    Persistent per-URL HTTP validators (ETag, Last-Modified, content digest)
+
+    Stored in Redis so every worker process shares them. Redis errors are
+    logged and treated as a cache miss, so collection never depends on it.
+    """
+
+    KEY_PREFIX = "page_validators:"
+    TTL_SECONDS = 14 * 24 * 60 * 60  # Forget validators of pages not seen for two weeks
+
+    def _key(self, url: str) -> str:
+        return self.KEY_PREFIX + hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _redis(self):
+        from app.redis_client import get_redis
+        return get_redis()
+
+    def load(self, url: str) -> Dict[str, str]:
+        """Get stored validators for a URL (empty dict if none)"""
+        try:
+            return self._redis().hgetall(self._key(url)) or {}
+        except Exception as e:
+            logger.warning(f"Could not load page validators for {url}: {e}")
+            return {}
+
+    def save(self, url: str, etag: Optional[str], last_modified: Optional[str], digest: str):
+        """Store validators for a URL"""
+        mapping = {'digest': digest}
+        if etag:
+            mapping['etag'] = etag
+        if last_modified:
+            mapping['last_modified'] = last_modified
+        try:
+            key = self._key(url)
+            pipe = self._redis().pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.TTL_SECONDS)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not save page validators for {url}: {e}")
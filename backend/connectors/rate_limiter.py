@@ -0,0 +1,176 @@
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# Token bucket per host rule, shared by all workers through Redis.
+# Returns 0 when a request may go now, otherwise the milliseconds to wait.
+# A host that answered 429/503 is blocked until its penalty key expires.
+TOKEN_BUCKET_SCRIPT = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return blocked
+end
+
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) / 1000 * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return wait
+"""
+
+
+class RateLimitExceeded(Exception):
+    """A host stayed throttled past CRAWL_RATE_LIMIT_MAX_WAIT; the request was not sent"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Rate limit for {host} still in effect, retry in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class HostRateLimiter:
+    """
+    Distributed per-host request rate limiter (Redis token bucket)
+
+    Rates default to settings.CRAWL_HOST_RATE / CRAWL_HOST_BURST and can be
+    overridden per host with crawl_policy 'host_rate_limits', e.g.
+    {"m.blog.naver.com": {"rate": 1, "burst": 3}, "ulsan.go.kr": 2}.
+    A key also applies to its subdomains, which then share its bucket. When
+    Redis is unavailable the limiter lets requests through (and stops asking
+    Redis for a while).
+    """
+
+    KEY_PREFIX = "host_rate:"
+    BLOCK_PREFIX = "host_block:"
+    REDIS_RETRY_SECONDS = 30
+    DEFAULT_PENALTY_SECONDS = 30
+
+    _script = None
+    _redis_down_until = 0.0
+
+    def __init__(self, host_limits: Optional[Dict[str, Any]] = None, enabled: bool = True):
+        from app.config import settings
+
+        self.enabled = enabled
+        self.default_rate = settings.CRAWL_HOST_RATE
+        self.default_burst = settings.CRAWL_HOST_BURST
+        self.max_wait = settings.CRAWL_RATE_LIMIT_MAX_WAIT
+        self.host_limits = {}
+        for host, limit in (host_limits or {}).items():
+            if isinstance(limit, dict):
+                rate = float(limit.get('rate', self.default_rate))
+                burst = int(limit.get('burst', max(1, round(rate))))
+            else:
+                rate = float(limit)
+                burst = max(1, round(rate))
+            if rate > 0:
+                self.host_limits[host.lower()] = (rate, max(1, burst))
+
+    def rule_for(self, host: str) -> Tuple[str, float, int]:
+        """(bucket key, requests per second, burst) for a host; the most specific matching key wins"""
+        host = (host or '').lower()
+        parts = host.split('.')
+        for i in range(len(parts)):
+            rule = '.'.join(parts[i:])
+            limit = self.host_limits.get(rule)
+            if limit:
+                return (rule, *limit)
+        return host, self.default_rate, self.default_burst
+
+    def limit_for(self, host: str) -> Tuple[float, int]:
+        """(requests per second, burst) for a host"""
+        return self.rule_for(host)[1:]
+
+    def _redis(self):
+        from app.redis_client import get_redis
+        return get_redis()
+
+    def _redis_failed(self, e: Exception):
+        if time.monotonic() >= HostRateLimiter._redis_down_until:
+            logger.warning(f"Host rate limiter unavailable, not throttling for {self.REDIS_RETRY_SECONDS}s: {e}")
+        HostRateLimiter._redis_down_until = time.monotonic() + self.REDIS_RETRY_SECONDS
+
+    def reserve(self, host: str) -> float:
+        """Take a token for host; returns 0 if the request may go now, else seconds to wait"""
+        if not self.enabled or not host or time.monotonic() < HostRateLimiter._redis_down_until:
+            return 0.0
+
+        rule, rate, burst = self.rule_for(host)
+        try:
+            if HostRateLimiter._script is None:
+                HostRateLimiter._script = self._redis().register_script(TOKEN_BUCKET_SCRIPT)
+            wait_ms = HostRateLimiter._script(
+                keys=[self.KEY_PREFIX + rule, self.BLOCK_PREFIX + rule],
+                args=[rate, burst]
+            )
+            return max(0, int(wait_ms)) / 1000.0
+        except Exception as e:
+            self._redis_failed(e)
+            return 0.0
+
+    def wait(self, host: str):
+        """Block until a request to host is allowed; raises RateLimitExceeded after CRAWL_RATE_LIMIT_MAX_WAIT"""
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            delay = self.reserve(host)
+            if delay <= 0:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Rate limit wait for {host} exceeded {self.max_wait}s, giving up")
+                raise RateLimitExceeded(host, delay)
+            time.sleep(min(delay, remaining))
+
+    async def wait_async(self, host: str):
+        """Async variant of wait()"""
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            delay = await asyncio.to_thread(self.reserve, host)
+            if delay <= 0:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Rate limit wait for {host} exceeded {self.max_wait}s, giving up")
+                raise RateLimitExceeded(host, delay)
+            await asyncio.sleep(min(delay, remaining))
+
+    def penalize(self, host: str, seconds: float):
+        """Pause all requests to host's rule (after a 429/503) for every worker"""
+        if not self.enabled or not host or time.monotonic() < HostRateLimiter._redis_down_until:
+            return
+        try:
+            self._redis().set(self.BLOCK_PREFIX + self.rule_for(host)[0], 1, px=max(1, int(seconds * 1000)))
+            logger.warning(f"Host {host} is rate limiting us, pausing requests for {seconds:.0f}s")
+        except Exception as e:
+            self._redis_failed(e)
+
+    def observe(self, host: str, status_code: int, retry_after: Optional[str]):
+        """Back off from a host that answered 429 Too Many Requests or 503 Service Unavailable"""
+        if status_code not in (429, 503):
+            return
+        seconds = self.DEFAULT_PENALTY_SECONDS
+        if retry_after:
+            try:
+                seconds = min(float(retry_after), self.max_wait * 5)
+            except ValueError:
+                pass  # HTTP-date form; keep the default penalty
+        self.penalize(host, seconds)
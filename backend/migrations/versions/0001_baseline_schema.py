@@ -0,0 +1,138 @@
+"""baseline schema
+
+Tables and indexes as Base.metadata.create_all created them at app startup
+before migrations were introduced. Existing databases are stamped at this
+revision instead of running it; see README.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('hashed_password', sa.String(length=200), nullable=False),
+    sa.Column('role', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('login_count', sa.Integer(), nullable=True),
+    sa.Column('openai_api_key', sa.String(length=200), nullable=True),
+    sa.Column('gemini_api_key', sa.String(length=200), nullable=True),
+    sa.Column('perplexity_api_key', sa.String(length=200), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    op.create_table('sources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('base_url', sa.String(length=500), nullable=False),
+    sa.Column('enabled', sa.Boolean(), nullable=True),
+    sa.Column('collect_interval', sa.Integer(), nullable=True),
+    sa.Column('last_collected_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('crawl_policy', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sources_id'), 'sources', ['id'], unique=False)
+    op.create_index(op.f('ix_sources_user_id'), 'sources', ['user_id'], unique=False)
+
+    op.create_table('items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('source_item_id', sa.String(length=200), nullable=True),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('collected_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('url', sa.String(length=1000), nullable=False),
+    sa.Column('raw_text', sa.Text(), nullable=True),
+    sa.Column('summary_text', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('region', sa.String(length=100), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('hash_content', sa.String(length=64), nullable=True),
+    sa.Column('hash_url', sa.String(length=64), nullable=True),
+    sa.Column('image_urls', sa.JSON(), nullable=True),
+    sa.Column('meta_json', sa.JSON(), nullable=True),
+    sa.Column('score_priority', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['source_id'], ['sources.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_items_hash_content'), 'items', ['hash_content'], unique=False)
+    op.create_index(op.f('ix_items_hash_url'), 'items', ['hash_url'], unique=False)
+    op.create_index(op.f('ix_items_id'), 'items', ['id'], unique=False)
+    op.create_index(op.f('ix_items_user_id'), 'items', ['user_id'], unique=False)
+
+    op.create_table('duplicates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('duplicate_of_item_id', sa.Integer(), nullable=False),
+    sa.Column('similarity', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['duplicate_of_item_id'], ['items.id'], ),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_duplicates_id'), 'duplicates', ['id'], unique=False)
+
+    op.create_table('queue',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('note_editor', sa.Text(), nullable=True),
+    sa.Column('export_format', sa.String(length=50), nullable=True),
+    sa.Column('payload_text', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('item_id')
+    )
+    op.create_index(op.f('ix_queue_id'), 'queue', ['id'], unique=False)
+
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_queue_id'), table_name='queue')
+
+    op.drop_table('queue')
+    op.drop_index(op.f('ix_duplicates_id'), table_name='duplicates')
+
+    op.drop_table('duplicates')
+    op.drop_index(op.f('ix_items_user_id'), table_name='items')
+    op.drop_index(op.f('ix_items_id'), table_name='items')
+    op.drop_index(op.f('ix_items_hash_url'), table_name='items')
+    op.drop_index(op.f('ix_items_hash_content'), table_name='items')
+
+    op.drop_table('items')
+    op.drop_index(op.f('ix_sources_user_id'), table_name='sources')
+    op.drop_index(op.f('ix_sources_id'), table_name='sources')
+
+    op.drop_table('sources')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+
+    op.drop_table('users')
@@ -0,0 +1,91 @@
+"""item query indexes
+
+Composite indexes for the item list filters (status, category, region, source)
+and the dashboard collected_at window, the (user_id, hash_url) unique index, and
+partial list-order indexes that leave status='deleted' rows out.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status <> 'deleted'")
+
+
+def _where(dialect: str) -> dict:
+    return {f"{dialect}_where": ACTIVE}
+
+
+def _list_order(dialect: str) -> list:
+    # SQLite sorts NULLs last in DESC order already and rejects NULLS LAST in indexes
+    if dialect == "postgresql":
+        return [sa.text("published_at DESC NULLS LAST"), sa.text("collected_at DESC NULLS LAST"), sa.text("id DESC")]
+    return [sa.text("published_at DESC"), sa.text("collected_at DESC"), sa.text("id DESC")]
+
+
+def _check_duplicate_urls() -> None:
+    """The unique index cannot be built while a user has the same URL stored twice"""
+    if context.is_offline_mode():
+        return
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT user_id, hash_url, COUNT(*) FROM items "
+        "WHERE hash_url IS NOT NULL "
+        "GROUP BY user_id, hash_url HAVING COUNT(*) > 1"
+    )).fetchall()
+    if duplicates:
+        listed = ", ".join(f"user_id={user_id} hash_url={hash_url} ({count})" for user_id, hash_url, count in duplicates[:20])
+        raise RuntimeError(
+            f"{len(duplicates)} (user_id, hash_url) pairs are stored more than once: {listed}. "
+            "Remove the extra rows before upgrading."
+        )
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    # One copy of a URL per user (batch ingestion relies on ON CONFLICT DO NOTHING)
+    _check_duplicate_urls()
+    op.create_index('uq_items_user_hash_url', 'items', ['user_id', 'hash_url'], unique=True, if_not_exists=True)
+
+    # Replace the full list-order indexes with partial ones
+    op.drop_index('ix_items_user_list_order', table_name='items', if_exists=True)
+    op.drop_index('ix_items_list_order', table_name='items', if_exists=True)
+    op.create_index('ix_items_user_list_order', 'items', [sa.text('user_id'), *_list_order(dialect)], **_where(dialect))
+    op.create_index('ix_items_list_order', 'items', _list_order(dialect), **_where(dialect))
+
+    op.create_index('ix_items_user_status', 'items', ['user_id', 'status'])
+    op.create_index('ix_items_user_collected_at', 'items', ['user_id', 'collected_at'])
+    op.create_index('ix_items_collected_at', 'items', ['collected_at'])
+    op.create_index('ix_items_user_category_active', 'items', ['user_id', 'category'], **_where(dialect))
+    op.create_index('ix_items_user_region_active', 'items', ['user_id', 'region'], **_where(dialect))
+    op.create_index('ix_items_source_id', 'items', ['source_id'])
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    op.drop_index('ix_items_source_id', table_name='items')
+    op.drop_index('ix_items_user_region_active', table_name='items')
+    op.drop_index('ix_items_user_category_active', table_name='items')
+    op.drop_index('ix_items_collected_at', table_name='items')
+    op.drop_index('ix_items_user_collected_at', table_name='items')
+    op.drop_index('ix_items_user_status', table_name='items')
+
+    op.drop_index('ix_items_list_order', table_name='items')
+    op.drop_index('ix_items_user_list_order', table_name='items')
+    op.create_index('ix_items_list_order', 'items', _list_order(dialect))
+    op.create_index('ix_items_user_list_order', 'items', [sa.text('user_id'), *_list_order(dialect)])
+
+    op.drop_index('uq_items_user_hash_url', table_name='items')
@@ -0,0 +1,49 @@
+"""minhash index
+
+MinHash signatures and LSH band buckets used for near-duplicate lookup.
+Existing items are indexed by scripts/build_minhash_index.py.
+
+Revision ID: 0004
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('item_minhashes',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('item_id')
+    )
+    op.create_table('minhash_bands',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.String(length=16), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_minhash_bands_band_bucket', 'minhash_bands', ['band', 'bucket'], unique=False)
+    op.create_index(op.f('ix_minhash_bands_id'), 'minhash_bands', ['id'], unique=False)
+    op.create_index(op.f('ix_minhash_bands_item_id'), 'minhash_bands', ['item_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_minhash_bands_item_id'), table_name='minhash_bands')
+    op.drop_index(op.f('ix_minhash_bands_id'), table_name='minhash_bands')
+    op.drop_index('ix_minhash_bands_band_bucket', table_name='minhash_bands')
+    op.drop_table('minhash_bands')
+    op.drop_table('item_minhashes')
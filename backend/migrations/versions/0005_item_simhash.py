@@ -0,0 +1,49 @@
+"""item simhash
+
+items.simhash and the SimHash block table used for Hamming-distance lookup.
+Existing items are fingerprinted by scripts/build_simhash_index.py.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('items', sa.Column('simhash', sa.BigInteger(), nullable=True))
+    op.create_index(op.f('ix_items_simhash'), 'items', ['simhash'], unique=False)
+
+    op.create_table('item_simhash_blocks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('block', sa.Integer(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_item_simhash_blocks_block_value', 'item_simhash_blocks', ['block', 'value'], unique=False)
+    op.create_index(op.f('ix_item_simhash_blocks_id'), 'item_simhash_blocks', ['id'], unique=False)
+    op.create_index(op.f('ix_item_simhash_blocks_item_id'), 'item_simhash_blocks', ['item_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_item_simhash_blocks_item_id'), table_name='item_simhash_blocks')
+    op.drop_index(op.f('ix_item_simhash_blocks_id'), table_name='item_simhash_blocks')
+    op.drop_index('ix_item_simhash_blocks_block_value', table_name='item_simhash_blocks')
+    op.drop_table('item_simhash_blocks')
+
+    op.drop_index(op.f('ix_items_simhash'), table_name='items')
+    with op.batch_alter_table('items') as batch_op:
+        batch_op.drop_column('simhash')
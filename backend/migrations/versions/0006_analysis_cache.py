@@ -0,0 +1,43 @@
+"""analysis cache
+
+Summary and classification results keyed by content hash and summary mode,
+reused for items with identical text.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('analysis_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('hash_content', sa.String(length=64), nullable=False),
+    sa.Column('mode', sa.String(length=100), nullable=False),
+    sa.Column('title_hash', sa.String(length=64), nullable=True),
+    sa.Column('summary_text', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('region', sa.String(length=100), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('hash_content', 'mode', name='uq_analysis_cache_hash_mode')
+    )
+    op.create_index(op.f('ix_analysis_cache_id'), 'analysis_cache', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_analysis_cache_id'), table_name='analysis_cache')
+    op.drop_table('analysis_cache')
@@ -0,0 +1,32 @@
+"""source next_due_at
+
+Indexed next collection time, so the beat tick selects only due sources.
+Existing sources keep NULL, which the scheduler treats as due now.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('next_due_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_sources_enabled_next_due_at', 'sources', ['enabled', 'next_due_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sources_enabled_next_due_at', table_name='sources')
+    with op.batch_alter_table('sources') as batch_op:
+        batch_op.drop_column('next_due_at')
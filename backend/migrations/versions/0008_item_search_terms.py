@@ -0,0 +1,42 @@
+"""item search terms
+
+Bigram inverted index for item search.
+Existing items are indexed by scripts/build_search_index.py.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('item_search_terms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('term', sa.String(length=16), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_item_search_terms_id'), 'item_search_terms', ['id'], unique=False)
+    op.create_index(op.f('ix_item_search_terms_item_id'), 'item_search_terms', ['item_id'], unique=False)
+    op.create_index('ix_item_search_terms_term_item', 'item_search_terms', ['term', 'item_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_item_search_terms_term_item', table_name='item_search_terms')
+    op.drop_index(op.f('ix_item_search_terms_item_id'), table_name='item_search_terms')
+    op.drop_index(op.f('ix_item_search_terms_id'), table_name='item_search_terms')
+    op.drop_table('item_search_terms')
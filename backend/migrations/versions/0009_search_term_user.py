@@ -0,0 +1,36 @@
+"""search term user
+
+Copies items.user_id onto item_search_terms and indexes (user_id, term, item_id),
+so a user's search reads only that user's postings.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('item_search_terms', sa.Column('user_id', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE item_search_terms SET user_id = "
+        "(SELECT items.user_id FROM items WHERE items.id = item_search_terms.item_id)"
+    )
+    op.create_index('ix_item_search_terms_user_term_item', 'item_search_terms', ['user_id', 'term', 'item_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_item_search_terms_user_term_item', table_name='item_search_terms')
+    with op.batch_alter_table('item_search_terms') as batch_op:
+        batch_op.drop_column('user_id')
@@ -0,0 +1,44 @@
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.item import Item
+from app.models.minhash import ItemMinHash
+from app.services import minhash_service
+
+
+def build_index(batch_size: int = 500):
+    """Index every item that is not in the MinHash/LSH tables yet (tables: alembic upgrade head)"""
+    db = SessionLocal()
+    try:
+        indexed = 0
+        last_id = 0
+        while True:
+            items = db.query(Item).outerjoin(ItemMinHash, ItemMinHash.item_id == Item.id).filter(
+                ItemMinHash.item_id == None,
+                Item.id > last_id
+            ).order_by(Item.id).limit(batch_size).all()
+            if not items:
+                break
+            
+            for item in items:
+                minhash_service.index_item(db, item)
+            db.commit()
+            
+            indexed += len(items)
+            last_id = items[-1].id
+            print(f"Indexed {indexed} items...")
+        
+        print(f"Done. Indexed {indexed} items.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    build_index()
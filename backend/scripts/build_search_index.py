@@ -0,0 +1,45 @@
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.item import Item
+from app.models.search import ItemSearchTerm
+from app.services import search_service
+
+
+def build_index(batch_size: int = 500, rebuild: bool = False):
+    """Index items not in the search term table yet (all of them with --rebuild; tables: alembic upgrade head)"""
+    db = SessionLocal()
+    try:
+        indexed = 0
+        last_id = 0
+        while True:
+            query = db.query(Item).filter(Item.id > last_id)
+            if not rebuild:
+                indexed_ids = db.query(ItemSearchTerm.item_id)
+                query = query.filter(~Item.id.in_(indexed_ids))
+            items = query.order_by(Item.id).limit(batch_size).all()
+            if not items:
+                break
+            
+            for item in items:
+                search_service.index_item(db, item)
+            db.commit()
+            
+            indexed += len(items)
+            last_id = items[-1].id
+            print(f"Indexed {indexed} items...")
+        
+        print(f"Done. Indexed {indexed} items.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    build_index(rebuild="--rebuild" in sys.argv)
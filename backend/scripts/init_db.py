@@ -4,15 +4,14 @@ import os
 # Add backend to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.database import engine, Base
-from app.models.user import User
-from app.models.source import Source
-from app.models.item import Item
-from app.models.queue import Queue
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 def init_db():
-    print("데이터베이스 테이블 생성 중...")
-    Base.metadata.create_all(bind=engine)
+    print("데이터베이스 마이그레이션 적용 중...")
+    command.upgrade(Config(os.path.join(BACKEND_DIR, "alembic.ini")), "head")
     print("완료!")
 
 if __name__ == "__main__":
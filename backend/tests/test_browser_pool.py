@@ -0,0 +1,167 @@
+import sys
+import os
+import threading
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from connectors.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+        self.thread = threading.get_ident()
+
+    async def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    def is_connected(self):
+        return not self.closed
+
+    async def close(self):
+        assert threading.get_ident() == self.thread  # Playwright objects stay on their thread
+        self.closed = True
+
+
+def make_pool(monkeypatch, **kwargs):
+    pool = BrowserPool(**kwargs)
+    launched = []
+
+    async def ensure_browser():
+        if pool._browser is None or not pool._browser.is_connected():
+            pool._browser = FakeBrowser()
+            pool._uses = 0
+            launched.append(pool._browser)
+        return pool._browser
+
+    monkeypatch.setattr(pool, "_ensure_browser", ensure_browser)
+    return pool, launched
+
+
+async def keep(page):
+    return page
+
+
+def test_lease_reuses_context_and_closes_pages(monkeypatch):
+    pool, launched = make_pool(monkeypatch, max_pages=2, recycle_after=10)
+    setups = []
+
+    async def setup(context):
+        setups.append(context)
+
+    for _ in range(3):
+        page = pool.run_with_page(keep, "instagram:a", setup=setup)
+        assert page.closed
+
+    assert len(launched) == 1
+    assert len(launched[0].contexts) == 1 and len(setups) == 1
+
+    pool.run_with_page(keep, "instagram:b")
+    assert len(launched[0].contexts) == 2
+    pool.close()
+
+
+def test_browser_recycled_after_n_leases_and_page_cap(monkeypatch):
+    pool, launched = make_pool(monkeypatch, max_pages=1, recycle_after=2)
+
+    async def check_cap(page):
+        return pool._pages.locked()
+
+    assert pool.run_with_page(check_cap)  # Cap of one open page
+    pool.run_with_page(keep)
+    assert launched[0].closed
+
+    pool.run_with_page(keep)
+    assert len(launched) == 2
+    pool.close()
+
+
+def test_failed_lease_discards_context(monkeypatch):
+    pool, launched = make_pool(monkeypatch)
+
+    async def crash(page):
+        raise RuntimeError("page crashed")
+
+    with pytest.raises(RuntimeError):
+        pool.run_with_page(crash, "broken")
+
+    assert launched[0].contexts[0].closed
+    assert "broken" not in pool._contexts
+    pool.close()
+
+
+def test_leases_from_every_thread_run_on_one_browser_thread(monkeypatch):
+    import asyncio
+    pool, launched = make_pool(monkeypatch, max_pages=2, recycle_after=100)
+    threads_used = set()
+    active = []
+    peak = []
+
+    async def browse(page):
+        threads_used.add(threading.get_ident())
+        active.append(page)
+        peak.append(len(active))
+        await asyncio.sleep(0.02)
+        active.remove(page)
+
+    callers = [threading.Thread(target=pool.run_with_page, args=(browse,)) for _ in range(6)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    assert threads_used == {pool._thread.ident}
+    assert len(launched) == 1 and max(peak) == 2
+
+    # Closed on the pool's own thread (FakeBrowser.close checks), even from another caller thread
+    closer = threading.Thread(target=pool.close)
+    closer.start()
+    closer.join()
+    assert launched[0].closed
+
+
+def test_one_pool_per_process(monkeypatch):
+    from connectors import browser_pool
+
+    monkeypatch.setattr(browser_pool, "_pools", {})
+    pools = []
+    thread = threading.Thread(target=lambda: pools.append(browser_pool.get_browser_pool()))
+    thread.start()
+    thread.join()
+    pools.append(browser_pool.get_browser_pool())
+
+    assert pools[0] is pools[1]
+    browser_pool.shutdown_browser_pools()
+    assert browser_pool._pools == {}
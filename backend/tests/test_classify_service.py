@@ -0,0 +1,45 @@
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.classify_service import (
+    CATEGORY_KEYWORDS, REGION_KEYWORDS, EXTRA_TAG_KEYWORDS, classify_item, scan_keywords
+)
+
+
+def naive_classify(title, content):
+    """Reference implementation: one substring scan per keyword"""
+    text = f"{title} {content}".lower()
+    counts = {}
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        count = sum(1 for keyword in keywords if keyword in text)
+        if count:
+            counts[category] = count
+    category = max(counts.items(), key=lambda x: x[1])[0] if counts else "공지"
+    region = next((r for r, kws in REGION_KEYWORDS.items() if any(k in text for k in kws)), "울산 전체")
+    tags = {k for kws in CATEGORY_KEYWORDS.values() for k in kws if k in text}
+    tags |= {r for r, kws in REGION_KEYWORDS.items() if any(k in text for k in kws)}
+    tags |= {k for k in EXTRA_TAG_KEYWORDS if k in text}
+    return category, region, tags
+
+
+def test_scan_keywords_reports_first_positions():
+    assert scan_keywords("울주군 축제, 울주 페스티벌 축제") == {"울주군": 0, "울주": 0, "축제": 4, "페스티벌": 11}
+    assert scan_keywords("") == {}
+
+
+def test_classify_item_matches_naive_scan():
+    samples = [
+        ("울주군 봄꽃 축제 개최", "울주 작천정 일대에서 페스티벌과 공연이 열립니다. 시민 참여 무료"),
+        ("남구 일자리 박람회", "기업 채용 모집 안내, 접수 및 문의는 남구청으로"),
+        ("도로 통제 알림", "버스 운행 경로가 변경됩니다"),
+        ("", ""),
+    ]
+    for title, content in samples:
+        category, region, tags = classify_item(title, content)
+        expected_category, expected_region, expected_tags = naive_classify(title, content)
+        assert (category, region) == (expected_category, expected_region)
+        assert len(tags) == min(10, len(expected_tags)) and set(tags) <= expected_tags
+        assert tags == classify_item(title, content)[2]  # Deterministic order
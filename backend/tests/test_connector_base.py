@@ -0,0 +1,294 @@
+import sys
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from connectors.base import ConnectorBase, PageNotModified
+
+
+class MockSource:
+    def __init__(self, url, crawl_policy=None):
+        self.base_url = url
+        self.crawl_policy = crawl_policy
+        self.name = "Test Source"
+        self.type = "generic_board"
+
+
+class SlowPageHandler(BaseHTTPRequestHandler):
+    """Serves /post/<n> after a short delay and tracks peak concurrency"""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.2)
+            if self.path.startswith("/missing"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = f"<html><body><p>{self.path}</p></body></html>".encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class EchoConnector(ConnectorBase):
+    def fetch_list(self):
+        return []
+
+    def parse_detail(self, item_url, html):
+        soup = self.parse_html(html)
+        return {'raw_text': soup.get_text(strip=True), 'image_urls': [], 'meta_json': {}}
+
+
+def run_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowPageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def test_fetch_details_runs_concurrently_within_limits():
+    server = run_server()
+    SlowPageHandler.peak = 0
+    try:
+        base = f"http://127.0.0.1:{server.server_port}"
+        policy = json.dumps({"concurrency": 8, "per_host_concurrency": 4})
+        connector = EchoConnector(MockSource(base, policy))
+        urls = [f"{base}/post/{n}" for n in range(12)]
+
+        started = time.monotonic()
+        details = connector.fetch_details(urls)
+        elapsed = time.monotonic() - started
+        connector.close()
+
+        assert set(details) == set(urls)
+        assert details[urls[3]]['raw_text'] == "/post/3"
+        # 12 requests of 0.2s with 4 in flight per host: ~0.6s instead of ~2.4s
+        assert elapsed < 1.8
+        assert SlowPageHandler.peak <= 4
+    finally:
+        server.shutdown()
+
+
+def test_fetch_details_returns_empty_detail_on_error():
+    server = run_server()
+    try:
+        base = f"http://127.0.0.1:{server.server_port}"
+        connector = EchoConnector(MockSource(base))
+        details = connector.fetch_details([f"{base}/missing/1", f"{base}/post/1", f"{base}/post/1"])
+        connector.close()
+
+        assert len(details) == 2
+        assert details[f"{base}/missing/1"] == connector.empty_detail()
+        assert details[f"{base}/post/1"]['raw_text'] == "/post/1"
+    finally:
+        server.shutdown()
+
+
+def test_filter_known_skips_known_items_and_stops_after_run():
+    from app.services.dedup_service import generate_url_hash
+
+    policy = json.dumps({"incremental_stop_after": 3})
+    connector = EchoConnector(MockSource("https://example.com/board", policy))
+    connector.set_known_items(
+        url_hashes={generate_url_hash("https://example.com/pinned")},
+        source_item_ids={"3", "4", "5", "6"}
+    )
+    entries = [
+        {"url": "https://example.com/pinned"},
+        {"url": "https://example.com/view?id=1", "source_item_id": "1"},
+        {"url": "https://example.com/view?id=2", "source_item_id": "2"},
+        {"url": "https://example.com/view?id=3", "source_item_id": "3"},
+        {"url": "https://example.com/view?id=4", "source_item_id": "4"},
+        {"url": "https://example.com/view?id=5", "source_item_id": "5"},
+        {"url": "https://example.com/view?id=7", "source_item_id": "7"},
+    ]
+
+    new_entries = connector.filter_known(entries)
+    connector.close()
+
+    assert [e["source_item_id"] for e in new_entries] == ["1", "2"]
+    assert connector.skipped_known == 4
+
+
+def test_filter_known_looks_up_only_the_fetched_page():
+    from app.services.dedup_service import generate_url_hash
+
+    lookups = []
+
+    def lookup(url_hashes, source_item_ids):
+        lookups.append((len(url_hashes), sorted(source_item_ids)))
+        return {generate_url_hash("https://example.com/view?id=2")}, {"3"}
+
+    connector = EchoConnector(MockSource("https://example.com/board"))
+    connector.set_known_lookup(lookup)
+    entries = [{"url": f"https://example.com/view?id={n}", "source_item_id": str(n)} for n in (1, 2, 3)]
+
+    new_entries = connector.filter_known(entries)
+    connector.close()
+
+    assert [e["source_item_id"] for e in new_entries] == ["1"]
+    assert lookups == [(3, ["1", "2", "3"])]
+
+
+def test_filter_known_is_noop_without_known_items():
+    connector = EchoConnector(MockSource("https://example.com/board"))
+    entries = [{"url": "https://example.com/a"}, {"url": "https://example.com/b"}]
+    assert connector.filter_known(entries) == entries
+    connector.close()
+
+
+class ValidatorHandler(BaseHTTPRequestHandler):
+    """Serves /etag with an ETag and /plain without validators"""
+    body = b"<html><body>board</body></html>"
+
+    def do_GET(self):
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class MemoryValidatorStore:
+    def __init__(self):
+        self.data = {}
+
+    def load(self, url):
+        return dict(self.data.get(url, {}))
+
+    def save(self, url, etag, last_modified, digest):
+        self.data[url] = {k: v for k, v in
+                          {"etag": etag, "last_modified": last_modified, "digest": digest}.items() if v}
+
+
+def test_conditional_get_page_short_circuits_unchanged_pages(monkeypatch):
+    from worker.tasks import collection
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ValidatorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    store = MemoryValidatorStore()
+    monkeypatch.setattr(collection, "PageValidatorStore", lambda: store)
+    try:
+        base = f"http://127.0.0.1:{server.server_port}"
+        for path in ("/etag", "/plain"):
+            first = EchoConnector(MockSource(base))
+            first.validator_store = store
+            assert "board" in first.get_page(base + path, conditional=True)
+            # Validators are only stored once the collection commits them
+            assert base + path not in store.data
+            if path == "/etag":
+                first.commit_validators()
+            else:
+                # The follow-up task linked to ingest_items
+                collection.save_page_validators.run(first.pending_validators())
+            first.close()
+
+            second = EchoConnector(MockSource(base))
+            second.validator_store = store
+            try:
+                second.get_page(base + path, conditional=True)
+                assert False, "expected PageNotModified"
+            except PageNotModified:
+                pass
+            assert second.not_modified
+            second.close()
+    finally:
+        server.shutdown()
+
+
+def test_host_rate_limiter_policy_and_backoff(monkeypatch):
+    from connectors.rate_limiter import HostRateLimiter
+
+    limiter = HostRateLimiter({"ulsan.go.kr": 1, "m.blog.naver.com": {"rate": 0.5, "burst": 2}})
+    assert limiter.limit_for("www.ulsan.go.kr") == (1.0, 1)
+    assert limiter.limit_for("m.blog.naver.com") == (0.5, 2)
+    assert limiter.limit_for("example.com") == (limiter.default_rate, limiter.default_burst)
+
+    class FakeRedis:
+        def __init__(self):
+            self.blocked = {}
+
+        def set(self, key, value, px):
+            self.blocked[key] = px
+
+    fake = FakeRedis()
+    monkeypatch.setattr(HostRateLimiter, "_redis_down_until", 0.0)
+    monkeypatch.setattr(limiter, "_redis", lambda: fake)
+    limiter.observe("m.blog.naver.com", 200, None)
+    limiter.observe("m.blog.naver.com", 429, "12")
+    assert fake.blocked == {"host_block:m.blog.naver.com": 12000}
+
+    # Subdomains share the bucket and penalty of the rule they matched
+    assert limiter.rule_for("www.ulsan.go.kr") == ("ulsan.go.kr", 1.0, 1)
+    assert limiter.rule_for("Example.com")[0] == "example.com"
+    limiter.observe("news.ulsan.go.kr", 503, None)
+    assert fake.blocked["host_block:ulsan.go.kr"] == limiter.DEFAULT_PENALTY_SECONDS * 1000
+
+
+def test_host_rate_limiter_gives_up_instead_of_sending(monkeypatch):
+    import asyncio
+    from connectors.rate_limiter import HostRateLimiter, RateLimitExceeded
+
+    limiter = HostRateLimiter()
+    limiter.max_wait = 0.05
+    monkeypatch.setattr(limiter, "reserve", lambda host: 30.0)  # Host stays blocked
+
+    try:
+        limiter.wait("example.com")
+        assert False, "expected RateLimitExceeded"
+    except RateLimitExceeded as e:
+        assert e.host == "example.com" and e.retry_after == 30.0
+
+    try:
+        asyncio.run(limiter.wait_async("example.com"))
+        assert False, "expected RateLimitExceeded"
+    except RateLimitExceeded:
+        pass
+
+
+def test_host_rate_limiter_fails_open_without_redis(monkeypatch):
+    from connectors.rate_limiter import HostRateLimiter
+
+    def unavailable():
+        raise ConnectionError("redis down")
+
+    limiter = HostRateLimiter()
+    monkeypatch.setattr(HostRateLimiter, "_redis_down_until", 0.0)
+    monkeypatch.setattr(HostRateLimiter, "_script", None)
+    monkeypatch.setattr(limiter, "_redis", unavailable)
+    assert limiter.reserve("example.com") == 0.0
+    assert HostRateLimiter._redis_down_until > time.monotonic()
+    limiter.wait("example.com")  # Returns immediately while Redis is marked down
@@ -0,0 +1,122 @@
+import sys
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from app.database import Base
+from app.models import Source, Item
+from app.services.dedup_service import generate_url_hash, find_existing_url_hashes, process_deduplication
+from app.services import minhash_service, simhash_service
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    source = Source(name="Source", type="rss", base_url="https://example.com")
+    session.add(source)
+    session.commit()
+    yield session
+    session.close()
+
+
+def add_item(db, url, title="Item", raw_text="", source_id=1):
+    item = Item(title=title, url=url, raw_text=raw_text, source_id=source_id,
+                hash_url=generate_url_hash(url), status="collected")
+    db.add(item)
+    db.commit()
+    return item
+
+
+def test_find_existing_url_hashes(db):
+    add_item(db, "https://example.com/1")
+    add_item(db, "https://example.com/2")
+
+    hashes = [generate_url_hash(f"https://example.com/{n}") for n in range(1, 5)]
+    existing = find_existing_url_hashes(db, hashes)
+
+    assert existing == set(hashes[:2])
+    assert find_existing_url_hashes(db, []) == set()
+
+
+def test_minhash_signature_is_stable_and_estimates_jaccard():
+    text = "울산 중구 문화의 거리에서 봄맞이 축제가 열립니다 많은 참여 바랍니다"
+    assert minhash_service.compute_signature(minhash_service.shingle(text)) == \
+        minhash_service.compute_signature(minhash_service.shingle(text))
+
+    sig1 = minhash_service.compute_signature(minhash_service.shingle(text))
+    sig2 = minhash_service.compute_signature(minhash_service.shingle("전혀 다른 내용의 교통 통제 안내문입니다"))
+    assert minhash_service.estimate_similarity(sig1, sig1) == 1.0
+    assert minhash_service.estimate_similarity(sig1, sig2) < 0.2
+
+
+def test_near_duplicates_found_across_sources(db):
+    db.add(Source(name="Other", type="rss", base_url="https://other.example.com"))
+    db.commit()
+    body = "울산 중구 문화의 거리에서 봄맞이 축제가 열립니다. 공연과 체험 행사가 준비되어 있으니 많은 참여 바랍니다."
+
+    original = add_item(db, "https://example.com/a", title="중구 봄맞이 축제 개최", raw_text=body)
+    unrelated = add_item(db, "https://example.com/b", title="도로 공사 안내", raw_text="남구 도로 공사로 교통이 통제됩니다.")
+    process_deduplication(db, original)
+    process_deduplication(db, unrelated)
+    db.commit()
+
+    repost = add_item(db, "https://other.example.com/1", title="[공유] 중구 봄맞이 축제 개최",
+                      raw_text=body + " 자세한 내용은 구청 홈페이지를 참고하세요.", source_id=2)
+    assert process_deduplication(db, repost) == 1
+
+    matches = minhash_service.find_similar_items(db, repost)
+    assert [item_id for item_id, _ in matches] == [original.id]
+    assert matches[0][1] >= 0.7
+
+    # Later items never match earlier ones, so originals stay originals
+    assert minhash_service.find_similar_items(db, original) == []
+
+    # Soft-deleted items are not candidates, even with stale index rows
+    original.status = "deleted"
+    db.commit()
+    assert minhash_service.find_similar_items(db, repost) == []
+
+
+def test_simhash_blocks_find_items_within_hamming_distance(db):
+    body = "남구 삼산동 일대 도로 포장 공사로 3월 4일부터 8일까지 교통이 통제됩니다. 우회 도로를 이용해 주시기 바랍니다."
+    original = add_item(db, "https://example.com/a", title="삼산동 도로 공사 교통 통제", raw_text=body)
+    original.simhash = simhash_service.item_simhash(original.title, original.raw_text)
+    process_deduplication(db, original)
+    db.commit()
+
+    assert simhash_service.hamming_distance(original.simhash, original.simhash) == 0
+    assert len(simhash_service.split_blocks(original.simhash)) == simhash_service.BLOCKS
+
+    # Signed storage round-trips through the BIGINT column
+    db.expire(original)
+    assert simhash_service.to_unsigned(original.simhash) < (1 << 64)
+
+    copy = add_item(db, "https://example.com/b", title="삼산동 도로 공사 교통 통제", raw_text=body + ".")
+    copy.simhash = simhash_service.item_simhash(copy.title, copy.raw_text)
+    db.commit()
+    matches = simhash_service.find_near_items(db, copy)
+    assert matches and matches[0][0] == original.id
+    assert matches[0][1] <= simhash_service.MAX_DISTANCE
+
+    original.status = "deleted"
+    db.commit()
+    assert simhash_service.find_near_items(db, copy) == []
+    original.status = "collected"
+    db.commit()
+
+    other = add_item(db, "https://example.com/c", title="중구 청소년 오케스트라 단원 모집",
+                     raw_text="문화예술회관에서 청소년 오케스트라 신규 단원을 모집합니다.")
+    other.simhash = simhash_service.item_simhash(other.title, other.raw_text)
+    db.commit()
+    assert simhash_service.find_near_items(db, other) == []
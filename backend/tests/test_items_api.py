@@ -0,0 +1,223 @@
+import sys
+import os
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from app.main import app
+from app.database import Base, get_db, get_async_db
+from app.auth import create_access_token, invalidate_cached_user
+from app.models import Source, Item, User, Duplicate, Queue
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file database shared by the sync session (writes) and the async one (auth, read routes)
+    path = tmp_path / "items.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # TestClient may run each request on a new event loop, so async connections are not pooled
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    factory.async_engine = async_engine
+    invalidate_cached_user()
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield factory
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+@pytest.fixture
+def client(session_factory):
+    db = session_factory()
+    user = User(username="editor", hashed_password="x", role="editor")
+    db.add(user)
+    db.commit()
+    db.add(Source(name="Board", type="generic_board", base_url="https://example.com", user_id=user.id))
+    db.commit()
+    db.close()
+
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'editor'})}"
+    return client
+
+
+def add_items(session_factory, published_dates):
+    db = session_factory()
+    collected = datetime(2026, 3, 1, 12, 0)
+    for n, published_at in enumerate(published_dates):
+        db.add(Item(source_id=1, user_id=1, title=f"Item {n}", url=f"https://example.com/{n}",
+                    hash_url=str(n), published_at=published_at, collected_at=collected, status="collected"))
+    db.commit()
+    db.close()
+
+
+def test_cursor_pagination_walks_all_items_in_order(client, session_factory):
+    base = datetime(2026, 2, 1)
+    # Ties on published_at and undated items exercise every branch of the keyset condition
+    add_items(session_factory, [base, base, None, base + timedelta(days=1), None, base - timedelta(days=1), base])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/items", params=params)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    expected = [item["id"] for item in client.get("/api/items", params={"limit": 100}).json()]
+    assert seen == expected
+    assert len(seen) == 7 and len(set(seen)) == 7
+    assert expected[0] == 4  # Newest published first, undated items last
+
+
+def test_cursor_pagination_with_default_collected_at(client, session_factory):
+    # collected_at left to the server default (stored without fractional seconds on SQLite)
+    # next to rows written with a datetime of the same second; the cursor must walk both
+    db = session_factory()
+    for n in range(5):
+        db.add(Item(source_id=1, user_id=1, title=f"Item {n}", url=f"https://example.com/{n}",
+                    hash_url=str(n), status="collected"))
+    db.commit()
+    same_second = db.query(Item.collected_at).first()[0]
+    for n in range(5, 7):
+        db.add(Item(source_id=1, user_id=1, title=f"Item {n}", url=f"https://example.com/{n}",
+                    hash_url=str(n), collected_at=same_second, status="collected"))
+    db.commit()
+    db.close()
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/items", params=params)
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert sorted(seen) == list(range(1, 8))
+    assert len(seen) == 7
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/items", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_search_ranks_title_matches_and_requires_all_terms(client, session_factory):
+    from app.services import search_service
+
+    db = session_factory()
+    rows = [
+        ("남구 봄꽃 축제 개최", "남구 일대에서 축제가 열립니다.", "collected"),
+        ("교통 통제 안내", "봄꽃 축제 기간 동안 교통이 통제됩니다.", "collected"),
+        ("청소년 수련관 강좌 모집", "여름방학 강좌 안내", "collected"),
+        ("봄꽃 축제 취소", "삭제된 게시물", "deleted"),
+    ]
+    for n, (title, text, status) in enumerate(rows):
+        item = Item(source_id=1, user_id=1, title=title, url=f"https://example.com/{n}", hash_url=str(n),
+                    raw_text=text, summary_text=text, status=status)
+        db.add(item)
+        db.flush()
+        search_service.index_item(db, item)
+    db.commit()
+    db.close()
+
+    results = client.get("/api/items/search", params={"q": "봄꽃 축제"}).json()
+    assert [r["title"] for r in results] == ["남구 봄꽃 축제 개최", "교통 통제 안내"]
+    assert results[0]["score"] > results[1]["score"]
+
+    assert client.get("/api/items/search", params={"q": "봄꽃 강좌"}).json() == []
+    assert client.get("/api/items/search", params={"q": "봄"}).status_code == 400
+
+    listed = client.get("/api/items", params={"q": "강좌 모집"}).json()
+    assert [r["title"] for r in listed] == ["청소년 수련관 강좌 모집"]
+
+
+def count_queries(session_factory):
+    statements = []
+    for engine in (session_factory.kw["bind"], session_factory.async_engine.sync_engine):
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_item_detail_and_queue_use_fixed_number_of_queries(client, session_factory):
+    add_items(session_factory, [datetime(2026, 2, day) for day in range(1, 6)])
+    db = session_factory()
+    db.add_all([Duplicate(item_id=5, duplicate_of_item_id=n, similarity=0.9) for n in range(1, 5)])
+    db.add_all([Queue(item_id=n) for n in range(1, 5)])
+    db.commit()
+    db.close()
+
+    statements = count_queries(session_factory)
+    response = client.get("/api/items/5")
+    assert response.status_code == 200
+    assert [dup["id"] for dup in response.json()["duplicates"]] == [1, 2, 3, 4]
+    item_queries = [sql for sql in statements if "FROM items" in sql or "FROM duplicates" in sql]
+    assert len(item_queries) == 2
+
+    statements.clear()
+    response = client.get("/api/queue")
+    assert response.status_code == 200
+    assert sorted(entry["item_title"] for entry in response.json()) == ["Item 0", "Item 1", "Item 2", "Item 3"]
+    assert len([sql for sql in statements if "FROM queue" in sql or "FROM items" in sql]) == 1
+
+
+def test_authenticated_user_is_cached_until_invalidated(client, session_factory):
+    statements = count_queries(session_factory)
+    assert client.get("/api/auth/me").json()["role"] == "editor"
+    assert client.get("/api/auth/me").json()["role"] == "editor"
+    assert len([sql for sql in statements if "FROM users" in sql]) == 1
+
+    # Role changes made through the admin API take effect on the next request
+    db = session_factory()
+    db.add(User(username="boss", hashed_password="x", role="admin"))
+    db.commit()
+    db.close()
+    admin_headers = {"Authorization": f"Bearer {create_access_token({'sub': 'boss'})}"}
+    assert client.patch("/api/users/1", json={"role": "viewer"}, headers=admin_headers).status_code == 200
+    assert client.get("/api/auth/me").json()["role"] == "viewer"
+
+
+def test_settings_update_saves_the_async_loaded_user(client, session_factory):
+    client.get("/api/auth/me")  # Cached from the async session
+    response = client.patch("/api/auth/settings", json={"openai_api_key": "sk-test"})
+    assert response.status_code == 200 and response.json()["openai_api_key"] == "sk-test"
+    assert client.get("/api/auth/me").json()["openai_api_key"] == "sk-test"
+
+    db = session_factory()
+    assert db.query(User).filter(User.username == "editor").one().openai_api_key == "sk-test"
+    db.close()
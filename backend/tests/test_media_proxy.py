@@ -0,0 +1,229 @@
+import sys
+import os
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from app.main import app
+from app.services import media_proxy_service
+from app.services.media_proxy_service import MediaCache
+
+BODY = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    """Fake upstream host; returns the list of requested URLs"""
+    requested = []
+
+    async def handler(request):
+        requested.append(str(request.url))
+        await asyncio.sleep(0.01)
+        if request.url.path == "/private.jpg":
+            return httpx.Response(200, content=BODY, headers={"Content-Type": "image/jpeg", "Cache-Control": "no-store"})
+        if request.url.path == "/missing.jpg":
+            return httpx.Response(404)
+        if request.url.path == "/stream.bin":
+            async def chunks():
+                for start in range(0, len(BODY), 1000):
+                    yield BODY[start:start + 1000]
+            return httpx.Response(200, content=chunks(), headers={"Cache-Control": "max-age=600"})
+        if request.url.path == "/huge.bin":
+            return httpx.Response(200, content=BODY * 4, headers={"Content-Type": "application/octet-stream"})
+        return httpx.Response(200, content=BODY, headers={"Content-Type": "image/jpeg", "Cache-Control": "max-age=600"})
+
+    monkeypatch.setattr(media_proxy_service, "_cache", MediaCache(str(tmp_path), 10 * len(BODY)))
+    monkeypatch.setattr(media_proxy_service, "get_http_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return requested
+
+
+def proxy(client, url, **headers):
+    return client.get("/api/items/download-proxy", params={"url": url}, headers=headers)
+
+
+def test_proxy_serves_repeat_requests_from_disk_cache(upstream):
+    client = TestClient(app)
+    first = proxy(client, "https://img.example.com/a.jpg")
+    second = proxy(client, "https://img.example.com/a.jpg")
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content == BODY
+    assert first.headers["cache-control"] == "public, max-age=3600"
+    assert len(upstream) == 1
+
+    # Same bytes under another URL share one blob
+    proxy(client, "https://img.example.com/b.jpg")
+    cache = media_proxy_service.get_media_cache()
+    assert len(os.listdir(cache.entry_dir)) == 2
+    assert sum(len(files) for _, _, files in os.walk(cache.blob_dir)) == 1
+
+
+def test_proxy_range_and_uncacheable_responses(upstream):
+    client = TestClient(app)
+    partial = proxy(client, "https://img.example.com/a.jpg", Range="bytes=100-199")
+    assert partial.status_code == 206
+    assert partial.content == BODY[100:200]
+    assert partial.headers["content-range"] == f"bytes 100-199/{len(BODY)}"
+    assert proxy(client, "https://img.example.com/a.jpg", Range=f"bytes={len(BODY)}-").status_code == 416
+
+    for _ in range(2):
+        assert proxy(client, "https://img.example.com/private.jpg").content == BODY
+    assert upstream.count("https://img.example.com/private.jpg") == 2
+    assert os.listdir(media_proxy_service.get_media_cache().tmp_dir) == []
+
+    assert proxy(client, "https://img.example.com/missing.jpg").status_code == 400
+
+
+def test_concurrent_fetches_share_one_upstream_request(upstream):
+    async def fetch_all():
+        return await asyncio.gather(*[
+            media_proxy_service.fetch_media("https://img.example.com/c.jpg") for _ in range(5)
+        ])
+
+    entries = asyncio.run(fetch_all())
+    assert len(upstream) == 1
+    assert len({entry.path for entry in entries}) == 1
+    for entry in entries:
+        entry.close()
+
+
+def test_download_size_limit_and_eviction_while_serving(upstream, monkeypatch):
+    monkeypatch.setattr(media_proxy_service.settings, "MEDIA_PROXY_MAX_BYTES", len(BODY) * 2)
+    client = TestClient(app)
+    assert proxy(client, "https://img.example.com/huge.bin").status_code == 413
+    assert os.listdir(media_proxy_service.get_media_cache().tmp_dir) == []
+
+    # A served entry keeps its content even when eviction removes the blob meanwhile
+    entry = asyncio.run(media_proxy_service.fetch_media("https://img.example.com/d.jpg"))
+    cache = media_proxy_service.get_media_cache()
+    cache.max_bytes = 0
+    cache.evict()
+    assert not os.path.exists(entry.path)
+    assert b"".join(media_proxy_service.iter_file(entry.file)) == BODY
+
+    # Without Content-Length, a body past the cacheable size is relayed, not kept
+    monkeypatch.setattr(media_proxy_service.settings, "MEDIA_CACHE_MAX_OBJECT_BYTES", len(BODY) // 2)
+    assert proxy(client, "https://img.example.com/stream.bin").content == BODY
+    assert proxy(client, "https://img.example.com/stream.bin").headers["cache-control"] == "no-store"
+    assert upstream.count("https://img.example.com/stream.bin") == 2
+    assert os.listdir(media_proxy_service.get_media_cache().tmp_dir) == []
+
+
+def test_lru_eviction_keeps_cache_within_budget(tmp_path):
+    cache = MediaCache(str(tmp_path), 2500)
+    for n in range(4):
+        content = bytes([n]) * 1000
+        with cache.temp_file() as f:
+            f.write(content)
+        entry = media_proxy_service.MediaEntry(
+            url=f"https://img.example.com/{n}.jpg", path=f.name, sha256=f"{n:064x}",
+            size=len(content), content_type="image/jpeg", expires_at=2 ** 40
+        )
+        cache.store(entry, f.name).close()
+        os.utime(cache._entry_path(entry.url), (n, n))
+
+    assert cache.lookup("https://img.example.com/0.jpg") is None
+    assert cache.lookup("https://img.example.com/1.jpg") is None
+    assert cache.lookup("https://img.example.com/3.jpg").size == 1000
+
+
+def test_thumbnail_endpoint_renders_small_variant(upstream, tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    import io
+    from app.services import thumbnail_service
+
+    original = io.BytesIO()
+    Image.new("RGB", (1600, 1200), (200, 40, 40)).save(original, "JPEG")
+
+    async def handler(request):
+        upstream.append(str(request.url))
+        return httpx.Response(200, content=original.getvalue(), headers={"Content-Type": "image/jpeg"})
+
+    monkeypatch.setattr(thumbnail_service, "THUMBNAIL_DIR", str(tmp_path / "thumbnails"))
+    monkeypatch.setattr(media_proxy_service, "get_http_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    client = TestClient(app)
+    url = thumbnail_service.thumbnail_url("https://img.example.com/big.jpg")
+    first = client.get(url)
+    second = client.get(url)
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert max(Image.open(io.BytesIO(first.content)).size) == thumbnail_service.THUMBNAIL_SIZE
+    assert len(first.content) < len(original.getvalue())
+    assert len(upstream) == 1
+
+
+def test_thumbnail_falls_back_to_proxy_when_image_cannot_be_rendered(upstream):
+    from app.services import thumbnail_service
+
+    client = TestClient(app)
+    url = thumbnail_service.thumbnail_url("https://img.example.com/missing.jpg")
+    response = client.get(url, follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"].startswith("/api/items/download-proxy?url=https%3A%2F%2Fimg.example.com")
+
+
+def test_thumbnail_fetch_sends_the_source_referer(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    import io
+    from app.services import thumbnail_service
+
+    original = io.BytesIO()
+    Image.new("RGB", (640, 480), (40, 40, 200)).save(original, "JPEG")
+    referers = []
+
+    async def handler(request):
+        referers.append(request.headers.get("referer"))
+        return httpx.Response(200, content=original.getvalue(), headers={"Content-Type": "image/jpeg"})
+
+    monkeypatch.setattr(media_proxy_service, "_cache", MediaCache(str(tmp_path / "cache"), 10 * 1024 * 1024))
+    monkeypatch.setattr(thumbnail_service, "THUMBNAIL_DIR", str(tmp_path / "thumbnails"))
+    monkeypatch.setattr(media_proxy_service, "get_http_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    url = thumbnail_service.thumbnail_url("https://scontent.cdninstagram.com/v/photo.jpg", "instagram")
+    assert TestClient(app).get(url).status_code == 200
+    assert referers == ["https://www.instagram.com/"]
+
+
+def test_thumbnail_only_renders_signed_urls(upstream):
+    from app.services import thumbnail_service
+
+    client = TestClient(app)
+    signed = thumbnail_service.thumbnail_url("https://img.example.com/a.jpg")
+    forged = signed.replace("a.jpg", "b.jpg")
+
+    assert client.get("/api/items/thumbnail", params={"url": "https://img.example.com/a.jpg"}).status_code == 403
+    assert client.get(forged).status_code == 403
+    assert upstream == []
+
+
+def test_thumbnail_source_download_stops_at_the_size_limit(monkeypatch):
+    from app.services import thumbnail_service
+
+    sent = []
+
+    def chunks():
+        for _ in range(100):
+            sent.append(1)
+            yield b"x" * 1024
+
+    def handler(request):
+        return httpx.Response(200, content=chunks(), headers={"Content-Type": "image/jpeg"})
+
+    monkeypatch.setattr(thumbnail_service, "MAX_SOURCE_BYTES", 10 * 1024)
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    assert thumbnail_service.generate_thumbnail("https://img.example.com/endless.jpg", client) is None
+    assert len(sent) < 100
@@ -4,6 +4,8 @@ from datetime import datetime, timedelta, timezone
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 # Add backend to path
 sys.path.append(os.path.join(os.getcwd(), 'backend'))
@@ -14,8 +16,8 @@ os.environ["REDIS_URL"] = "redis://localhost:6379/0"
 os.environ["SECRET_KEY"] = "testsecretkey"
 
 from app.main import app
-from app.database import Base, get_db
-from app.auth import get_password_hash, create_access_token
+from app.database import Base, get_db, get_async_db
+from app.auth import get_password_hash, create_access_token, invalidate_cached_user
 from app.models.user import User
 from app.models.source import Source
 from app.models.item import Item
@@ -25,6 +27,7 @@ from app.models.queue import Queue
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test_multitenancy.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine("sqlite+aiosqlite:///./test_multitenancy.db", poolclass=NullPool)
 
 def override_get_db():
     try:
@@ -33,13 +36,19 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    async with async_sessionmaker(async_engine, expire_on_commit=False)() as db:
+        yield db
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 client = TestClient(app)
 
 def setup_db():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    invalidate_cached_user()
     db = TestingSessionLocal()
     
     # Create Admin
@@ -0,0 +1,184 @@
+import sys
+import os
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from app.database import Base
+from app.models import Source, Item, User, Duplicate
+from worker.tasks import processing
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = factory()
+    user = User(username="editor", hashed_password="x", role="editor")
+    db.add(user)
+    db.commit()
+    db.add(Source(name="Board", type="generic_board", base_url="https://example.com", user_id=user.id))
+    db.commit()
+    db.close()
+
+    monkeypatch.setattr(processing, "SessionLocal", factory)
+    return factory
+
+
+def test_ingest_items_bulk_inserts_and_dispatches_one_batch(session_factory, monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(processing.dedup_classify_summarize_batch, "delay", lambda ids: dispatched.append(ids))
+
+    items_data = [
+        {"title": f"Post {n}", "url": f"https://example.com/{n}", "raw_text": f"body {n}",
+         "published_at": datetime(2026, 1, n + 1)}
+        for n in range(3)
+    ]
+    items_data.append(dict(items_data[0]))  # Same URL twice in one collection
+
+    result = processing.ingest_items.run(1, items_data)
+    assert result["inserted"] == 3
+    assert len(dispatched) == 1 and len(dispatched[0]) == 3
+
+    # Re-ingesting the same URLs conflicts on (user_id, hash_url) and inserts nothing
+    result = processing.ingest_items.run(1, items_data[:2])
+    assert result["inserted"] == 0
+
+    db = session_factory()
+    items = db.query(Item).all()
+    assert len(items) == 3
+    assert all(item.user_id is not None and item.status == "collected" for item in items)
+
+    # Searchable before processing, through the owner's postings only
+    from app.services import search_service
+    owner = items[0].user_id
+    matches = search_service.search_subquery("Post 1", owner)
+    assert [row.item_id for row in db.execute(matches.select())] == [items[1].id]
+    assert list(db.execute(search_service.search_subquery("Post 1", owner + 1).select())) == []
+    db.close()
+
+
+def test_batch_processing_dedups_within_batch(session_factory):
+    db = session_factory()
+    for n in range(2):
+        db.add(Item(source_id=1, user_id=1, title="울산 축제 안내", url=f"https://example.com/{n}",
+                    raw_text="중구 문화 축제가 열립니다. 시민 여러분의 참여를 바랍니다.",
+                    hash_url=str(n), hash_content="same", status="collected"))
+    db.commit()
+    ids = [item.id for item in db.query(Item).all()]
+    db.close()
+
+    result = processing.dedup_classify_summarize_batch.run(ids)
+    assert result == {"processed": 2, "failed": [], "deferred": []}
+
+    db = session_factory()
+    first, second = db.query(Item).order_by(Item.id).all()
+    assert first.status == "collected" and first.summary_text
+    assert second.status == "duplicate"
+    assert db.query(Duplicate).filter(Duplicate.item_id == second.id).count() == 1
+    db.close()
+
+
+def test_batch_commits_finished_items_and_defers_the_rest_on_soft_time_limit(session_factory, monkeypatch):
+    from celery.exceptions import SoftTimeLimitExceeded
+
+    db = session_factory()
+    for n in range(3):
+        db.add(Item(source_id=1, user_id=1, title=f"공지 {n}", url=f"https://example.com/{n}",
+                    raw_text=f"{n}번째 공지 내용입니다.", hash_url=str(n), status="collected"))
+    db.commit()
+    ids = [item.id for item in db.query(Item).order_by(Item.id).all()]
+    db.close()
+
+    process_item = processing._process_item
+
+    def slow_second_item(db, item, **kwargs):
+        if item.id == ids[1]:
+            raise SoftTimeLimitExceeded()
+        return process_item(db, item, **kwargs)
+
+    dispatched = []
+    monkeypatch.setattr(processing, "_process_item", slow_second_item)
+    monkeypatch.setattr(processing.dedup_classify_summarize_batch, "delay", lambda ids: dispatched.append(ids))
+
+    result = processing.dedup_classify_summarize_batch.run(ids)
+    assert result == {"processed": 1, "failed": [], "deferred": ids[1:]}
+    assert dispatched == [ids[1:]]
+
+    db = session_factory()
+    assert db.query(Item).filter(Item.id == ids[0]).one().summary_text
+    assert db.query(Item).filter(Item.id == ids[1]).one().summary_text is None
+    db.close()
+
+
+def test_identical_text_reuses_cached_analysis(session_factory, monkeypatch):
+    calls = []
+
+    def fake_summarize(text):
+        calls.append(text)
+        return "요약", "llm:test-model"
+
+    monkeypatch.setattr(processing, "summary_mode_key", lambda: "llm:test-model")
+    monkeypatch.setattr(processing, "summarize_with_mode", fake_summarize)
+
+    db = session_factory()
+    for n, title in enumerate(["남구 축제 안내", "남구 축제 안내", "[공유] 남구 축제 안내"]):
+        db.add(Item(source_id=1, user_id=1, title=title, url=f"https://example.com/{n}",
+                    raw_text="남구 문화 축제가 열립니다.", hash_url=str(n), hash_content="same",
+                    status="collected"))
+    db.commit()
+    ids = [item.id for item in db.query(Item).order_by(Item.id).all()]
+    db.close()
+
+    for item_id in ids:
+        processing.dedup_classify_summarize.run(item_id)
+
+    assert len(calls) == 1
+
+    db = session_factory()
+    items = db.query(Item).order_by(Item.id).all()
+    assert all(item.summary_text == "요약" for item in items)
+    assert items[0].category == items[1].category and items[0].tags == items[1].tags
+    db.close()
+
+
+def test_llm_mode_batch_defers_summaries_to_summarize_items(session_factory, monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(processing, "summary_mode_key", lambda: "llm:test-model")
+    monkeypatch.setattr(processing.summarize_items, "delay", lambda ids: dispatched.append(ids))
+    monkeypatch.setattr(processing, "summarize_many", lambda texts: [("LLM 요약", "llm:test-model") for _ in texts])
+
+    db = session_factory()
+    for n in range(3):
+        db.add(Item(source_id=1, user_id=1, title=f"공지 {n}", url=f"https://example.com/{n}",
+                    raw_text=f"{n}번째 공지 내용입니다. 자세한 사항은 문의 바랍니다.",
+                    hash_url=str(n), hash_content=f"hash-{n}", status="collected"))
+    db.commit()
+    ids = [item.id for item in db.query(Item).order_by(Item.id).all()]
+    db.close()
+
+    processing.dedup_classify_summarize_batch.run(ids)
+    assert dispatched == [ids]
+
+    db = session_factory()
+    assert all(item.summary_text.startswith(f"{n}번째") for n, item in enumerate(db.query(Item).order_by(Item.id)))
+    db.close()
+
+    result = processing.summarize_items.run(ids)
+    assert result == {"summarized": 3, "llm": 3, "fallback": 0}
+
+    db = session_factory()
+    assert all(item.summary_text == "LLM 요약" for item in db.query(Item).all())
+    db.close()
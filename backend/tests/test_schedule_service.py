@@ -0,0 +1,71 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from app.database import Base
+from app.models import Source, User
+from app.services.schedule_service import select_due_sources, compute_next_due_at
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_select_due_sources_skips_future_disabled_and_expired(db):
+    now = datetime.now(timezone.utc)
+    active = User(username="active", hashed_password="x")
+    expired = User(username="expired", hashed_password="x", expires_at=now - timedelta(days=1))
+    db.add_all([active, expired])
+    db.commit()
+
+    def add_source(name, user, enabled=True, next_due_at=None):
+        db.add(Source(name=name, type="rss", base_url=f"https://{name}.example.com",
+                      enabled=enabled, next_due_at=next_due_at, user_id=user.id))
+
+    add_source("never", active)
+    add_source("due", active, next_due_at=now - timedelta(minutes=1))
+    add_source("later", active, next_due_at=now + timedelta(minutes=30))
+    add_source("disabled", active, enabled=False)
+    add_source("expired", expired, next_due_at=now - timedelta(minutes=1))
+    db.commit()
+
+    assert {source.name for source in select_due_sources(db, now)} == {"never", "due"}
+    assert {source.name for source in select_due_sources(db, now, force=True)} == {"never", "due", "later"}
+
+
+def test_select_due_sources_puts_never_collected_first_when_limited(db):
+    now = datetime.now(timezone.utc)
+    user = User(username="active", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    for n in range(3):
+        db.add(Source(name=f"overdue{n}", type="rss", base_url=f"https://overdue{n}.example.com",
+                      enabled=True, next_due_at=now - timedelta(hours=n + 1), user_id=user.id))
+    db.add(Source(name="new", type="rss", base_url="https://new.example.com", enabled=True, user_id=user.id))
+    db.commit()
+
+    assert [source.name for source in select_due_sources(db, now, limit=2)] == ["new", "overdue2"]
+
+
+def test_compute_next_due_at():
+    collected = datetime(2026, 1, 1, 9, 0)
+    source = Source(name="s", type="rss", base_url="https://example.com", collect_interval=30)
+    assert compute_next_due_at(source) is None
+    assert compute_next_due_at(source, collected) == datetime(2026, 1, 1, 9, 30, tzinfo=timezone.utc)
@@ -0,0 +1,140 @@
+import sys
+import os
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from app.database import Base
+from app.models import Item, Source, User
+from app.services import stats_service
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands the counters use (TTLs ignored)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = str(value)
+
+    def expire(self, key, seconds):
+        pass
+
+    def incrby(self, key, amount):
+        self.data[key] = str(int(self.data.get(key, 0)) + amount)
+
+    def hincrby(self, key, field, amount):
+        hash_ = self.data.setdefault(key, {})
+        hash_[field] = str(int(hash_.get(field, 0)) + amount)
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({field: str(value) for field, value in mapping.items()})
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def owner(db):
+    user = User(username="owner", hashed_password="x")
+    db.add(user)
+    db.commit()
+    db.add(Source(id=1, name="src", type="rss", base_url="https://example.com", user_id=user.id))
+    db.commit()
+    return user
+
+
+def add_item(db, owner, status="collected", hours_ago=1):
+    item = Item(source_id=1, title="t", url=f"https://example.com/{db.query(Item).count()}",
+                hash_url=f"h{db.query(Item).count()}", status=status, user_id=owner.id,
+                collected_at=datetime.utcnow() - timedelta(hours=hours_ago))
+    db.add(item)
+    db.commit()
+    return item
+
+
+def test_counters_rebuild_from_db_then_update_incrementally(db, owner, monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(stats_service, "_redis", lambda: redis)
+    add_item(db, owner)
+    add_item(db, owner, status="failed")
+    add_item(db, owner, hours_ago=30)
+
+    stats = stats_service.get_dashboard_stats(db, owner.id)
+    assert stats["collected_today"] == 2
+    assert stats["failed"] == 1
+    assert stats["by_status"]["collected"] == 2
+    hour = stats_service._bucket(datetime.utcnow() - timedelta(hours=1))
+    assert redis.data[f"stats:collected:user:{owner.id}:{hour}"] == "2"
+
+    # Later changes are counted without touching the DB
+    stats_service.record_collected(owner.id, 3)
+    stats_service.record_status_change(owner.id, "collected", "duplicate")
+    stats = stats_service.get_dashboard_stats(db, owner.id)
+    assert stats["collected_today"] == 5
+    assert stats["by_status"]["collected"] == 4
+    assert stats["by_status"]["duplicate"] == 1
+
+    # Admin scope aggregates every user
+    assert stats_service.get_dashboard_stats(db, None)["failed"] == 1
+
+    # Invalidation recounts from the DB
+    stats_service.invalidate(owner.id)
+    assert stats_service.get_dashboard_stats(db, owner.id)["collected_today"] == 2
+
+
+def test_counters_fall_back_to_db_when_redis_is_down(db, owner, monkeypatch):
+    def unavailable():
+        raise ConnectionError("redis down")
+    monkeypatch.setattr(stats_service, "_redis", unavailable)
+    add_item(db, owner)
+    add_item(db, owner, status="failed", hours_ago=48)
+
+    stats_service.record_collected(owner.id)
+    stats = stats_service.get_dashboard_stats(db, owner.id)
+    assert stats["collected_today"] == 1
+    assert stats["failed"] == 1
@@ -0,0 +1,166 @@
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from app.services.summarize_service import split_sentences, extractive_summarize
+
+
+def test_split_sentences_handles_korean_endings():
+    text = "축제가 열립니다.많은 참여 바랍니다. 참가비는 3.5만원이에요!일정은 홈페이지 참고 바랍니다\n접수 기간은 이번 주까지임. 문의: www.ulsan.go.kr 로 해주세요"
+    assert list(split_sentences(text)) == [
+        "축제가 열립니다.",
+        "많은 참여 바랍니다.",
+        "참가비는 3.5만원이에요!",
+        "일정은 홈페이지 참고 바랍니다",
+        "접수 기간은 이번 주까지임.",
+        "문의: www.ulsan.go.kr 로 해주세요",
+    ]
+
+
+def test_split_sentences_skips_short_fragments_and_stops_early():
+    text = "안내. 첫 번째 문장입니다. 두 번째 문장입니다. 세 번째 문장입니다. 네 번째 문장입니다."
+    sentences = split_sentences(text, max_sentences=2)
+    assert next(sentences) == "첫 번째 문장입니다."
+    assert next(sentences) == "두 번째 문장입니다."
+    assert list(sentences) == []
+
+    assert extractive_summarize(text) == "첫 번째 문장입니다. 두 번째 문장입니다. 세 번째 문장입니다."
+    assert extractive_summarize("") == ""
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    async def create(self, model, messages, max_tokens, temperature):
+        import asyncio
+        import httpx
+        import openai
+        from types import SimpleNamespace
+
+        self.calls += 1
+        text = messages[-1]["content"]
+        if "실패" in text:
+            raise openai.BadRequestError("bad", response=httpx.Response(400, request=httpx.Request("POST", "https://x")), body=None)
+        if "재시도" in text and self.calls == 1:
+            raise openai.RateLimitError("slow down", response=httpx.Response(429, request=httpx.Request("POST", "https://x")), body=None)
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" LLM 요약 "))])
+
+
+def use_fake_openai(monkeypatch):
+    import openai
+    from types import SimpleNamespace
+    from app.services import summarize_service
+
+    completions = FakeCompletions()
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            self.chat = SimpleNamespace(completions=completions)
+
+        async def close(self):
+            pass
+
+    def redis_down():
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(openai, "AsyncOpenAI", FakeClient)
+    monkeypatch.setattr(summarize_service, "_redis", redis_down)
+    monkeypatch.setattr(summarize_service, "_budget", None)
+    monkeypatch.setattr(summarize_service.random, "uniform", lambda a, b: 0)
+    monkeypatch.setattr(summarize_service.settings, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(summarize_service.settings, "SUMMARY_LLM_MODEL", "test-model")
+    return completions
+
+
+def test_summarize_many_caps_concurrency_retries_and_falls_back(monkeypatch):
+    from app.services import summarize_service
+
+    completions = use_fake_openai(monkeypatch)
+    monkeypatch.setattr(summarize_service.settings, "SUMMARY_LLM_CONCURRENCY", 2)
+
+    texts = ["재시도가 필요한 글입니다."] + [f"{n}번째 글입니다." for n in range(5)] + ["요청이 실패하는 글입니다.", ""]
+    results = summarize_service.summarize_many(texts)
+
+    assert results[0] == ("LLM 요약", "llm:test-model")
+    assert all(result == ("LLM 요약", "llm:test-model") for result in results[1:6])
+    assert results[6] == ("요청이 실패하는 글입니다.", "rule")
+    assert results[7] == ("", "rule")
+    assert completions.max_active == 2
+
+
+def test_token_budget_carries_over_between_summarize_many_calls(monkeypatch):
+    from app.services import summarize_service
+    from app.services.summarize_service import TokenBudget
+
+    use_fake_openai(monkeypatch)
+    long_text = "긴 글입니다. " * 8000
+    short_text = "짧은 글입니다."
+    monkeypatch.setattr(summarize_service.settings, "SUMMARY_LLM_MAX_INPUT_CHARS", len(long_text))
+
+    def estimate(text):
+        return summarize_service.estimate_tokens(summarize_service._summary_messages(text, 200))
+
+    # The first call leaves less than the second one needs; the rest refills within a fraction of a second
+    monkeypatch.setattr(summarize_service.settings, "SUMMARY_LLM_TOKENS_PER_MINUTE", estimate(long_text) + estimate(short_text) // 2)
+
+    delays = []
+    reserve = TokenBudget.reserve
+
+    def recording_reserve(self, tokens):
+        delays.append(reserve(self, tokens))
+        return delays[-1]
+
+    monkeypatch.setattr(TokenBudget, "reserve", recording_reserve)
+
+    assert summarize_service.summarize_many([long_text])[0][1] == "llm:test-model"
+    assert delays == [0]
+    assert summarize_service.summarize_many([short_text]) == [("LLM 요약", "llm:test-model")]
+    assert delays[1] > 0
+    assert delays[-1] == 0
+
+
+def test_single_llm_summary_draws_from_the_shared_budget(monkeypatch):
+    import openai
+    from types import SimpleNamespace
+    from app.services import summarize_service
+    from app.services.summarize_service import TokenBudget
+
+    use_fake_openai(monkeypatch)
+    reply = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="요약"))])
+    monkeypatch.setattr(openai, "chat", SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: reply)))
+
+    reserved = []
+    reserve = TokenBudget.reserve
+
+    def recording_reserve(self, tokens):
+        reserved.append(tokens)
+        return reserve(self, tokens)
+
+    monkeypatch.setattr(TokenBudget, "reserve", recording_reserve)
+
+    assert summarize_service.summarize_with_mode("울산 소식입니다.", "llm") == ("요약", "llm:test-model")
+    assert reserved == [summarize_service.estimate_tokens(summarize_service._summary_messages("울산 소식입니다.", 200))]
+
+
+def test_summarize_many_without_api_key_is_extractive(monkeypatch):
+    from app.services import summarize_service
+
+    monkeypatch.setattr(summarize_service.settings, "OPENAI_API_KEY", None)
+    assert summarize_service.summarize_many(["첫 번째 문장입니다. 두 번째 문장입니다."]) == [
+        ("첫 번째 문장입니다. 두 번째 문장입니다.", "rule")
+    ]
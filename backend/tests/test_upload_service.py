@@ -0,0 +1,67 @@
+import sys
+import os
+import io
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set dummy environment variables for Pydantic Settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_multitenancy.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "testsecretkey")
+
+from app.main import app
+from app.config import settings
+from app.services import upload_service
+
+
+def image_bytes():
+    try:
+        from PIL import Image
+    except ImportError:
+        # Without Pillow, uploads are not probed and any bytes are stored
+        return b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), (10, 20, 30)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_service, "UPLOAD_DIR", str(tmp_path))
+    return TestClient(app)
+
+
+def upload(client, content, name="photo.png"):
+    return client.post("/api/upload/image", files={"file": (name, content, "image/png")})
+
+
+def test_identical_uploads_share_one_file(client, tmp_path):
+    content = image_bytes()
+    first = upload(client, content)
+    second = upload(client, content, name="copy.png")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["url"] == second.json()["url"]
+    assert first.json()["url"].startswith("/static/uploads/")
+    assert first.json()["deduplicated"] is False
+    assert second.json()["deduplicated"] is True
+    stored = [name for _, _, files in os.walk(tmp_path) for name in files]
+    assert stored == [first.json()["filename"]]
+
+
+def test_oversized_upload_is_rejected_without_leftovers(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1024)
+    response = upload(client, b"\x00" * 4096)
+    assert response.status_code == 413
+    assert [name for _, _, files in os.walk(tmp_path) for name in files] == []
+
+
+def test_image_dimensions_are_probed(client):
+    pytest.importorskip("PIL")
+    response = upload(client, image_bytes())
+    assert (response.json()["width"], response.json()["height"]) == (40, 30)
+    assert response.json()["filename"].endswith(".png")
+    assert upload(client, b"not an image at all").status_code == 400
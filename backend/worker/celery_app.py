@@ -1,4 +1,6 @@
 from celery import Celery
+from kombu import Queue
+from celery.signals import worker_process_shutdown
 from app.config import settings
 
 # Create Celery app
@@ -26,6 +28,43 @@ celery_app.conf.update(
     ]
 )
 
+# Queues: cheap board collections and dedup work must not wait behind
+# Playwright collections or LLM calls. A worker started without -Q consumes
+# all of them; production runs one worker pool per queue (infra/docker-compose.yml).
+TASK_QUEUES = {
+    # queue: (soft time limit, hard time limit) in seconds
+    'collect': (10 * 60, 12 * 60),
+    'ingest': (2 * 60, 3 * 60),
+    'process': (10 * 60, 12 * 60),
+    'llm': (25 * 60, 30 * 60),
+}
+
+TASK_ROUTES = {
+    # The beat fan-out only queries due sources and dispatches; keep it off the
+    # collect queue so a tick never waits behind long Playwright collections
+    'worker.tasks.collection.collect_all_sources': 'ingest',
+    'worker.tasks.collection.collect_source': 'collect',
+    'worker.tasks.collection.save_page_validators': 'ingest',
+    'worker.tasks.processing.ingest_items': 'ingest',
+    'worker.tasks.processing.parse_and_store': 'ingest',
+    'worker.tasks.processing.dedup_classify_summarize': 'process',
+    'worker.tasks.processing.dedup_classify_summarize_batch': 'process',
+    'worker.tasks.processing.summarize_items': 'llm',
+    # Image downloads are network-bound like collections
+    'worker.tasks.processing.generate_thumbnails': 'collect',
+}
+
+celery_app.conf.update(
+    task_queues=[Queue('celery')] + [Queue(name) for name in TASK_QUEUES],
+    task_default_queue='celery',
+    task_routes={task: {'queue': queue} for task, queue in TASK_ROUTES.items()},
+    task_annotations={
+        task: {'soft_time_limit': TASK_QUEUES[queue][0], 'time_limit': TASK_QUEUES[queue][1]}
+        for task, queue in TASK_ROUTES.items()
+    },
+    worker_prefetch_multiplier=1,  # Long tasks; raise per worker with --prefetch-multiplier
+)
+
 # Auto-discover tasks via the include list above
 # celery_app.autodiscover_tasks(['worker.tasks.collection', 'worker.tasks.processing'])
 
@@ -36,3 +75,10 @@ celery_app.conf.beat_schedule = {
         'schedule': 300.0,  # Every 5 minutes (300 seconds)
     },
 }
+
+
+@worker_process_shutdown.connect
+def close_browser_pools(**kwargs):
+    """Prefork children may exit without running atexit handlers"""
+    from connectors.browser_pool import shutdown_browser_pools
+    shutdown_browser_pools()
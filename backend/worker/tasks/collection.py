@@ -1,10 +1,12 @@
 from worker.celery_app import celery_app
 from app.database import SessionLocal
 from app.models.source import Source
-from app.models.item import Item
 from connectors.factory import get_connector
-from app.services.dedup_service import generate_url_hash, generate_content_hash
-from worker.tasks.processing import parse_and_store
+from app.services.dedup_service import generate_url_hash, generate_content_hash, find_existing_url_hashes, find_existing_source_item_ids
+from app.services.schedule_service import select_due_sources, compute_next_due_at
+from worker.tasks.processing import ingest_items
+from connectors.page_cache import PageValidatorStore
+from connectors.rate_limiter import RateLimitExceeded
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,45 +17,24 @@ def collect_all_sources(self, force=False):
     """Collect from all enabled sources belonging to active users"""
     db = SessionLocal()
     try:
-        from app.models.user import User
         from datetime import datetime, timezone, timedelta
         now = datetime.now(timezone.utc)
         
-        # Filter sources that are enabled AND whose owners are not expired
-        sources = db.query(Source).join(User, Source.user_id == User.id).filter(
-            Source.enabled == True
-        ).all()
+        # Only due sources of active owners, in one joined query
+        sources = select_due_sources(db, now, force=force)
         
         triggered_count = 0
         for source in sources:
             try:
-                # Check owner expiration again (just in case query join was complex)
-                owner = db.query(User).filter(User.id == source.user_id).first()
-                if owner and owner.expires_at:
-                    expires_at = owner.expires_at
-                    if expires_at.tzinfo is None:
-                        expires_at = expires_at.replace(tzinfo=timezone.utc)
-                    if now > expires_at:
-                        logger.info(f"Skipping source {source.name} because owner {owner.username} is expired")
-                        continue
-
-                # Check if it's time to collect
-                should_collect = True
-                if source.last_collected_at:
-                    last_col = source.last_collected_at
-                    if last_col.tzinfo is None:
-                        last_col = last_col.replace(tzinfo=timezone.utc)
-                    
-                    if now < last_col + timedelta(minutes=source.collect_interval):
-                        should_collect = False
-                
-                if force or should_collect:
-                    collect_source.delay(source.id)
-                    triggered_count += 1
-                    logger.info(f"Triggered {'FORCED ' if force else ''}collection for {source.name}")
+                collect_source.delay(source.id)
+                # Claim the slot so a slow collection is not dispatched again on the next tick
+                source.next_due_at = now + timedelta(minutes=source.collect_interval or 60)
+                triggered_count += 1
+                logger.info(f"Triggered {'FORCED ' if force else ''}collection for {source.name}")
             except Exception as e:
-                logger.error(f"Failed to check/trigger collection for source {source.id}: {e}")
+                logger.error(f"Failed to trigger collection for source {source.id}: {e}")
         
+        db.commit()
         return {"message": f"Triggered collection for {triggered_count} sources"}
     finally:
         db.close()
@@ -81,7 +62,7 @@ def collect_source(self, source_id: int):
             if now > expires_at:
                 logger.warning(f"Aborting collection for source {source.name}: owner {owner.username} is expired")
                 return {"message": "Owner expired"}
-
+        
         if not source.enabled:
             logger.info(f"Source {source_id} is disabled, skipping")
             return {"message": "Source disabled"}
@@ -94,9 +75,26 @@ def collect_source(self, source_id: int):
             logger.error(f"No connector found for source {source_id}")
             return {"error": "No connector available"}
         
+        # Incremental mode: let the connector skip detail fetches for items we already have,
+        # looking up only the entries of each list page it fetches
+        connector.set_known_lookup(lambda url_hashes, source_item_ids: (
+            find_existing_url_hashes(db, url_hashes, source_id=source_id),
+            find_existing_source_item_ids(db, source_id, source_item_ids)
+        ))
+        
         # Fetch items
         items_data = connector.fetch_list()
-        logger.info(f"Fetched {len(items_data)} items from {source.name}")
+        
+        # List page unchanged since the last collection (304 or same content digest)
+        if connector.not_modified:
+            from datetime import datetime, timezone
+            source.last_collected_at = datetime.now(timezone.utc)
+            source.next_due_at = compute_next_due_at(source)
+            db.commit()
+            logger.info(f"Source {source.name} unchanged since last collection, skipping")
+            return {"message": "Source unchanged", "total_fetched": 0}
+        
+        logger.info(f"Fetched {len(items_data)} items from {source.name} (skipped {connector.skipped_known} known items)")
         
         
         new_count = 0
@@ -104,6 +102,7 @@ def collect_source(self, source_id: int):
         from datetime import datetime, timezone, timedelta
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=10)
         
+        candidates = []
         for item_data in items_data:
             # Skip items older than 10 days (if date is available)
             pub_date = item_data.get('published_at')
@@ -115,33 +114,62 @@ def collect_source(self, source_id: int):
                     logger.debug(f"Skipping old item: {item_data['title']} ({item_data['published_at']})")
                     continue
             
-            # Check if already exists by URL
-            url_hash = generate_url_hash(item_data['url'])
-            existing = db.query(Item).filter(Item.hash_url == url_hash).first()
-            
-            if existing:
+            candidates.append((generate_url_hash(item_data['url']), item_data))
+        
+        # Check which URLs already exist with a single query
+        seen_hashes = find_existing_url_hashes(db, [url_hash for url_hash, _ in candidates])
+        
+        new_items = []
+        for url_hash, item_data in candidates:
+            if url_hash in seen_hashes:
                 logger.debug(f"Item already exists: {item_data['url']}")
                 continue
-            
-            # Parse and store
-            parse_and_store.delay(source_id, item_data)
-            new_count += 1
+            # Also drops repeated URLs within the same list
+            seen_hashes.add(url_hash)
+            new_items.append(item_data)
+        
+        # Parse and store all new items with a single ingestion task. List page
+        # validators are saved only once ingestion succeeded: until then the next
+        # collection must still see the page as changed.
+        if new_items:
+            ingest_items.apply_async(
+                (source_id, new_items),
+                link=save_page_validators.si(connector.pending_validators())
+            )
+        else:
+            connector.commit_validators()
+        new_count = len(new_items)
         
-        # Update last_collected_at
+        # Update last_collected_at and schedule the next run
         from datetime import datetime, timezone
         source.last_collected_at = datetime.now(timezone.utc)
+        source.next_due_at = compute_next_due_at(source)
         db.commit()
         
         logger.info(f"Found {new_count} new items from {source.name} (skipped {skipped_old} old items)")
         return {
             "message": f"Collected {new_count} new items", 
             "total_fetched": len(items_data),
+            "skipped_known": connector.skipped_known,
             "skipped_old": skipped_old
         }
-
-        
+    
+    
+    except RateLimitExceeded as e:
+        # Nothing was sent; try again once the host's bucket or penalty has cleared
+        logger.warning(f"Collection from source {source_id} rescheduled: {e}")
+        raise self.retry(exc=e, countdown=max(60, int(e.retry_after) + 1))
     except Exception as e:
         logger.error(f"Error collecting from source {source_id}: {e}")
         raise self.retry(exc=e, countdown=60)
     finally:
         db.close()
+
+
+@celery_app.task(name='worker.tasks.collection.save_page_validators')
+def save_page_validators(validators: list):
+    """Remember list page validators (linked to ingest_items, so it runs after the items are stored)"""
+    store = PageValidatorStore()
+    for url, etag, last_modified, digest in validators:
+        store.save(url, etag, last_modified, digest)
+    return {"saved": len(validators)}
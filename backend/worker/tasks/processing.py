@@ -1,18 +1,114 @@
+from celery.exceptions import SoftTimeLimitExceeded
 from worker.celery_app import celery_app
+from app.config import settings
 from app.database import SessionLocal
 from app.models.item import Item
 from app.services.dedup_service import generate_url_hash, generate_content_hash, process_deduplication
+from app.services.simhash_service import item_simhash
 from app.services.classify_service import classify_item
-from app.services.summarize_service import summarize_content
+from app.services import search_service, stats_service
+from app.services.summarize_service import summarize_with_mode, summary_mode_key, summarize_many, extractive_summarize
+from app.services.analysis_cache_service import get_cached_analysis, store_analysis, generate_title_hash
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _insert_items_ignoring_conflicts(db, rows: list) -> list:
+    """
+    Bulk insert item rows in one statement, skipping rows that hit a unique index
+    Returns ids of the inserted rows
+    """
+    dialect = db.bind.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        # No ON CONFLICT support; fall back to one savepoint per row
+        from sqlalchemy.exc import IntegrityError
+        item_ids = []
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    new_item = Item(**row)
+                    db.add(new_item)
+                item_ids.append(new_item.id)
+            except IntegrityError:
+                continue
+        return item_ids
+    
+    stmt = insert(Item).values(rows).on_conflict_do_nothing().returning(Item.id)
+    return [row[0] for row in db.execute(stmt)]
+
+
+@celery_app.task(name='worker.tasks.processing.ingest_items', bind=True, max_retries=3)
+def ingest_items(self, source_id: int, items_data: list):
+    """Store all new items of a collection in one transaction and process them as a batch"""
+    db = SessionLocal()
+    try:
+        # Get source to assign user_id
+        from app.models.source import Source
+        source = db.query(Source).filter(Source.id == source_id).first()
+        user_id = source.user_id if source else None
+        
+        rows = []
+        seen_hashes = set()
+        for item_data in items_data:
+            url_hash = generate_url_hash(item_data['url'])
+            if url_hash in seen_hashes:
+                continue
+            seen_hashes.add(url_hash)
+            rows.append({
+                'source_id': source_id,
+                'source_item_id': item_data.get('source_item_id'),
+                'title': item_data['title'],
+                'published_at': item_data.get('published_at'),
+                'url': item_data['url'],
+                'raw_text': item_data.get('raw_text'),
+                'hash_url': url_hash,
+                'hash_content': generate_content_hash(item_data.get('raw_text') or ''),
+                'simhash': item_simhash(item_data['title'], item_data.get('raw_text')),
+                'image_urls': item_data.get('image_urls', []),
+                'meta_json': item_data.get('meta_json', {}),
+                'status': 'collected',
+                'score_priority': 0,
+                'user_id': user_id
+            })
+        
+        if not rows:
+            return {"inserted": 0, "skipped": 0}
+        
+        item_ids = _insert_items_ignoring_conflicts(db, rows)
+        # Searchable right away; processing re-indexes once the summary exists
+        search_service.index_new_items(db, item_ids)
+        db.commit()
+        stats_service.record_collected(user_id, len(item_ids))
+        
+        logger.info(f"Stored {len(item_ids)} new items for source {source_id} ({len(rows) - len(item_ids)} already existed)")
+        
+        # Trigger processing for the whole batch
+        if item_ids:
+            dedup_classify_summarize_batch.delay(item_ids)
+        
+        return {"inserted": len(item_ids), "skipped": len(rows) - len(item_ids), "item_ids": item_ids}
+    
+    except Exception as e:
+        logger.error(f"Error ingesting items for source {source_id}: {e}")
+        db.rollback()
+        raise self.retry(exc=e, countdown=30)
+    finally:
+        db.close()
+
+
 @celery_app.task(name='worker.tasks.processing.parse_and_store', bind=True, max_retries=3)
 def parse_and_store(self, source_id: int, item_data: dict):
-    """Parse item data and store in database"""
+    """
+    Parse item data and store in database
+    
+    Single-item variant of ingest_items, kept for messages queued before batch ingestion.
+    """
     db = SessionLocal()
     try:
         # Generate hashes
@@ -23,7 +119,7 @@ def parse_and_store(self, source_id: int, item_data: dict):
         from app.models.source import Source
         source = db.query(Source).filter(Source.id == source_id).first()
         user_id = source.user_id if source else None
-
+        
         # Create item
         new_item = Item(
             source_id=source_id,
@@ -34,6 +130,7 @@ def parse_and_store(self, source_id: int, item_data: dict):
             raw_text=item_data.get('raw_text'),
             hash_url=url_hash,
             hash_content=content_hash,
+            simhash=item_simhash(item_data['title'], item_data.get('raw_text')),
             image_urls=item_data.get('image_urls', []),
             meta_json=item_data.get('meta_json', {}),
             status='collected',
@@ -41,8 +138,11 @@ def parse_and_store(self, source_id: int, item_data: dict):
         )
         
         db.add(new_item)
+        db.flush()
+        search_service.index_item(db, new_item)
         db.commit()
         db.refresh(new_item)
+        stats_service.record_collected(user_id)
         
         logger.info(f"Stored new item: {new_item.id} - {new_item.title}")
         
@@ -50,7 +150,7 @@ def parse_and_store(self, source_id: int, item_data: dict):
         dedup_classify_summarize.delay(new_item.id)
         
         return {"item_id": new_item.id, "title": new_item.title}
-        
+    
     except Exception as e:
         logger.error(f"Error parsing and storing item: {e}")
         db.rollback()
@@ -59,6 +159,76 @@ def parse_and_store(self, source_id: int, item_data: dict):
         db.close()
 
 
+def _process_item(db, item: Item, defer_llm: bool = False) -> dict:
+    """
+    Deduplicate, classify and summarize one item (caller commits)
+    With defer_llm, LLM mode stores an extractive summary for now and flags the
+    item so the caller can summarize it with batched LLM calls (summarize_items)
+    """
+    item_id = item.id
+    previous_status = item.status
+    logger.info(f"Processing item {item_id}: {item.title}")
+    
+    # Deduplication
+    dup_count = process_deduplication(db, item)
+    logger.info(f"Found {dup_count} duplicates for item {item_id}")
+    
+    if dup_count > 0:
+        item.status = 'duplicate'
+        logger.info(f"Marked item {item_id} as duplicate")
+    
+    # Identical text (cross-posts, re-collected posts) reuses the earlier analysis
+    needs_llm_summary = False
+    mode_key = summary_mode_key()
+    cached = get_cached_analysis(db, item.hash_content, mode_key) if item.raw_text else None
+    
+    # Classification
+    if cached and cached.title_hash == generate_title_hash(item.title):
+        category, region, tags = cached.category, cached.region, cached.tags
+        logger.info(f"Reused cached classification for item {item_id}")
+    else:
+        category, region, tags = classify_item(item.title, item.raw_text or "")
+    item.category = category
+    item.region = region
+    item.tags = tags
+    logger.info(f"Classified item {item_id}: category={category}, region={region}")
+    
+    # Summarization
+    if item.raw_text:
+        if cached:
+            item.summary_text = cached.summary_text
+            logger.info(f"Reused cached summary for item {item_id}")
+        elif defer_llm and mode_key != "rule":
+            item.summary_text = extractive_summarize(item.raw_text)
+            needs_llm_summary = True
+        else:
+            summary, produced_by = summarize_with_mode(item.raw_text)
+            item.summary_text = summary
+            store_analysis(db, item.hash_content, produced_by, item.title, summary, category, region, tags)
+            logger.info(f"Generated summary for item {item_id}")
+    
+    # Search index covers title, summary and text
+    search_service.index_item(db, item)
+    
+    return {
+        "item_id": item_id,
+        "category": category,
+        "region": region,
+        "tags": tags,
+        "duplicates": dup_count,
+        "needs_llm_summary": needs_llm_summary,
+        "user_id": item.user_id,
+        "previous_status": previous_status,
+        "status": item.status
+    }
+
+
+def _record_status_changes(results: list):
+    """Update dashboard counters for processed items (after commit)"""
+    for result in results:
+        stats_service.record_status_change(result["user_id"], result["previous_status"], result["status"])
+
+
 @celery_app.task(name='worker.tasks.processing.dedup_classify_summarize', bind=True, max_retries=3)
 def dedup_classify_summarize(self, item_id: int):
     """Process item: deduplication, classification, and summarization"""
@@ -69,42 +239,145 @@ def dedup_classify_summarize(self, item_id: int):
             logger.error(f"Item {item_id} not found")
             return {"error": "Item not found"}
         
-        logger.info(f"Processing item {item_id}: {item.title}")
-        
-        # Deduplication
-        dup_count = process_deduplication(db, item)
-        logger.info(f"Found {dup_count} duplicates for item {item_id}")
+        result = _process_item(db, item)
+        db.commit()
+        _record_status_changes([result])
         
-        if dup_count > 0:
-            item.status = 'duplicate'
-            logger.info(f"Marked item {item_id} as duplicate")
+        return result
+    
+    except Exception as e:
+        logger.error(f"Error processing item {item_id}: {e}")
+        db.rollback()
+        raise self.retry(exc=e, countdown=30)
+    finally:
+        db.close()
+
+
+@celery_app.task(name='worker.tasks.processing.dedup_classify_summarize_batch', bind=True, max_retries=3)
+def dedup_classify_summarize_batch(self, item_ids: list):
+    """Process a batch of newly ingested items in one session and one commit"""
+    db = SessionLocal()
+    try:
+        # Oldest first so later items in the batch can be matched against earlier ones
+        items = db.query(Item).filter(Item.id.in_(item_ids)).order_by(Item.id).all()
         
-        # Classification
-        category, region, tags = classify_item(item.title, item.raw_text or "")
-        item.category = category
-        item.region = region
-        item.tags = tags
-        logger.info(f"Classified item {item_id}: category={category}, region={region}")
-        
-        # Summarization
-        if item.raw_text:
-            summary = summarize_content(item.raw_text)
-            item.summary_text = summary
-            logger.info(f"Generated summary for item {item_id}")
+        results = []
+        failed = []
+        thumbnail_ids = []
+        deferred = []
+        for position, item in enumerate(items):
+            try:
+                with db.begin_nested():
+                    results.append(_process_item(db, item, defer_llm=True))
+                if item.image_urls and item.status != 'duplicate':
+                    thumbnail_ids.append(item.id)
+            except SoftTimeLimitExceeded:
+                # Keep the finished items and hand the rest (including this one) to a new
+                # task before the hard limit kills the worker
+                deferred = [pending.id for pending in items[position:]]
+                logger.warning(f"Soft time limit reached, deferring {len(deferred)} items to a new batch")
+                break
+            except Exception as e:
+                logger.error(f"Error processing item {item.id}: {e}")
+                failed.append(item.id)
         
         db.commit()
+        _record_status_changes(results)
+        logger.info(f"Processed {len(results)} items ({len(failed)} failed)")
+        
+        if deferred:
+            dedup_classify_summarize_batch.delay(deferred)
+        
+        # LLM summaries run as concurrent, token-budgeted batches
+        llm_ids = [result["item_id"] for result in results if result["needs_llm_summary"]]
+        batch_size = max(1, settings.SUMMARY_LLM_BATCH_SIZE)
+        for start in range(0, len(llm_ids), batch_size):
+            summarize_items.delay(llm_ids[start:start + batch_size])
         
-        return {
-            "item_id": item_id,
-            "category": category,
-            "region": region,
-            "tags": tags,
-            "duplicates": dup_count
-        }
+        # Grid thumbnails are rendered ahead of the first page view
+        if thumbnail_ids:
+            generate_thumbnails.delay(thumbnail_ids)
         
+        return {"processed": len(results), "failed": failed, "deferred": deferred}
+    
     except Exception as e:
-        logger.error(f"Error processing item {item_id}: {e}")
+        logger.error(f"Error processing item batch {item_ids}: {e}")
         db.rollback()
         raise self.retry(exc=e, countdown=30)
     finally:
         db.close()
+
+
+@celery_app.task(name='worker.tasks.processing.summarize_items', bind=True, max_retries=3)
+def summarize_items(self, item_ids: list):
+    """Replace placeholder summaries with LLM summaries using batched concurrent calls"""
+    db = SessionLocal()
+    try:
+        items = db.query(Item).filter(Item.id.in_(item_ids), Item.raw_text != None).order_by(Item.id).all()
+        mode_key = summary_mode_key()
+        
+        # One LLM call per distinct text; texts summarized meanwhile come from the cache
+        pending = {}
+        for item in items:
+            cached = get_cached_analysis(db, item.hash_content, mode_key)
+            if cached:
+                item.summary_text = cached.summary_text
+            else:
+                pending.setdefault(item.hash_content or f"item:{item.id}", []).append(item)
+        
+        groups = list(pending.values())
+        summaries = summarize_many([group[0].raw_text for group in groups])
+        
+        llm_count = 0
+        for group, (summary, produced_by) in zip(groups, summaries):
+            for item in group:
+                item.summary_text = summary
+                search_service.index_item(db, item)
+            if produced_by != "rule":
+                llm_count += 1
+                first = group[0]
+                store_analysis(db, first.hash_content, produced_by, first.title, summary,
+                               first.category, first.region, first.tags)
+        
+        db.commit()
+        logger.info(f"Summarized {len(items)} items ({llm_count} LLM calls succeeded, {len(groups) - llm_count} fell back)")
+        
+        return {"summarized": len(items), "llm": llm_count, "fallback": len(groups) - llm_count}
+    
+    except Exception as e:
+        logger.error(f"Error summarizing items {item_ids}: {e}")
+        db.rollback()
+        raise self.retry(exc=e, countdown=60)
+    finally:
+        db.close()
+
+
+@celery_app.task(name='worker.tasks.processing.generate_thumbnails', bind=True, max_retries=1)
+def generate_thumbnails(self, item_ids: list):
+    """Render thumbnails of the first image of each item (missing ones are rendered on request)"""
+    import httpx
+    from app.services import thumbnail_service
+    from app.models.source import Source
+    from app.services.media_proxy_service import USER_AGENT, source_referer
+    
+    db = SessionLocal()
+    try:
+        # Same referer the download proxy gets for the item's source (e.g. instagram.com)
+        images = [
+            (image_urls[0], source_referer(source_type))
+            for image_urls, source_type in db.query(Item.image_urls, Source.type)
+            .outerjoin(Source, Item.source_id == Source.id)
+            .filter(Item.id.in_(item_ids)).all()
+            if image_urls
+        ]
+    finally:
+        db.close()
+    
+    generated = 0
+    with httpx.Client(timeout=15.0, follow_redirects=True, headers={"User-Agent": USER_AGENT}) as client:
+        for image_url, referer in images:
+            if thumbnail_service.generate_thumbnail(image_url, client, referer):
+                generated += 1
+    
+    logger.info(f"Generated {generated}/{len(images)} thumbnails")
+    return {"generated": generated, "total": len(images)}
@@ -238,6 +238,8 @@ ${selectedItem.image_urls && selectedItem.image_urls.length > 0 ? '이미지:\n'
 
     const getProxyUrl = (url: string, source_type: string) => {
         if (!url) return '';
+        // Server-side thumbnails and other API URLs are served as-is
+        if (url.startsWith('/api/')) return url;
         if (source_type === 'naver_blog' || url.includes('pstatic.net') || url.includes('naver.com')) {
             return `/api/items/download-proxy?url=${encodeURIComponent(url)}&referer=https://m.blog.naver.com/`;
         }
@@ -26,7 +26,7 @@ echo.
 
 :: 2. 백엔드 서버 실행 (새 창)
 echo [2/3] 백엔드 API 서버를 시작합니다 (Port 8001)...
-start "NaverCafe Backend" cmd /k "cd /d %PROJECT_ROOT%\backend && uvicorn app.main:app --reload --host 0.0.0.0 --port 8001"
+start "NaverCafe Backend" cmd /k "cd /d %PROJECT_ROOT%\backend && alembic upgrade head && uvicorn app.main:app --reload --host 0.0.0.0 --port 8001"
 
 :: 3. 프론트엔드 서버 실행 (새 창)
 echo [3/3] 프론트엔드 웹 서버를 시작합니다 (Port 3000)...